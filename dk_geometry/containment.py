@@ -0,0 +1,183 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import numpy as np
+
+from dk_geometry.model import Polyhedron, Vector3d, Vector3dArray
+from dk_geometry.planes import _as_coordinates
+from dk_geometry.triangulation import triangulate_polyhedron
+
+# points closer than this to the surface are inside
+CONTAINMENT_TOLERANCE = 0.01
+
+# the ray directions of the parity test, chosen so that they do not run along
+# the axis aligned edges and faces of cabinet parts. A point whose ray passes
+# (nearly) through an edge or a corner is tested again along the next one.
+_RAYS = np.array(
+    [
+        [0.5773, 0.5801, 0.5747],
+        [-0.6123, 0.4571, 0.6452],
+        [0.3907, -0.7163, 0.5783],
+        [0.7019, 0.3388, -0.6264],
+    ]
+)
+_RAYS /= np.linalg.norm(_RAYS, axis=1, keepdims=True)
+
+# barycentric margin within which a ray is taken to pass through an edge
+_EDGE_MARGIN = 1e-7
+
+# the number of point-triangle pairs handled at once by the parity test
+_CHUNK = 1 << 20
+
+
+def is_convex(polyhedron: Polyhedron, tolerance: float = CONTAINMENT_TOLERANCE):
+    """Whether all vertices are behind or on the plane of every face"""
+    if len(polyhedron.faces) == 0:
+        return False
+    distances = polyhedron.plane_set.signed_distances(polyhedron.topology.vertices)
+    return bool((distances <= tolerance).all())
+
+
+def _on_triangles(points: np.ndarray, triangles: np.ndarray, tolerance: float):
+    """Per point whether it is within the tolerance of any of the triangles"""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    normals = np.cross(b - a, c - a)
+    normals /= np.maximum(
+        np.linalg.norm(normals, axis=1, keepdims=True), np.finfo(float).tiny
+    )
+    result = np.zeros(len(points), dtype=bool)
+    step = max(1, _CHUNK // max(len(triangles), 1))
+    for start in range(0, len(points), step):
+        chunk = points[start : start + step, None, :]
+        near = np.abs(np.einsum("ptj,tj->pt", chunk - a, normals)) <= tolerance
+        # the distance to each edge line, positive on the inside
+        for start_corner, end_corner in ((a, b), (b, c), (c, a)):
+            edges = end_corner - start_corner
+            lengths = np.maximum(np.linalg.norm(edges, axis=1), np.finfo(float).tiny)
+            inside = (
+                np.einsum("ptj,tj->pt", np.cross(edges, chunk - start_corner), normals)
+                / lengths
+            )
+            near &= inside >= -tolerance
+        result[start : start + step] = near.any(axis=1)
+    return result
+
+
+def _ray_parity(
+    points: np.ndarray, triangles: np.ndarray, ray: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per point whether a ray from it crosses the triangles an odd number of
+    times, and whether the ray passes through an edge of a triangle, in which
+    case the count is not reliable.
+    """
+    a = triangles[:, 0]
+    edge1 = triangles[:, 1] - a
+    edge2 = triangles[:, 2] - a
+    # Moller-Trumbore with the same ray direction for all points
+    p = np.cross(ray, edge2)
+    determinants = np.einsum("tj,tj->t", edge1, p)
+    usable = np.abs(determinants) > 1e-12
+    edge1, edge2, a, p = edge1[usable], edge2[usable], a[usable], p[usable]
+    inverse = 1 / determinants[usable]
+    crossings = np.zeros(len(points), dtype=np.int64)
+    ambiguous = np.zeros(len(points), dtype=bool)
+    step = max(1, _CHUNK // max(len(a), 1))
+    for start in range(0, len(points), step):
+        s = points[start : start + step, None, :] - a
+        u = np.einsum("ptj,tj->pt", s, p) * inverse
+        q = np.cross(s, edge1)
+        v = (q @ ray) * inverse
+        t = np.einsum("ptj,tj->pt", q, edge2) * inverse
+        w = 1 - u - v
+        ahead = t > 0
+        hits = (u > _EDGE_MARGIN) & (v > _EDGE_MARGIN) & (w > _EDGE_MARGIN) & ahead
+        near = (u >= -_EDGE_MARGIN) & (v >= -_EDGE_MARGIN) & (w >= -_EDGE_MARGIN)
+        crossings[start : start + step] = hits.sum(axis=1)
+        ambiguous[start : start + step] = (near & ahead & ~hits).any(axis=1)
+    return crossings % 2 == 1, ambiguous
+
+
+def _winding_numbers(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    Per point the solid angle of the triangles seen from it divided by 4 pi,
+    about 1 inside a closed surface and 0 outside, without any ray.
+    """
+    result = np.zeros(len(points))
+    step = max(1, _CHUNK // max(len(triangles), 1))
+    for start in range(0, len(points), step):
+        chunk = points[start : start + step, None, :]
+        a, b, c = (triangles[:, corner] - chunk for corner in range(3))
+        length_a, length_b, length_c = (np.linalg.norm(v, axis=2) for v in (a, b, c))
+        # the solid angle of each triangle, Van Oosterom and Strackee
+        numerators = np.einsum("ptj,ptj->pt", a, np.cross(b, c))
+        denominators = (
+            length_a * length_b * length_c
+            + np.einsum("ptj,ptj->pt", a, b) * length_c
+            + np.einsum("ptj,ptj->pt", a, c) * length_b
+            + np.einsum("ptj,ptj->pt", b, c) * length_a
+        )
+        angles = 2 * np.arctan2(numerators, denominators)
+        result[start : start + step] = angles.sum(axis=1) / (4 * np.pi)
+    return result
+
+
+def _inside_by_parity(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    Ray parity, along the next ray for the points whose ray hits an edge. The
+    points whose rays all hit an edge are decided by their winding number.
+    """
+    inside = np.zeros(len(points), dtype=bool)
+    pending = np.arange(len(points))
+    for ray in _RAYS:
+        odd, ambiguous = _ray_parity(points[pending], triangles, ray)
+        inside[pending] = odd
+        pending = pending[ambiguous]
+        if len(pending) == 0:
+            return inside
+    inside[pending] = _winding_numbers(points[pending], triangles) > 0.5
+    return inside
+
+
+def contains(
+    polyhedron: Polyhedron,
+    points: Union[np.ndarray, Vector3dArray, Sequence[Vector3d]],
+    tolerance: float = CONTAINMENT_TOLERANCE,
+) -> np.ndarray:
+    """
+    Tests many points at once for lying inside a closed polyhedron. A convex
+    polyhedron only compares the points with its cached face planes, other
+    polyhedra count the crossings of a ray from every point with their
+    triangulated faces. Points outside the bounding box are rejected first.
+    Args:
+        polyhedron: a closed polyhedron with outward facing faces
+        points: (N, 3) coordinates, a Vector3dArray or a list of Vector3d
+        tolerance: points closer than this to the surface count as inside
+    Returns:
+        (N,) boolean mask of the points inside or on the polyhedron
+    """
+    coordinates = _as_coordinates(points)
+    result = np.zeros(len(coordinates), dtype=bool)
+    if len(coordinates) == 0 or len(polyhedron.faces) == 0:
+        return result
+    box = polyhedron.aabb
+    in_box = np.flatnonzero(
+        (
+            (coordinates >= np.array([box.min_x, box.min_y, box.min_z]) - tolerance)
+            & (coordinates <= np.array([box.max_x, box.max_y, box.max_z]) + tolerance)
+        ).all(axis=1)
+    )
+    candidates = coordinates[in_box]
+    if is_convex(polyhedron, tolerance):
+        distances = polyhedron.plane_set.signed_distances(candidates)
+        result[in_box] = (distances <= tolerance).all(axis=1)
+        return result
+    vertices, indices = triangulate_polyhedron(polyhedron)
+    triangles = vertices[indices.reshape(-1, 3)]
+    on_surface = _on_triangles(candidates, triangles, tolerance)
+    inside = on_surface.copy()
+    inside[~on_surface] = _inside_by_parity(candidates[~on_surface], triangles)
+    result[in_box] = inside
+    return result
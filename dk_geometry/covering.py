@@ -1,7 +1,15 @@
 # Copyright: 2024 BV De Kastenman
 
 from dk_geometry.general import calculate_signed_distance_to_plane, cut_face_by_plane
-from dk_geometry.model import Face, Plane3d, Vector3d
+from dk_geometry.model import (
+    Face,
+    Plane3d,
+    Vector3d,
+    Vector3dArray,
+    VECTORIZE_THRESHOLD,
+    deferred_rounding,
+)
+from dk_geometry.planes import PlaneSet
 from pydantic.dataclasses import dataclass
 import math
 
@@ -15,8 +23,12 @@ class Rectangle:
 
 
 def measure_range_of_faces(faces: list[Face], origin: Vector3d, direction: Vector3d):
-    values = [(v - origin).dotProduct(direction) for f in faces for v in f.vertices]
-    return min(values), max(values)
+    vertices = [v for f in faces for v in f.vertices]
+    if len(vertices) < VECTORIZE_THRESHOLD:
+        values = [(v - origin).dotProduct(direction) for v in vertices]
+        return min(values), max(values)
+    values = (Vector3dArray.from_vectors(vertices) - origin).dotProduct(direction)
+    return float(values.min()), float(values.max())
 
 
 def get_bounding_rectangle(
@@ -36,14 +48,14 @@ def get_bounding_rectangle(
 def make_rectangular_face(
     rectangle: Rectangle, origin: Vector3d, x: Vector3d, y: Vector3d
 ) -> Face:
-    return Face(
-        vertices=[
+    with deferred_rounding():
+        corners = [
             origin + x * rectangle.min_x + y * rectangle.min_y,
             origin + x * rectangle.max_x + y * rectangle.min_y,
             origin + x * rectangle.max_x + y * rectangle.max_y,
             origin + x * rectangle.min_x + y * rectangle.max_y,
         ]
-    )
+    return Face(vertices=[corner.rounded() for corner in corners])
 
 
 def is_face_behind_plane(face: Face, plane: Plane3d, tolerance: float) -> bool:
@@ -74,16 +86,27 @@ def cover_faces(faces: list[Face]) -> Face:
     x = y.crossProduct(plane_normal)
     brect = get_bounding_rectangle(faces, origin, x, y)
     result = make_rectangular_face(brect, origin, x, y)
+    cutting_planes = []
     for face in faces:
         for edge_index in range(len(face.vertices)):
             edge = face.get_edge(edge_index)
-            cutting_plane = Plane3d(
-                origin=edge[0], normal=(edge[1] - edge[0]).crossProduct(plane_normal)
+            cutting_planes.append(
+                Plane3d(
+                    origin=edge[0],
+                    normal=(edge[1] - edge[0]).crossProduct(plane_normal),
+                )
             )
-            if is_face_behind_plane(result, cutting_plane, 0.01):
-                continue  # the edge is already on the edge of the rectangle
-            can_cut = all([is_face_behind_plane(f, cutting_plane, 0.01) for f in faces])
-            if not can_cut:
-                continue  # cutting by this edge would cut some input faces
-            result = cut_face_by_plane(result, cutting_plane, {}, {})
+    # whether all input faces are behind each cutting plane, in one go
+    can_cut = (
+        PlaneSet.from_planes(cutting_planes).signed_distances(
+            [v for f in faces for v in f.vertices]
+        )
+        < 0.01
+    ).all(axis=0)
+    for cutting_plane, can_cut_plane in zip(cutting_planes, can_cut):
+        if is_face_behind_plane(result, cutting_plane, 0.01):
+            continue  # the edge is already on the edge of the rectangle
+        if not can_cut_plane:
+            continue  # cutting by this edge would cut some input faces
+        result = cut_face_by_plane(result, cutting_plane, {}, {})
     return result
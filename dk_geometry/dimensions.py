@@ -0,0 +1,181 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from dk_geometry.model import Face, Polyhedron, Vector3d
+
+
+def convex_hull_2d(points: np.ndarray) -> list[int]:
+    """
+    Monotone chain convex hull, returns the indices of the hull corners in
+    counterclockwise order, without collinear points.
+    """
+    order = sorted(range(len(points)), key=lambda i: (points[i][0], points[i][1]))
+
+    def cross(o, a, b):
+        return (points[a][0] - points[o][0]) * (points[b][1] - points[o][1]) - (
+            points[a][1] - points[o][1]
+        ) * (points[b][0] - points[o][0])
+
+    def half_hull(indices):
+        hull = []
+        for index in indices:
+            while len(hull) >= 2 and cross(hull[-2], hull[-1], index) <= 1e-12:
+                hull.pop()
+            hull.append(index)
+        return hull
+
+    if len(order) < 3:
+        return order
+    lower = half_hull(order)
+    upper = half_hull(order[::-1])
+    return lower[:-1] + upper[:-1]
+
+
+def _project(face: Face) -> np.ndarray:
+    normal = face.plane.normal
+    n = np.array([normal.x, normal.y, normal.z])
+    n /= np.linalg.norm(n)
+    helper = np.eye(3)[np.argmin(np.abs(n))]
+    u = np.cross(helper, n)
+    u /= np.linalg.norm(u)
+    v = np.cross(n, u)
+    coordinates = np.array([(p.x, p.y, p.z) for p in face.vertices])
+    return np.stack([coordinates @ u, coordinates @ v], axis=1)
+
+
+# the number of (face, edge, corner) values measured at once
+_CHUNK = 1 << 20
+
+
+def _rectangle_areas(points: np.ndarray) -> np.ndarray:
+    """
+    (F, H) areas of the bounding rectangles along every edge of F hulls of H
+    corners each, infinite for edges without length
+    """
+    directions = np.roll(points, -1, axis=1) - points
+    lengths = np.linalg.norm(directions, axis=2)
+    usable = lengths > 1e-12
+    directions /= np.where(usable, lengths, 1)[:, :, None]
+    normals = np.stack([-directions[:, :, 1], directions[:, :, 0]], axis=2)
+    along = np.einsum("fek,fpk->fep", directions, points)
+    across = np.einsum("fek,fpk->fep", normals, points)
+    widths = along.max(axis=2) - along.min(axis=2)
+    heights = across.max(axis=2) - across.min(axis=2)
+    return np.where(usable, widths * heights, np.inf)
+
+
+def _select_rectangle_edges(hulls: list[list[int]], projected: list[np.ndarray]):
+    """
+    A minimum area rectangle has a side on an edge of the convex hull, so the
+    rectangle along every hull edge is measured. That is quadratic in the hull
+    size, which is small for cabinet parts, and the faces are measured in
+    groups of equal hull size so that no face is padded to a larger hull.
+    Ties go to the edge starting at the lowest vertex index, which is the first
+    face edge for rectangular faces.
+    Returns per face the (start, finish) vertex indices of the chosen edge, or
+    None if the hull is a single point.
+    """
+    groups = {}  # hull size->face indices
+    for face_index, hull in enumerate(hulls):
+        groups.setdefault(len(hull), []).append(face_index)
+    result = [None] * len(hulls)
+    for size, group in groups.items():
+        if size < 2:
+            continue
+        step = max(1, _CHUNK // (size * size))
+        for first in range(0, len(group), step):
+            members = group[first : first + step]
+            starts = np.array([hulls[face_index] for face_index in members])
+            points = np.stack(
+                [projected[face_index][hulls[face_index]] for face_index in members]
+            )
+            areas = _rectangle_areas(points)
+            best = areas.min(axis=1)
+            tied = areas <= best[:, None] * (1 + 1e-9) + 1e-9
+            chosen = np.where(tied, starts, np.iinfo(np.int64).max).argmin(axis=1)
+            for face_index, position, area in zip(members, chosen, best):
+                if np.isfinite(area):
+                    hull = hulls[face_index]
+                    result[face_index] = (hull[position], hull[(position + 1) % size])
+    return result
+
+
+def _parallel_edges_length(face: Face, direction: Vector3d) -> float:
+    length = 0
+    for edge_index in range(len(face.vertices)):
+        start, finish = face.get_edge(edge_index)
+        edge = finish - start
+        if edge.length > 0 and edge.normalized.crossProduct(direction).length < 0.01:
+            length += edge.length
+    return length
+
+
+def _orient_directions(face: Face, direction1: Vector3d) -> Face.LWDimensions:
+    normal = face.plane.normal
+    direction2 = direction1.crossProduct(normal).normalized
+    if normal.crossProduct(Vector3d(0, 1, 0)).length < 0.01:  # ~horizontal plane
+        # make the first direction to be the closest one to the X axis
+        if abs(direction1.x) < abs(direction2.x):
+            direction1, direction2 = direction2, direction1
+    elif abs(direction1.y) < 0.01:  # direction1 is ~horizontal
+        direction1, direction2 = direction2, direction1
+    elif abs(direction2.y) < 0.01:  # direction2 is ~horizontal
+        pass  # is already good
+    else:  # rotated face
+        # make the first direction the one with the biggest parallel edges length sum
+        parallel = _parallel_edges_length(face, direction1)
+        orthogonal = _parallel_edges_length(face, direction2)
+        if orthogonal > parallel:
+            direction1, direction2 = direction2, direction1
+
+    coordinates = np.array([(p.x, p.y, p.z) for p in face.vertices])
+
+    def measure_size(direction):
+        return float(np.ptp(coordinates @ [direction.x, direction.y, direction.z]))
+
+    return Face.LWDimensions(
+        direction1=direction1,
+        size1=measure_size(direction1),
+        direction2=direction2,
+        size2=measure_size(direction2),
+    )
+
+
+def compute_lw_dimensions(faces: Sequence[Face]) -> list[Face.LWDimensions]:
+    """
+    Minimum area bounding rectangles of the faces, see Face.lw_dimensions.
+    The first direction is then chosen by the orientation of the face: closest
+    to the X axis for horizontal faces, the non horizontal side for vertical
+    ones and the side with the longest parallel edges otherwise.
+    """
+    if len(faces) == 0:
+        return []
+    projected = [_project(face) for face in faces]
+    hulls = [convex_hull_2d(coordinates) for coordinates in projected]
+    edges = _select_rectangle_edges(hulls, projected)
+    result = []
+    for face, edge in zip(faces, edges):
+        direction1 = Vector3d(1, 0, 0)
+        if edge is not None:
+            direction1 = (face.vertices[edge[1]] - face.vertices[edge[0]]).normalized
+        result.append(_orient_directions(face, direction1))
+    return result
+
+
+def compute_polyhedra_lw_dimensions(
+    polyhedra: Sequence[Polyhedron],
+) -> list[list[Face.LWDimensions]]:
+    """lw_dimensions of every face of every polyhedron, in one batch"""
+    dimensions = compute_lw_dimensions(
+        [face for polyhedron in polyhedra for face in polyhedron.faces]
+    )
+    result = []
+    start = 0
+    for polyhedron in polyhedra:
+        result.append(dimensions[start : start + len(polyhedron.faces)])
+        start += len(polyhedron.faces)
+    return result
@@ -4,8 +4,16 @@ from enum import Enum
 
 from pydantic.dataclasses import dataclass
 
-from dk_geometry.general import cut_polyhedron_by_plane
-from dk_geometry.model import Face, Plane3d, Polyhedron, Vector3d
+from dk_geometry.general import clip_polyhedron_by_planes
+from dk_geometry.model import (
+    VECTORIZE_THRESHOLD,
+    Face,
+    Plane3d,
+    Polyhedron,
+    Vector3d,
+    Vector3dArray,
+)
+from dk_geometry.simplify import simplify_polyhedron
 
 
 @dataclass
@@ -69,15 +77,18 @@ def get_main_face(door: Polyhedron) -> Face:
 
 
 def get_range(face: Face, direction: Vector3d) -> Range:
-    min = None
-    max = None
-    for v in face.vertices:
-        value = v.dotProduct(direction)
-        if min is None or value < min:
-            min = value
-        if max is None or value > max:
-            max = value
-    return Range(min, max)
+    if len(face.vertices) < VECTORIZE_THRESHOLD:
+        min = None
+        max = None
+        for v in face.vertices:
+            value = v.dotProduct(direction)
+            if min is None or value < min:
+                min = value
+            if max is None or value > max:
+                max = value
+        return Range(min, max)
+    values = Vector3dArray.from_vectors(face.vertices).dotProduct(direction)
+    return Range(float(values.min()), float(values.max()))
 
 
 def get_extreme_edge_index(face: Face, direction: Vector3d) -> int:
@@ -221,10 +232,11 @@ def perform_cuts(
     cuts: dict[Edge, float],
     cross_direction: Vector3d,
     gap_size: float,
+    simplify: bool = False,
 ) -> list[Polyhedron]:
     result = []
     for door_index, door in enumerate(doors):
-        cut_door = door
+        planes = []
         for edge, cut in cuts.items():
             if edge.door_index != door_index:
                 continue
@@ -234,8 +246,14 @@ def perform_cuts(
             edge_direction = (edge[1] - edge[0]).normalized
             plane_normal = edge_direction.crossProduct(Vector3d(0, 0, -1))
             plane = Plane3d(origin=edge[0] - plane_normal * cut, normal=plane_normal)
-            cut_door = cut_polyhedron_by_plane(cut_door, plane)
-        result.append(cut_door)
+            planes.append(plane)
+        if len(planes) == 0:
+            result.append(door)
+        else:
+            cut_door = clip_polyhedron_by_planes(door, planes)
+            if simplify:
+                cut_door = simplify_polyhedron(cut_door)
+            result.append(cut_door)
     return result
 
 
@@ -41,13 +41,15 @@ class FaceNormal(Enum):
         if len(str_list) == 1:
             return FaceNormal(str_list[0])
         else:
-            str_set = set(str_list)
-            for idx, face in enumerate(list(cls)):
-                iter_face_set: set[FaceNormal] = {
-                    face_n.name for face_n in face.split()
-                }
-                if iter_face_set == str_set:
-                    return list(cls)[idx]
+            return _FACE_NORMAL_BY_PARTS.get(frozenset(str_list))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> FaceNormal:
+        """
+        Face normal for a combination of the FACE_NORMAL_BITS, as produced by
+        the sign checks of Plane3d.faceNormal
+        """
+        return _FACE_NORMAL_BY_MASK[mask]
 
     def split(self) -> list[FaceNormal]:
         return [FaceNormal(split_name) for split_name in self.name.split("_")]
@@ -89,6 +91,19 @@ class FaceNormal(Enum):
             raise NotImplementedError(f"Language {language.name} not implemented")
 
 
+# lookup tables for FaceNormal.from_stringlist and FaceNormal.from_mask
+_FACE_NORMAL_BY_PARTS: dict[frozenset[str], FaceNormal] = {
+    frozenset(face_normal.name.split("_")): face_normal for face_normal in FaceNormal
+}
+FACE_NORMAL_BITS = {"L": 1, "R": 2, "B": 4, "T": 8, "BK": 16, "F": 32}
+_FACE_NORMAL_BY_MASK: list[FaceNormal] = [
+    FaceNormal.from_stringlist(
+        [name for name, bit in FACE_NORMAL_BITS.items() if mask & bit]
+    )
+    for mask in range(64)
+]
+
+
 class AngleType(Enum):
     SHARP = "SHARP"
     ORTHOGONAL = "ORTHOGONAL"
@@ -0,0 +1,141 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Face, Polyhedron
+
+
+@dataclass(eq=False)
+class ExtrudedPlates:
+    """
+    Plates made by extrude_faces, all stored in one indexed buffer. Plate p
+    consists of the faces plate_offsets[p]:plate_offsets[p + 1] of the buffer,
+    in the same order as extrude_polyhedron_from_face makes them: the shifted
+    face, the sides and the reversed input face. The plates do not share
+    vertices. The Polyhedron objects are only made when a plate is accessed.
+    """
+
+    indexed: IndexedPolyhedron
+    plate_offsets: np.ndarray
+    _polyhedra: list[Optional[Polyhedron]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self._polyhedra = [None] * len(self)
+
+    def __len__(self):
+        return len(self.plate_offsets) - 1
+
+    def __getitem__(self, index: int) -> Polyhedron:
+        polyhedron = self._polyhedra[index]
+        if polyhedron is None:
+            polyhedron = self._polyhedra[index] = self.plate(index).to_polyhedron()
+        return polyhedron
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def plate(self, index: int) -> IndexedPolyhedron:
+        """The plate as an indexed polyhedron of its own, without materializing it"""
+        first_face = self.plate_offsets[index]
+        last_face = self.plate_offsets[index + 1]
+        start = self.indexed.face_offsets[first_face]
+        finish = self.indexed.face_offsets[last_face]
+        face_indices = self.indexed.face_indices[start:finish]
+        first_row = face_indices.min()
+        return IndexedPolyhedron(
+            vertices=self.indexed.vertices[first_row : face_indices.max() + 1],
+            face_offsets=self.indexed.face_offsets[first_face : last_face + 1] - start,
+            face_indices=face_indices - first_row,
+        )
+
+
+def extrude_faces(
+    faces: Sequence[Face], offsets: Union[float, Sequence[float], np.ndarray]
+) -> ExtrudedPlates:
+    """
+    Extrudes every face by its offset along its normal, the batched form of
+    extrude_polyhedron_from_face. The normals and the plates are computed with
+    array operations for all faces at once.
+    Args:
+        faces: the faces to extrude, each with at least 3 vertices and an area
+        offsets: one offset for all faces or one per face, a negative offset
+            extrudes against the normal
+    Returns:
+        the plates in the order of the faces
+    """
+    if len(faces) == 0:
+        return ExtrudedPlates(
+            indexed=IndexedPolyhedron(
+                vertices=np.zeros((0, 3)),
+                face_offsets=np.zeros(1, dtype=np.int64),
+                face_indices=np.zeros(0, dtype=np.int64),
+            ),
+            plate_offsets=np.zeros(1, dtype=np.int64),
+        )
+    sizes = np.array([len(face.vertices) for face in faces], dtype=np.int64)
+    offsets = np.broadcast_to(np.asarray(offsets, dtype=float), sizes.shape)
+    corner_count = int(sizes.sum())
+    coordinates = np.array(
+        [(v.x, v.y, v.z) for face in faces for v in face.vertices], dtype=float
+    ).reshape(-1, 3)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+    plate = np.repeat(np.arange(len(sizes)), sizes)  # plate of every corner
+    local = np.arange(corner_count) - starts[plate]  # corner within its face
+    size = sizes[plate]
+    following = starts[plate] + (local + 1) % size
+
+    area_vectors = np.add.reduceat(
+        np.cross(coordinates, coordinates[following]), starts, axis=0
+    )
+    lengths = np.linalg.norm(area_vectors, axis=1, keepdims=True)
+    flat = np.flatnonzero(~(lengths[:, 0] > 0))
+    if len(flat) > 0:
+        raise ValueError(f"extrude_faces: face {flat[0]} has no area")
+    normals = area_vectors / lengths
+    shifts = normals * offsets[:, None]
+
+    # a negative offset reverses the corners so the plate stays outward facing
+    reverse = (offsets < 0)[plate]
+    source = np.where(
+        reverse, starts[plate] + size - 1 - local, np.arange(corner_count)
+    )
+    base = coordinates[source]
+    # the rows of plate p start at 2 * starts[p], shifted corners first
+    top_rows = 2 * starts[plate] + local
+    base_rows = top_rows + size
+    vertices = np.empty((2 * corner_count, 3))
+    vertices[top_rows] = base + shifts[plate]
+    vertices[base_rows] = base
+
+    # the face indices of plate p, 6 per corner, start at 6 * starts[p]:
+    # the shifted face, one quad per side and the base face reversed
+    block = 6 * starts[plate]
+    next_local = following - starts[plate]
+    face_indices = np.empty(6 * corner_count, dtype=np.int64)
+    face_indices[block + local] = top_rows
+    sides = block + size + 4 * local
+    face_indices[sides] = top_rows - local + next_local
+    face_indices[sides + 1] = top_rows
+    face_indices[sides + 2] = base_rows
+    face_indices[sides + 3] = base_rows - local + next_local
+    face_indices[block + 5 * size + size - 1 - local] = base_rows
+
+    face_counts = sizes + 2
+    plate_offsets = np.concatenate([[0], np.cumsum(face_counts)]).astype(np.int64)
+    face_sizes = np.full(int(face_counts.sum()), 4, dtype=np.int64)
+    face_sizes[plate_offsets[:-1]] = sizes
+    face_sizes[plate_offsets[1:] - 1] = sizes
+    face_offsets = np.concatenate([[0], np.cumsum(face_sizes)]).astype(np.int64)
+    return ExtrudedPlates(
+        indexed=IndexedPolyhedron(
+            vertices=vertices, face_offsets=face_offsets, face_indices=face_indices
+        ),
+        plate_offsets=plate_offsets,
+    )
@@ -0,0 +1,67 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+import struct
+from hashlib import blake2b
+
+from dk_geometry.model import Face, Polyhedron
+
+# coordinates closer than this map to the same grid value, as in Vector3d.__eq__
+FINGERPRINT_RESOLUTION = 0.01
+
+
+def canonical_face(
+    face: Face, resolution: float = FINGERPRINT_RESOLUTION
+) -> tuple[int, bytes]:
+    """
+    Quantizes the face coordinates to the resolution and rotates the vertex
+    cycle to start at its lexicographically smallest rotation, so the result
+    does not depend on the starting vertex. The orientation is kept.
+    Returns:
+        the index of the canonical starting vertex and the digest of the
+        canonical coordinates
+    """
+    quantized = [
+        (round(v.x / resolution), round(v.y / resolution), round(v.z / resolution))
+        for v in face.vertices
+    ]
+    count = len(quantized)
+    start = 0
+    if count > 0:
+        start = min(range(count), key=lambda i: quantized[i:] + quantized[:i])
+    rotated = quantized[start:] + quantized[:start]
+    flat = [value for vertex in rotated for value in vertex]
+    hasher = blake2b(digest_size=16, person=b"dk-face")
+    hasher.update(struct.pack(f"<q{len(flat)}q", count, *flat))
+    return start, hasher.digest()
+
+
+def face_fingerprint(face: Face, resolution: float = FINGERPRINT_RESOLUTION) -> str:
+    return canonical_face(face, resolution)[1].hex()
+
+
+def polyhedron_fingerprint(
+    polyhedron: Polyhedron, resolution: float = FINGERPRINT_RESOLUTION
+) -> str:
+    """
+    Hashes the canonical faces in face order, followed by their vertex sharing:
+    every vertex object is labelled in order of first appearance in the
+    canonical vertex cycles. The per face digests are taken from the face
+    caches, so only changed faces are rehashed.
+    """
+
+    def get_canonical_face(face):
+        if resolution == FINGERPRINT_RESOLUTION:
+            return face.canonical
+        return canonical_face(face, resolution)
+
+    labels = {}
+    hasher = blake2b(digest_size=16, person=b"dk-polyhedron")
+    hasher.update(struct.pack("<q", len(polyhedron.faces)))
+    for face in polyhedron.faces:
+        start, digest = get_canonical_face(face)
+        vertices = face.vertices[start:] + face.vertices[:start]
+        face_labels = [labels.setdefault(id(v), len(labels)) for v in vertices]
+        hasher.update(digest)
+        hasher.update(struct.pack(f"<{len(face_labels)}q", *face_labels))
+    return hasher.hexdigest()
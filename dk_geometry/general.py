@@ -1,11 +1,20 @@
 # Copyright: 2024 BV De Kastenman
 from __future__ import annotations
 
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
+import numpy as np
 from pydantic import ConfigDict
 
 from dk_geometry.model import Vector3d, Plane3d, Line3d, Face, Polyhedron
+from dk_geometry.planes import PlaneSet
+from dk_geometry.pool import VertexPool
+from dk_geometry.topology import HalfEdgeTopology
+
+# the distance below which plane cuts take points to coincide: a vertex this
+# close to the cut plane lies on it, and crossings of the faces with the plane
+# this close to each other, or to an existing vertex, are the same point
+CUT_TOLERANCE = 0.001
 
 default_config = dict(
     slots=True,
@@ -71,13 +80,27 @@ def make_polyhedron_between_faces(
     return result
 
 
-def extrude_polyhedron_from_face(face: Face, offset: float) -> Polyhedron:
+def extrude_polyhedron_from_face(
+    face: Face, offset: float, vertex_pool: Optional[VertexPool] = None
+) -> Polyhedron:
+    """
+    Makes a prism of the face and the face shifted along its normal by the
+    offset. The vertices are interned in the vertex pool if one is given,
+    otherwise new vertex objects are made.
+    """
     if offset < 0:
-        return extrude_polyhedron_from_face(Face(vertices=face.vertices[::-1]), -offset)
+        return extrude_polyhedron_from_face(
+            Face(vertices=face.vertices[::-1]), -offset, vertex_pool
+        )
     # avoid reusing the input vertices
     face = Face(vertices=[Vector3d(v.x, v.y, v.z) for v in face.vertices])
     shift = face.plane.normal.normalized * offset
     shifted_face = Face(vertices=[v + shift for v in face.vertices])
+    if vertex_pool is not None:
+        face = Face(vertices=[vertex_pool.intern(v) for v in face.vertices])
+        shifted_face = Face(
+            vertices=[vertex_pool.intern(v) for v in shifted_face.vertices]
+        )
     return make_polyhedron_between_faces(shifted_face.vertices, face.vertices)
 
 
@@ -109,17 +132,49 @@ def cut_face_by_plane(
     plane: Plane3d,
     vertex_is_behind_cache: Optional[dict[int, bool]] = None,
     edge_split_vertices_cache: Optional[dict[(int, int), Vector3d]] = None,
+    vertex_pool: Optional[VertexPool] = None,
 ) -> Face:
     """
     Returns the part of the given face which is behind (on the negative side) of
     the given plane. It may be the whole face if it's completely behind. It may
     be an empty face (without vertices) if it's completely in front.
-    Will fail if the plane cuts the face in more than two vertices.
+    Will fail if the part behind the plane consists of several pieces, see
+    cut_face_by_plane_into_pieces.
     No new objects is created for the vertices behind the plane.
 
     vertex_is_behind_cache and edge_split_vertices_cache are to ensure consistency
     of vertex connections within a polyhedron, not needed if only a geometry of a
-    single cuut face is needed.
+    single cuut face is needed. With a vertex_pool the new split vertices are
+    interned in it, so faces cut in separate calls share them as well.
+    """
+    pieces = cut_face_by_plane_into_pieces(
+        face, plane, vertex_is_behind_cache, edge_split_vertices_cache, vertex_pool
+    )
+    if len(pieces) > 1:
+        raise ValueError("a face is cut more than once by a plane")
+    if len(pieces) == 0:
+        return Face(vertices=[])
+    return pieces[0]
+
+
+def cut_face_by_plane_into_pieces(
+    face: Face,
+    plane: Plane3d,
+    vertex_is_behind_cache: Optional[dict[int, bool]] = None,
+    edge_split_vertices_cache: Optional[dict[(int, int), Vector3d]] = None,
+    vertex_pool: Optional[VertexPool] = None,
+    plane_vertices: Optional[VertexPool] = None,
+) -> list[Face]:
+    """
+    Returns the parts of the given face which are behind the given plane, the
+    face may be concave, so the plane may cut it in several pieces. Vertices
+    on the plane count as in front of it, edges ending on the plane are split
+    at that vertex. See cut_face_by_plane for the caches.
+    plane_vertices pools the vertices within CUT_TOLERANCE of the plane which
+    stay in the cut polyhedron, see _get_plane_vertices. The split vertices are
+    welded to those, and those between where a piece leaves and enters the
+    part behind are kept, so the piece has the same edges along the cut line
+    as its neighbours.
     """
     if vertex_is_behind_cache is None:
         vertex_is_behind_cache = {}
@@ -137,16 +192,51 @@ def cut_face_by_plane(
         if key not in edge_split_vertices_cache:
             distance1 = calculate_signed_distance_to_plane(v1, plane)
             distance2 = calculate_signed_distance_to_plane(v2, plane)
-            position = v1 + (v2 - v1) * (-distance1 / (distance2 - distance1))
+            # an end on the plane is reused, so no vertices coincide with it
+            if abs(distance1) <= CUT_TOLERANCE:
+                position = v1
+            elif abs(distance2) <= CUT_TOLERANCE:
+                position = v2
+            else:
+                position = v1 + (v2 - v1) * (-distance1 / (distance2 - distance1))
+                if vertex_pool is not None:
+                    position = vertex_pool.intern(position)
+                if plane_vertices is not None:
+                    position = plane_vertices.intern(position)
             edge_split_vertices_cache[key] = position
             inverted_key = (id(v2), id(v1))
             edge_split_vertices_cache[inverted_key] = position
         return edge_split_vertices_cache[key]
 
+    def get_vertices_between(start: Vector3d, finish: Vector3d) -> list[Vector3d]:
+        # the vertices on the plane strictly between two points on the cut line
+        if plane_vertices is None:
+            return []
+        candidates = [
+            vertex
+            for vertex in face.vertices
+            if not is_vertex_behind(vertex)
+            and vertex is not start
+            and vertex is not finish
+            and vertex in plane_vertices
+        ]
+        if len(candidates) == 0:
+            return []
+        direction = finish - start
+        length = direction.length
+        if length <= 2 * CUT_TOLERANCE:
+            return []
+        between = []
+        for vertex in candidates:
+            position = (vertex - start).dotProduct(direction) / length
+            if CUT_TOLERANCE < position < length - CUT_TOLERANCE:
+                between.append((position, vertex))
+        return [vertex for _, vertex in sorted(between, key=lambda b: b[0])]
+
     if all([is_vertex_behind(v) for v in face.vertices]):
-        return face
+        return [face]
     if not any([is_vertex_behind(v) for v in face.vertices]):
-        return Face(vertices=[])
+        return []
     front_to_back = []  # edges which go from the cut area to the uncut one
     for edge_index in range(len(face.vertices)):
         start = face.vertices[edge_index]
@@ -154,7 +244,13 @@ def cut_face_by_plane(
         if not is_vertex_behind(start) and is_vertex_behind(finish):
             front_to_back.append(edge_index)
     if len(front_to_back) != 1:
-        raise ValueError("a face is cut more than once by a plane")
+        return _cut_face_into_pieces(
+            face,
+            plane,
+            is_vertex_behind,
+            get_edge_splitting_vertex,
+            get_vertices_between,
+        )
     vertices = (
         face.vertices[front_to_back[0] :]
         + face.vertices[: front_to_back[0]]
@@ -164,7 +260,107 @@ def cut_face_by_plane(
         vertices.pop(len(vertices) - 1)
     vertices[0] = get_edge_splitting_vertex(vertices[0], vertices[1])
     vertices[-1] = get_edge_splitting_vertex(vertices[-2], vertices[-1])
-    return Face(vertices=vertices)
+    vertices.extend(get_vertices_between(vertices[-1], vertices[0]))
+    # a split at a vertex on the plane gives that vertex twice
+    vertices = [v for i, v in enumerate(vertices) if v is not vertices[i - 1]]
+    if len(vertices) < 3:
+        return []  # only the vertices on the plane are left
+    return [Face(vertices=vertices)]
+
+
+def _cut_face_into_pieces(
+    face: Face,
+    plane: Plane3d,
+    is_vertex_behind: Callable[[Vector3d], bool],
+    get_edge_splitting_vertex: Callable[[Vector3d, Vector3d], Vector3d],
+    get_vertices_between: Callable[[Vector3d, Vector3d], list[Vector3d]],
+) -> list[Face]:
+    """
+    Cuts a face which crosses the plane more than twice. Walking along the cut
+    line in the direction below, the part behind the plane is on the left, so
+    after sorting the crossings along it every exit from the part behind is
+    followed by the entry where the piece continues. Crossings at the same
+    point are where the face touches the plane, they are ordered by where
+    they would be if the touching vertex were moved slightly further from the
+    plane, on the side it is on.
+    """
+    vertices = face.vertices
+    count = len(vertices)
+    direction = face.plane.normal.crossProduct(plane.normal).normalized
+    crossings = []  # (position along the line, tie breaker, edge index)
+    for index in range(count):
+        start = vertices[index]
+        finish = vertices[(index + 1) % count]
+        if is_vertex_behind(start) == is_vertex_behind(finish):
+            continue
+        behind, front = (start, finish) if is_vertex_behind(start) else (finish, start)
+        behind_distance = calculate_signed_distance_to_plane(behind, plane)
+        front_distance = calculate_signed_distance_to_plane(front, plane)
+        # how far the crossing moves along the line per unit the vertex
+        # nearest to the plane moves away from it
+        shift = (behind - front).dotProduct(direction) / (
+            front_distance - behind_distance
+        )
+        if -behind_distance < front_distance:
+            shift = -shift
+        crossings.append(
+            (
+                get_edge_splitting_vertex(start, finish).dotProduct(direction),
+                shift,
+                index,
+            )
+        )
+    # the split vertices are rounded, so the positions of crossings at one
+    # point may differ slightly, those are ordered by the tie breaker only
+    crossings.sort()
+    groups = []
+    for crossing in crossings:
+        if len(groups) > 0 and crossing[0] - groups[-1][0][0] <= CUT_TOLERANCE:
+            groups[-1].append(crossing)
+        else:
+            groups.append([crossing])
+    crossings = [
+        crossing for group in groups for crossing in sorted(group, key=lambda c: c[1:])
+    ]
+    entry_after_exit = {}
+    for exit, entry in zip(crossings[0::2], crossings[1::2]):
+        if not is_vertex_behind(vertices[exit[2]]) or is_vertex_behind(
+            vertices[entry[2]]
+        ):
+            raise ValueError("the face is not a simple polygon")
+        entry_after_exit[exit[2]] = entry[2]
+    pieces = []
+    remaining = set(entry_after_exit.values())
+    for first_entry in sorted(remaining):
+        if first_entry not in remaining:
+            continue
+        piece = []
+        entry = first_entry
+        while True:
+            remaining.discard(entry)
+            index = (entry + 1) % count
+            piece.append(get_edge_splitting_vertex(vertices[entry], vertices[index]))
+            while is_vertex_behind(vertices[index]):
+                piece.append(vertices[index])
+                index = (index + 1) % count
+            exit = (index - 1) % count
+            piece.append(get_edge_splitting_vertex(vertices[exit], vertices[index]))
+            entry = entry_after_exit[exit]
+            piece.extend(
+                get_vertices_between(
+                    piece[-1],
+                    get_edge_splitting_vertex(
+                        vertices[entry], vertices[(entry + 1) % count]
+                    ),
+                )
+            )
+            if entry == first_entry:
+                break
+        # where the face touches the plane the exit and the entry are one vertex
+        piece = [v for i, v in enumerate(piece) if v is not piece[i - 1]]
+        if len(piece) >= 3:
+            pieces.append(Face(vertices=piece))
+    return pieces
 
 
 def find_hole_in_polyhedron(polyhedron: Polyhedron) -> list[Vector3d]:
@@ -172,69 +368,310 @@ def find_hole_in_polyhedron(polyhedron: Polyhedron) -> list[Vector3d]:
     Finds a hole in the polyhedron suurface or returns an empty list.
     If the polyhedron has multiple holes, an arbitrary one will be returned.
     """
-    edges = {}  # (id(start),id(finish))->(start,finish)
-    for face in polyhedron.faces:
-        for index in range(len(face.vertices)):
-            start = face.vertices[index]
-            finish = face.vertices[(index + 1) % len(face.vertices)]
-            if (id(finish), id(start)) in edges:
-                del edges[(id(finish), id(start))]
-            else:
-                edges[(id(start), id(finish))] = (start, finish)
-    if len(edges) == 0:
+    holes = find_holes_in_polyhedron(polyhedron)
+    if len(holes) == 0:
         return []
-    connections = {}
-    for ids, vertices in edges.items():
-        connections[ids[0]] = vertices[1]
-    hole = [next(iter(connections.values()))]
-    while True:
-        next_vertex = connections[id(hole[-1])]
-        if next_vertex is hole[0]:
-            break
-        hole.append(next_vertex)
-    return hole[::-1]
+    return holes[0]
 
 
-def cut_polyhedron_by_plane(polyhedron: Polyhedron, plane: Plane3d) -> Polyhedron:
+def find_holes_in_polyhedron(polyhedron: Polyhedron) -> list[list[Vector3d]]:
+    """
+    Finds all holes in the polyhedron surface in one pass over the edges, each
+    as the contour of the face which closes it.
+    """
+    return polyhedron.topology.boundary_loops()
+
+
+def cut_polyhedron_by_plane(
+    polyhedron: Polyhedron, plane: Plane3d, vertex_pool: Optional[VertexPool] = None
+) -> Polyhedron:
     """
     Will leave only the part on the side inverse to the normal of the plane.
-    Will fail if the polyhedron is cut in two non-connected places.
-    Will fail if one of the faces is cut in two places.
+    Concave faces may be cut in several pieces and every hole made by the cut
+    is closed by its own face, so the result may consist of several
+    disconnected parts, see get_connected_components.
     Args:
         polyhedron: polyedron to cut
         plane: plane to cut with
+        vertex_pool: optional pool to intern the new vertices in
     Returns:
         Will return a polyhedron without faces if it's completely in front of the plane.
-        Treats the polyhedron as a solid, so will close the hole made by the cut.
+        Treats the polyhedron as a solid, so will close the holes made by the cut.
     """
-    vertex_is_behind_cache = {}
-    edge_split_vertices_cache = {}
+    distances = {}
+    for face in polyhedron.faces:
+        for vertex in face.vertices:
+            if id(vertex) not in distances:
+                distances[id(vertex)] = calculate_signed_distance_to_plane(
+                    vertex, plane
+                )
+    return _cut_and_close(
+        polyhedron,
+        plane,
+        {key: distance < 0 for key, distance in distances.items()},
+        {},
+        vertex_pool,
+        _get_plane_vertices(polyhedron.faces, distances),
+    )
+
+
+def _get_plane_vertices(
+    faces: Sequence[Face], distances: dict[int, float]
+) -> VertexPool:
+    """
+    Pools the vertices within CUT_TOLERANCE of the plane which stay in the
+    polyhedron cut by it: those behind it and those with an edge to a vertex
+    behind it. The others are cut away with all faces they are in.
+    Args:
+        faces: the faces to cut
+        distances: the signed distance to the plane by id of every vertex
+    Returns:
+        the pool with the vertices on the plane
+    """
+    plane_vertices = VertexPool(CUT_TOLERANCE)
+    for face in faces:
+        count = len(face.vertices)
+        for index, vertex in enumerate(face.vertices):
+            distance = distances[id(vertex)]
+            if abs(distance) > CUT_TOLERANCE:
+                continue
+            if (
+                distance < 0
+                or distances[id(face.vertices[index - 1])] < 0
+                or distances[id(face.vertices[(index + 1) % count])] < 0
+            ):
+                plane_vertices.intern(vertex)
+    return plane_vertices
+
+
+def _cut_and_close(
+    polyhedron: Polyhedron,
+    plane: Plane3d,
+    vertex_is_behind_cache: dict[int, bool],
+    edge_split_vertices_cache: dict[(int, int), Vector3d],
+    vertex_pool: Optional[VertexPool],
+    plane_vertices: VertexPool,
+) -> Polyhedron:
     cut_faces = []
     for face in polyhedron.faces:
-        cut_face = cut_face_by_plane(
-            face, plane, vertex_is_behind_cache, edge_split_vertices_cache
+        cut_faces.extend(
+            cut_face_by_plane_into_pieces(
+                face,
+                plane,
+                vertex_is_behind_cache,
+                edge_split_vertices_cache,
+                vertex_pool,
+                plane_vertices,
+            )
         )
-        if len(cut_face.vertices) > 0:
-            cut_faces.append(cut_face)
-    hole = find_hole_in_polyhedron(Polyhedron(faces=cut_faces))
-    if len(hole) > 0:
-        cut_faces.append(Face(vertices=hole))
+    # the topology is built directly, the cut faces are no polyhedron to cache it on
+    topology = HalfEdgeTopology.from_polyhedron(Polyhedron(faces=cut_faces))
+    for hole in topology.boundary_loops():
+        cut_faces.extend(_cap_faces(hole))
     return Polyhedron(faces=cut_faces)
 
 
+def _cap_faces(hole: list[Vector3d]) -> list[Face]:
+    """
+    Returns the face closing a hole made by a cut, without the vertices where
+    its contour turns back on itself along an edge lying in the cut plane, or
+    no face if nothing but such fold-backs is left.
+    """
+    vertices = list(hole)
+    index = 0
+    while len(vertices) >= 3 and index < len(vertices):
+        incoming = vertices[index] - vertices[index - 1]
+        outgoing = vertices[(index + 1) % len(vertices)] - vertices[index]
+        if incoming.dotProduct(outgoing) < 0 and incoming.crossProduct(
+            outgoing
+        ).length <= CUT_TOLERANCE * max(incoming.length, outgoing.length):
+            vertices.pop(index)
+            vertices = [v for i, v in enumerate(vertices) if v is not vertices[i - 1]]
+            index = max(index - 2, 0)
+        else:
+            index += 1
+    if len(vertices) < 3:
+        return []
+    return [Face(vertices=vertices)]
+
+
+def split_polyhedron_by_plane(
+    polyhedron: Polyhedron, plane: Plane3d, vertex_pool: Optional[VertexPool] = None
+) -> tuple[Polyhedron, Polyhedron]:
+    """
+    Splits the polyhedron in the part behind the plane and the part in front of
+    it. The parts are the same as cut_polyhedron_by_plane with the plane and
+    with the inverted plane, but every vertex is classified once and the split
+    vertices are computed once and shared, so both caps have the same vertices.
+    Args:
+        polyhedron: polyedron to split
+        plane: plane to split with
+        vertex_pool: optional pool to intern the new vertices in
+    Returns:
+        the part behind and the part in front of the plane, a part is a
+        polyhedron without faces if nothing is on that side
+    """
+    distances = {}
+    for face in polyhedron.faces:
+        for vertex in face.vertices:
+            if id(vertex) not in distances:
+                distances[id(vertex)] = calculate_signed_distance_to_plane(
+                    vertex, plane
+                )
+    # the distance to the inverted plane is exactly -distance
+    inverted_distances = {key: -distance for key, distance in distances.items()}
+    is_behind = {key: distance < 0 for key, distance in distances.items()}
+    is_in_front = {key: distance < 0 for key, distance in inverted_distances.items()}
+    # the split position of an edge does not change when the plane is inverted
+    edge_split_vertices_cache = {}
+    inverted = Plane3d(origin=plane.origin, normal=-plane.normal)
+    return (
+        _cut_and_close(
+            polyhedron,
+            plane,
+            is_behind,
+            edge_split_vertices_cache,
+            vertex_pool,
+            _get_plane_vertices(polyhedron.faces, distances),
+        ),
+        _cut_and_close(
+            polyhedron,
+            inverted,
+            is_in_front,
+            edge_split_vertices_cache,
+            vertex_pool,
+            _get_plane_vertices(polyhedron.faces, inverted_distances),
+        ),
+    )
+
+
+def clip_polyhedron_by_planes(
+    polyhedron: Polyhedron,
+    planes: Sequence[Plane3d],
+    vertex_pool: Optional[VertexPool] = None,
+) -> Polyhedron:
+    """
+    Keeps the part of the closed polyhedron behind all planes, the result is
+    identical to calling cut_polyhedron_by_plane for the planes in order.
+    All vertices are classified against all planes at once. Faces whose
+    vertices are clearly behind every plane are never cut and their edges are
+    matched once, so every plane only processes the faces near the planes, and
+    planes with all vertices clearly behind them are skipped.
+    """
+    faces = list(polyhedron.faces)
+    if len(faces) == 0 or len(planes) == 0:
+        return Polyhedron(faces=faces)
+    row_of_vertex = {}
+    coordinates = []
+    for face in faces:
+        for vertex in face.vertices:
+            if id(vertex) not in row_of_vertex:
+                row_of_vertex[id(vertex)] = len(coordinates)
+                coordinates.append((vertex.x, vertex.y, vertex.z))
+    distances = PlaneSet.from_planes(planes).signed_distances(np.array(coordinates))
+    # calculate_signed_distance_to_plane rounds intermediate vectors, only
+    # distances beyond this margin are certain to have the same sign
+    margin = 1e-4
+    behind = distances < -margin
+    in_front = distances > margin
+    clear_vertices = behind.all(axis=1)
+    clear = [
+        all(clear_vertices[row_of_vertex[id(v)]] for v in f.vertices) for f in faces
+    ]
+    region_edges = HalfEdgeTopology.from_polyhedron(
+        Polyhedron(faces=[face for face, is_clear in zip(faces, clear) if is_clear])
+    ).boundary_edges()
+    for plane_index, plane in enumerate(planes):
+        if behind[:, plane_index].all():
+            continue
+        vertex_is_behind_cache = {}
+        for vertex_id, row in row_of_vertex.items():
+            if behind[row, plane_index]:
+                vertex_is_behind_cache[vertex_id] = True
+            elif in_front[row, plane_index]:
+                vertex_is_behind_cache[vertex_id] = False
+        edge_split_vertices_cache = {}
+        # the faces which are cut, only their vertices can be on the plane
+        near_faces = [face for face, is_clear in zip(faces, clear) if not is_clear]
+        column = distances[:, plane_index].tolist()
+        near_distances = {}
+        for face in near_faces:
+            for vertex in face.vertices:
+                if id(vertex) in near_distances:
+                    continue
+                if id(vertex) in vertex_is_behind_cache:
+                    distance = column[row_of_vertex[id(vertex)]]
+                else:
+                    distance = calculate_signed_distance_to_plane(vertex, plane)
+                    vertex_is_behind_cache[id(vertex)] = distance < 0
+                near_distances[id(vertex)] = distance
+        plane_vertices = _get_plane_vertices(near_faces, near_distances)
+        cut_faces = []
+        cut_clear = []
+        for face, is_clear in zip(faces, clear):
+            if is_clear:
+                cut_faces.append(face)
+                cut_clear.append(True)
+                continue
+            pieces = cut_face_by_plane_into_pieces(
+                face,
+                plane,
+                vertex_is_behind_cache,
+                edge_split_vertices_cache,
+                vertex_pool,
+                plane_vertices,
+            )
+            cut_faces.extend(pieces)
+            cut_clear.extend([False] * len(pieces))
+        # only the cut faces are matched, the edges of the clear faces which
+        # they do not meet were collected once
+        topology = HalfEdgeTopology.from_polyhedron(
+            Polyhedron(
+                faces=[f for f, is_clear in zip(cut_faces, cut_clear) if not is_clear]
+            )
+        )
+        open_edges = {(id(a), id(b)) for a, b in topology.boundary_edges()}
+        if any((id(b), id(a)) not in open_edges for a, b in region_edges):
+            # the clear faces are not closed by the others, match all edges
+            holes = HalfEdgeTopology.from_polyhedron(
+                Polyhedron(faces=cut_faces)
+            ).boundary_loops()
+        else:
+            holes = topology.boundary_loops(closed_by=region_edges)
+        for hole in holes:
+            caps = _cap_faces(hole)
+            cut_faces.extend(caps)
+            cut_clear.extend([False] * len(caps))
+        faces = cut_faces
+        clear = cut_clear
+    return Polyhedron(faces=faces)
+
+
+def get_connected_components(polyhedron: Polyhedron) -> list[Polyhedron]:
+    """
+    Splits the polyhedron in groups of faces connected through shared vertex
+    objects, in order of their first face.
+    """
+    parent = {}  # id(vertex)->id of a vertex in the same component
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for face in polyhedron.faces:
+        for vertex in face.vertices:
+            parent.setdefault(id(vertex), id(vertex))
+        for vertex in face.vertices[1:]:
+            parent[find(id(vertex))] = find(id(face.vertices[0]))
+    components = {}
+    for face in polyhedron.faces:
+        if len(face.vertices) > 0:
+            root = find(id(face.vertices[0]))
+            components.setdefault(root, []).append(face)
+    return [Polyhedron(faces=faces) for faces in components.values()]
+
+
 def get_adjacent_faces(polyhedron: Polyhedron, reference_face_index: int) -> list[int]:
-    edge_to_face_index = {}
-    for face_index, face in enumerate(polyhedron.faces):
-        for edge_index in range(len(face.vertices)):
-            edge = face.get_edge(edge_index)
-            key = (id(edge[0]), id(edge[1]))
-            edge_to_face_index[key] = face_index
-    reference_face = polyhedron.faces[reference_face_index]
-    neighbours = []
-    for edge_index in range(len(reference_face.vertices)):
-        edge = reference_face.get_edge(edge_index)
-        inverted_edge = (edge[1], edge[0])
-        key = (id(inverted_edge[0]), id(inverted_edge[1]))
-        if key in edge_to_face_index:
-            neighbours.append(edge_to_face_index.get(key))
-    return neighbours
+    return polyhedron.topology.face_neighbours(reference_face_index)
@@ -0,0 +1,229 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Plane3d, Vector3d
+from dk_geometry.planes import PlaneSet
+
+# vertices of the intersection closer than this are merged into one vertex
+HALFSPACE_TOLERANCE = 0.01
+
+_EPSILON = 1e-9
+
+
+def _pivot(tableau: np.ndarray, basis: list[int], row: int, column: int):
+    tableau[row] /= tableau[row, column]
+    factors = tableau[:, column].copy()
+    factors[row] = 0
+    tableau -= factors[:, None] * tableau[row]
+    basis[row] = column
+
+
+def _chebyshev_centre(
+    normals: np.ndarray, offsets: np.ndarray
+) -> tuple[np.ndarray, float]:
+    """
+    Centre and radius of the largest ball inside the planes, with a small
+    simplex on: maximize t - 2s with normals @ x + t - s <= offsets and x split
+    in a positive and a negative part. s only becomes positive when there is
+    no point behind all planes.
+    """
+    count = len(offsets)
+    columns = 8  # x+ (3), x- (3), t, s
+    tableau = np.zeros((count + 1, columns + count + 1))
+    tableau[:count, 0:3] = normals
+    tableau[:count, 3:6] = -normals
+    tableau[:count, 6] = 1
+    tableau[:count, 7] = -1
+    tableau[:count, columns : columns + count] = np.eye(count)
+    tableau[:count, -1] = offsets
+    tableau[count, 6] = -1
+    tableau[count, 7] = 2
+    basis = list(range(columns, columns + count))
+    if offsets.min() < 0:
+        # s makes all right hand sides positive, the start of the simplex
+        _pivot(tableau, basis, int(np.argmin(offsets)), 7)
+    for _ in range(50 * (count + columns)):
+        # Bland's rule, the first improving column and the first tied row
+        improving = np.flatnonzero(tableau[count, :-1] < -_EPSILON)
+        if len(improving) == 0:
+            break
+        column = improving[0]
+        positive = np.flatnonzero(tableau[:count, column] > _EPSILON)
+        if len(positive) == 0:
+            raise ValueError("from_halfspaces: the planes do not bound a volume")
+        ratios = tableau[positive, -1] / tableau[positive, column]
+        tied = positive[ratios <= ratios.min() + _EPSILON]
+        row = min(tied, key=lambda r: basis[r])
+        _pivot(tableau, basis, row, column)
+    solution = np.zeros(columns + count)
+    solution[basis] = tableau[:count, -1]
+    return solution[0:3] - solution[3:6], solution[6] - solution[7]
+
+
+def _oriented_normals(points: np.ndarray, triangles: np.ndarray):
+    a, b, c = points[triangles[:, 0]], points[triangles[:, 1]], points[triangles[:, 2]]
+    normals = np.cross(b - a, c - a)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals /= np.maximum(lengths, np.finfo(float).tiny)
+    return normals, np.einsum("ij,ij->i", normals, a)
+
+
+def _convex_hull(points: np.ndarray, epsilon: float) -> np.ndarray:
+    """
+    Triangles of the convex hull, counterclockwise seen from outside, built
+    incrementally. Points within epsilon of the hull are left out.
+    """
+    first = int(np.argmin(points[:, 0]))
+    second = int(np.argmax(np.linalg.norm(points - points[first], axis=1)))
+    line = points[second] - points[first]
+    from_line = np.linalg.norm(np.cross(points - points[first], line), axis=1)
+    third = int(np.argmax(from_line))
+    normal = np.cross(line, points[third] - points[first])
+    from_plane = (
+        (points - points[first])
+        @ normal
+        / max(np.linalg.norm(normal), np.finfo(float).tiny)
+    )
+    fourth = int(np.argmax(np.abs(from_plane)))
+    if abs(from_plane[fourth]) <= epsilon:
+        raise ValueError("from_halfspaces: the planes do not bound a volume")
+    if from_plane[fourth] > 0:
+        second, third = third, second
+    triangles = np.array(
+        [
+            [first, second, third],
+            [first, fourth, second],
+            [second, fourth, third],
+            [third, fourth, first],
+        ]
+    )
+    normals, offsets = _oriented_normals(points, triangles)
+    rest = np.setdiff1d(np.arange(len(points)), [first, second, third, fourth])
+    # a random order keeps the number of replaced triangles small
+    for index in np.random.default_rng(0).permutation(rest):
+        visible = normals @ points[index] - offsets > epsilon
+        if not visible.any():
+            continue
+        edges = {
+            (a, b)
+            for a, b, c in triangles[visible].tolist()
+            for a, b in ((a, b), (b, c), (c, a))
+        }
+        horizon = [(a, b, index) for a, b in edges if (b, a) not in edges]
+        added = np.array(horizon, dtype=np.int64).reshape(-1, 3)
+        added_normals, added_offsets = _oriented_normals(points, added)
+        triangles = np.concatenate([triangles[~visible], added])
+        normals = np.concatenate([normals[~visible], added_normals])
+        offsets = np.concatenate([offsets[~visible], added_offsets])
+    return triangles
+
+
+def _edge_twins(triangles: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Per corner the corner starting the opposite edge, corner = 3 * t + k"""
+    starts = triangles.reshape(-1)
+    finishes = triangles[:, [1, 2, 0]].reshape(-1)
+    keys = starts * vertex_count + finishes
+    order = np.argsort(keys)
+    positions = np.searchsorted(keys[order], finishes * vertex_count + starts)
+    return order[positions.clip(max=len(keys) - 1)]
+
+
+def intersect_halfspaces(
+    planes: Sequence[Plane3d],
+    interior_point: Optional[Vector3d] = None,
+    tolerance: float = HALFSPACE_TOLERANCE,
+) -> tuple[IndexedPolyhedron, np.ndarray]:
+    """
+    The convex polyhedron of the points behind all planes, built as the dual of
+    the convex hull of the planes' poles around an interior point. Each hull
+    triangle is a vertex and each hull point a face, so vertices may have any
+    number of faces. Planes which do not touch the polyhedron give no face.
+    Args:
+        planes: the planes, the polyhedron is on their negative side
+        interior_point: a point well inside, by default the centre of the
+            largest ball inside the planes
+        tolerance: vertices closer than this are merged
+    Returns:
+        the polyhedron and for each of its faces the index of its plane
+    """
+    plane_set = PlaneSet.from_planes(planes)
+    normals, offsets = plane_set.normals, plane_set.offsets
+    if len(offsets) < 4:
+        raise ValueError("from_halfspaces: the planes do not bound a volume")
+    if interior_point is None:
+        # centring on the plane origins keeps the numbers small
+        reference = np.mean([(p.origin.x, p.origin.y, p.origin.z) for p in planes], 0)
+        centre, radius = _chebyshev_centre(normals, offsets - normals @ reference)
+        if radius <= tolerance:
+            raise ValueError("from_halfspaces: there is no volume behind the planes")
+        centre += reference
+    else:
+        centre = np.array([interior_point.x, interior_point.y, interior_point.z])
+    distances = offsets - normals @ centre
+    if distances.min() <= 0:
+        raise ValueError("from_halfspaces: the interior point is not inside")
+    poles = normals / distances[:, None]
+    triangles = _convex_hull(poles, _EPSILON * np.abs(poles).max())
+    hull_normals, hull_offsets = _oriented_normals(poles, triangles)
+    if hull_offsets.min() <= _EPSILON * np.abs(poles).max():
+        raise ValueError("from_halfspaces: the planes do not bound a volume")
+    corners = centre + hull_normals / hull_offsets[:, None]
+
+    # neighbouring triangles with (nearly) the same vertex are one vertex
+    twins = _edge_twins(triangles, len(poles))
+    neighbours = twins // 3
+    own = np.repeat(np.arange(len(triangles)), 3)
+    close = np.linalg.norm(corners[own] - corners[neighbours], axis=1) < tolerance
+    pairs = own[close], neighbours[close]
+    labels = np.arange(len(triangles))
+    while True:
+        merged = labels.copy()
+        np.minimum.at(merged, pairs[0], labels[pairs[1]])
+        if np.array_equal(merged, labels):
+            break
+        labels = merged[merged]
+    labels, rows = np.unique(labels, return_inverse=True)
+    vertices = np.zeros((len(labels), 3))
+    np.add.at(vertices, rows, corners)
+    vertices /= np.bincount(rows)[:, None]
+
+    # walk counterclockwise around every hull point, from a corner to the one
+    # starting the edge back to the previous corner of its triangle, which is
+    # counterclockwise around the face as well
+    previous = (
+        3 * (np.arange(3 * len(triangles)) // 3)
+        + (np.arange(3 * len(triangles)) + 2) % 3
+    )
+    following = twins[previous]
+    points = triangles.reshape(-1)
+    face_planes, first_corners = np.unique(points, return_index=True)
+    valences = np.bincount(points)[face_planes]
+    walk = np.empty((len(face_planes), valences.max()), dtype=np.int64)
+    walk[:, 0] = first_corners
+    for step in range(1, walk.shape[1]):
+        walk[:, step] = following[walk[:, step - 1]]
+    face_rows = rows[walk // 3]
+    in_face = np.arange(walk.shape[1]) < valences[:, None]
+    last = face_rows[np.arange(len(face_planes)), valences - 1]
+    repeated = np.concatenate(
+        [(face_rows[:, :1] == last[:, None]), face_rows[:, 1:] == face_rows[:, :-1]],
+        axis=1,
+    )
+    keep = in_face & ~repeated
+    sizes = keep.sum(axis=1)
+    real = sizes >= 3
+    face_indices = face_rows[real][keep[real]]
+    face_offsets = np.concatenate([[0], np.cumsum(sizes[real])]).astype(np.int64)
+    return (
+        IndexedPolyhedron(
+            vertices=vertices,
+            face_offsets=face_offsets,
+            face_indices=face_indices.astype(np.int64),
+        ),
+        face_planes[real],
+    )
@@ -0,0 +1,112 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from dk_geometry.model import Face, Polyhedron, Vector3d
+
+
+@dataclass(eq=False)
+class IndexedPolyhedron:
+    """
+    Polyhedron stored as one shared vertex buffer plus flat face index arrays.
+    Vertex identity is the row index in the buffer, so topology can be compared
+    with integers instead of id() of Vector3d objects.
+
+    vertices: (N, 3) float64 array, one row per distinct vertex
+    face_offsets: (F + 1,) int64 array, face f is
+        face_indices[face_offsets[f]:face_offsets[f + 1]]
+    face_indices: (M,) int64 array of rows into vertices
+    """
+
+    vertices: np.ndarray
+    face_offsets: np.ndarray
+    face_indices: np.ndarray
+
+    @classmethod
+    def from_polyhedron(cls, polyhedron: Polyhedron) -> IndexedPolyhedron:
+        """
+        Vertices are numbered in order of first appearance, vertex objects shared
+        between faces get a single row.
+        """
+        row_of_vertex = {}
+        coordinates = []
+        face_indices = []
+        face_offsets = [0]
+        for face in polyhedron.faces:
+            for vertex in face.vertices:
+                row = row_of_vertex.get(id(vertex))
+                if row is None:
+                    row = len(coordinates)
+                    row_of_vertex[id(vertex)] = row
+                    coordinates.append((vertex.x, vertex.y, vertex.z))
+                face_indices.append(row)
+            face_offsets.append(len(face_indices))
+        return cls(
+            vertices=np.array(coordinates, dtype=np.float64).reshape(-1, 3),
+            face_offsets=np.array(face_offsets, dtype=np.int64),
+            face_indices=np.array(face_indices, dtype=np.int64),
+        )
+
+    def to_polyhedron(self) -> Polyhedron:
+        """
+        Creates one Vector3d per row, faces referencing the same row share the
+        vertex object.
+        """
+        vertices = [Vector3d(x, y, z) for x, y, z in self.vertices.tolist()]
+        indices = self.face_indices.tolist()
+        offsets = self.face_offsets.tolist()
+        return Polyhedron(
+            faces=[
+                Face(vertices=[vertices[i] for i in indices[start:finish]])
+                for start, finish in zip(offsets[:-1], offsets[1:])
+            ]
+        )
+
+    def __len__(self):
+        return self.face_count
+
+    @property
+    def face_count(self) -> int:
+        return len(self.face_offsets) - 1
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def face_sizes(self) -> np.ndarray:
+        return np.diff(self.face_offsets)
+
+    @property
+    def corner_faces(self) -> np.ndarray:
+        """Face index of every entry of face_indices"""
+        return np.repeat(np.arange(self.face_count), self.face_sizes)
+
+    @property
+    def next_corners(self) -> np.ndarray:
+        """Position in face_indices of the corner following every corner of its face"""
+        next_corners = np.arange(1, len(self.face_indices) + 1)
+        sizes = self.face_sizes
+        non_empty = sizes > 0
+        next_corners[self.face_offsets[1:][non_empty] - 1] = self.face_offsets[:-1][
+            non_empty
+        ]
+        return next_corners
+
+    @property
+    def edges(self) -> np.ndarray:
+        """(M, 2) array of directed edges (start row, finish row), one per corner"""
+        return np.stack(
+            [self.face_indices, self.face_indices[self.next_corners]], axis=1
+        )
+
+    def face(self, index: int) -> np.ndarray:
+        return self.face_indices[
+            self.face_offsets[index] : self.face_offsets[index + 1]
+        ]
+
+    def face_vertices(self, index: int) -> np.ndarray:
+        return self.vertices[self.face(index)]
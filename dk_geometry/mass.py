@@ -0,0 +1,138 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+import numpy as np
+
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Polyhedron
+
+
+@dataclass(eq=False)
+class MassProperties:
+    """
+    Mass properties of a batch of polyhedra, for a unit density.
+
+    volume: (P,) volumes, negative for inside-out polyhedra
+    area: (P,) total surface areas
+    face_area: (F,) areas of the faces of all polyhedra, the faces of
+        polyhedron p are face_area[face_offsets[p]:face_offsets[p + 1]]
+    face_offsets: (P + 1,) ranges in face_area
+    centroid: (P, 3) centres of mass, NaN for polyhedra without volume
+    inertia: (P, 3, 3) inertia tensors around the centroids
+    """
+
+    volume: np.ndarray
+    area: np.ndarray
+    face_area: np.ndarray
+    face_offsets: np.ndarray
+    centroid: np.ndarray
+    inertia: np.ndarray
+
+
+def _sum_by(ids: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    flat = values.reshape(len(values), -1)
+    sums = np.stack(
+        [
+            np.bincount(ids, weights=flat[:, column], minlength=count)
+            for column in range(flat.shape[1])
+        ],
+        axis=1,
+    )
+    return sums.reshape((count,) + values.shape[1:])
+
+
+def compute_mass_properties(
+    polyhedra: Sequence[Union[Polyhedron, IndexedPolyhedron]]
+) -> MassProperties:
+    """
+    Computes the mass properties of all polyhedra in one vectorized pass.
+    Every face is split into a fan of triangles from its first vertex, each
+    triangle forms a tetrahedron with a reference point of its polyhedron and
+    the tetrahedra are summed per face and per polyhedron. The faces must be
+    planar, they may be concave.
+    """
+    indexed = [
+        p if isinstance(p, IndexedPolyhedron) else IndexedPolyhedron.from_polyhedron(p)
+        for p in polyhedra
+    ]
+    count = len(indexed)
+    face_counts = np.array([p.face_count for p in indexed], dtype=np.int64)
+    face_offsets = np.concatenate([[0], np.cumsum(face_counts)])
+    if count == 0 or face_offsets[-1] == 0:
+        return MassProperties(
+            volume=np.zeros(count),
+            area=np.zeros(count),
+            face_area=np.zeros(0),
+            face_offsets=face_offsets,
+            centroid=np.full((count, 3), np.nan),
+            inertia=np.zeros((count, 3, 3)),
+        )
+    # every polyhedron is moved to its vertex mean to limit the cancellation
+    references = np.stack(
+        [
+            p.vertices.mean(axis=0) if p.vertex_count > 0 else np.zeros(3)
+            for p in indexed
+        ]
+    )
+    vertex_counts = np.array([p.vertex_count for p in indexed], dtype=np.int64)
+    vertices = np.concatenate([p.vertices for p in indexed]) - np.repeat(
+        references, vertex_counts, axis=0
+    )
+    vertex_offsets = np.concatenate([[0], np.cumsum(vertex_counts)[:-1]])
+    corner_counts = np.array([len(p.face_indices) for p in indexed], dtype=np.int64)
+    face_indices = np.concatenate([p.face_indices for p in indexed]) + np.repeat(
+        vertex_offsets, corner_counts
+    )
+    corner_offsets = np.concatenate([[0], np.cumsum(corner_counts)[:-1]])
+    face_starts = np.concatenate([p.face_offsets[:-1] for p in indexed]) + np.repeat(
+        corner_offsets, face_counts
+    )
+    face_sizes = np.concatenate([p.face_sizes for p in indexed])
+
+    corner_face = np.repeat(np.arange(len(face_sizes)), face_sizes)
+    position = np.arange(len(face_indices)) - face_starts[corner_face]
+    fan = (position >= 1) & (position <= face_sizes[corner_face] - 2)
+    corners = np.nonzero(fan)[0]
+    triangle_face = corner_face[corners]
+    a = vertices[face_indices[face_starts[triangle_face]]]
+    b = vertices[face_indices[corners]]
+    c = vertices[face_indices[corners + 1]]
+    triangle_polyhedron = np.repeat(np.arange(count), face_counts)[triangle_face]
+
+    area_vectors = _sum_by(triangle_face, np.cross(b - a, c - a), len(face_sizes))
+    face_area = np.linalg.norm(area_vectors, axis=1) / 2
+    area = np.bincount(
+        np.repeat(np.arange(count), face_counts), weights=face_area, minlength=count
+    )
+
+    determinants = np.einsum("ij,ij->i", a, np.cross(b, c))
+    volume = _sum_by(triangle_polyhedron, determinants, count) / 6
+    corner_sum = a + b + c
+    moment = _sum_by(triangle_polyhedron, determinants[:, None] * corner_sum, count)
+    outer = (
+        np.einsum("ij,ik->ijk", a, a)
+        + np.einsum("ij,ik->ijk", b, b)
+        + np.einsum("ij,ik->ijk", c, c)
+        + np.einsum("ij,ik->ijk", corner_sum, corner_sum)
+    )
+    second_moment = (
+        _sum_by(triangle_polyhedron, determinants[:, None, None] * outer, count) / 120
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        local_centroid = moment / 24 / volume[:, None]
+    centred = second_moment - volume[:, None, None] * np.einsum(
+        "ij,ik->ijk", local_centroid, local_centroid
+    )
+    trace = np.trace(centred, axis1=1, axis2=2)
+    inertia = trace[:, None, None] * np.eye(3) - centred
+    return MassProperties(
+        volume=volume,
+        area=area,
+        face_area=face_area,
+        face_offsets=face_offsets,
+        centroid=local_centroid + references,
+        inertia=inertia,
+    )
@@ -2,46 +2,334 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
-from typing import Self, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional, Self, Union
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict
 
-from dk_geometry.enums import AngleType, FaceNormal
+from dk_geometry.enums import FACE_NORMAL_BITS, AngleType, FaceNormal
+
+if TYPE_CHECKING:
+    from dk_geometry.planes import PlaneSet
+    from dk_geometry.topology import HalfEdgeTopology
+
+
+# When set, Vector3d objects keep their coordinates unrounded, see deferred_rounding
+_deferred_rounding: ContextVar[bool] = ContextVar("_deferred_rounding", default=False)
+
+# integer grid units per mm of the fixed point mode, the default is micrometres
+FIXED_POINT_SCALE = 1000
+
+# When not 0, Vector3d coordinates are snapped to a grid, see fixed_point
+_fixed_point_scale: ContextVar[int] = ContextVar("_fixed_point_scale", default=0)
+
+# The number of active deferred_rounding and fixed_point blocks, in any thread
+# or task. While it is 0 Vector3d skips looking up the mode variables above.
+_modes_active = 0
+
+# vertex counts from which Vector3dArray beats a plain loop over Vector3d objects,
+# below it converting the vertices to an array costs more than it saves
+VECTORIZE_THRESHOLD = 64
+
+# When set, operations share unchanged geometry with their inputs, see structural_sharing
+_structural_sharing: ContextVar[bool] = ContextVar("_structural_sharing", default=False)
+
+
+@contextmanager
+def deferred_rounding():
+    """
+    Vector3d objects created inside this block keep unrounded coordinates, which
+    avoids rounding every temporary of an expression. Round the results with
+    Vector3d.rounded() before handing them out.
+    """
+    global _modes_active
+    token = _deferred_rounding.set(True)
+    _modes_active += 1
+    try:
+        yield
+    finally:
+        _modes_active -= 1
+        _deferred_rounding.reset(token)
+
+
+@contextmanager
+def fixed_point(scale: int = FIXED_POINT_SCALE):
+    """
+    Vector3d objects created inside this block are snapped to a grid of
+    1 / scale mm instead of rounded to 5 decimals and store their integer grid
+    coordinates (Vector3d.fixed). Two such vectors on the same grid compare
+    exactly by those integers, any other comparison is at 2 decimals as
+    outside the block. Hashes do not depend on the block, so sets and dicts of
+    vectors can be used on both sides of it. A VertexPool made inside the
+    block welds by grid coordinates.
+    """
+    global _modes_active
+    token = _fixed_point_scale.set(scale)
+    _modes_active += 1
+    try:
+        yield
+    finally:
+        _modes_active -= 1
+        _fixed_point_scale.reset(token)
+
+
+@contextmanager
+def structural_sharing():
+    """
+    Inside this block geometry is treated as immutable: operations such as
+    apply_slice_interval and generate_offset return polyhedra which share the
+    faces and vertices they did not change with their inputs, instead of deep
+    copies. The faces and vertices of the results are made read only, which
+    includes the input objects they share: setting a coordinate raises an
+    AttributeError and changing the vertices of a face a TypeError.
+    """
+    token = _structural_sharing.set(True)
+    try:
+        yield
+    finally:
+        _structural_sharing.reset(token)
+
+
+def is_structural_sharing() -> bool:
+    return _structural_sharing.get()
 
 
-@dataclass
-class Vector3d:
+def get_fixed_point_scale() -> int:
+    """The scale of the active fixed_point block, 0 outside any"""
+    return _fixed_point_scale.get()
+
+
+# Bumped by every change of existing geometry: a vertex coordinate, the
+# vertices of a face or the list object of a face or polyhedron, see
+# _GeometryCache. Changing the faces of a polyhedron only counts on its list.
+_geometry_version = 0
+
+
+def _geometry_changed():
+    global _geometry_version
+    _geometry_version += 1
+
+
+class _TrackedList(list):
+    """
+    A list which reports its changes, see _GeometryCache. Changing the vertices
+    of a face bumps the geometry version, as every polyhedron using the face
+    is affected.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.version = 0
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def _changed(self):
+        self.version += 1
+        _geometry_changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._changed()
+        return result
+
+    def __imul__(self, other):
+        result = super().__imul__(other)
+        self._changed()
+        return result
+
+    def append(self, item):
+        super().append(item)
+        self._changed()
+
+    def extend(self, items):
+        super().extend(items)
+        self._changed()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._changed()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+class _TrackedFaceList(_TrackedList):
+    """
+    The faces of a polyhedron, which only counts its own changes: nothing else
+    caches values derived from the faces list of a polyhedron.
+    """
+
+    __slots__ = ()
+
+    def _changed(self):
+        self.version += 1
+
+
+def _refuse_change(self, *args, **kwargs):
+    raise TypeError("the vertices of shared faces are read only, use a copy")
+
+
+class _FrozenList(_TrackedList):
+    """The vertices of a face shared by structural_sharing"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse_change
+    append = extend = insert = pop = remove = reverse = sort = clear = _refuse_change
+
+
+class _VectorSlots:
+    """The storage of Vector3d, without the change tracking of its __setattr__"""
+
+    __slots__ = ("x", "y", "z")
+
+
+def _restore_vector(x: float, y: float, z: float) -> Vector3d:
+    vector = object.__new__(_VectorSlots)
+    vector.x = x
+    vector.y = y
+    vector.z = z
+    vector.__class__ = Vector3d
+    return vector
+
+
+@dataclass(init=False)
+class Vector3d(_VectorSlots):
+    __slots__ = ()
     x: float
     y: float
     z: float
 
-    def __post_init__(self):
+    def __new__(cls, x: float, y: float, z: float):
         # Round the float attributes to a certain number of decimal places
-        self.x = round(self.x, 5)
-        self.y = round(self.y, 5)
-        self.z = round(self.z, 5)
+        return cls._make(x, y, z)
+
+    def __setattr__(self, name: str, value: float):
+        # moving a vertex of existing geometry outdates the values cached on it
+        object.__setattr__(self, name, value)
+        _geometry_changed()
+
+    def __reduce__(self):
+        return _restore_vector, (self.x, self.y, self.z)
+
+    @classmethod
+    def _make(cls, x: float, y: float, z: float) -> Vector3d:
+        # the coordinates are set on the plain slots before the type is set, a
+        # new vector does not change any existing geometry
+        vector = object.__new__(_VectorSlots)
+        if _modes_active and _deferred_rounding.get():
+            vector.x = x
+            vector.y = y
+            vector.z = z
+        elif _modes_active and _fixed_point_scale.get():
+            return _FixedPointVector3d._snap(x, y, z, _fixed_point_scale.get())
+        else:
+            vector.x = round(x, 5)
+            vector.y = round(y, 5)
+            vector.z = round(z, 5)
+        vector.__class__ = cls
+        return vector
+
+    def _assign(self, x: float, y: float, z: float):
+        if _modes_active and _deferred_rounding.get():
+            self.x = x
+            self.y = y
+            self.z = z
+            return
+        scale = _fixed_point_scale.get() if _modes_active else 0
+        if scale:
+            self.x = round(x * scale) / scale
+            self.y = round(y * scale) / scale
+            self.z = round(z * scale) / scale
+        else:
+            self.x = round(x, 5)
+            self.y = round(y, 5)
+            self.z = round(z, 5)
+
+    def rounded(self) -> Vector3d:
+        scale = _fixed_point_scale.get()
+        if scale:
+            x, y, z = self.fixed(scale)
+            return Vector3d(x / scale, y / scale, z / scale)
+        return Vector3d(round(self.x, 5), round(self.y, 5), round(self.z, 5))
+
+    def fixed(self, scale: int = 0) -> tuple[int, int, int]:
+        """
+        The coordinates as integers on a grid of 1 / scale mm, by default the
+        grid of the active fixed_point block or else FIXED_POINT_SCALE
+        """
+        scale = scale or _fixed_point_scale.get() or FIXED_POINT_SCALE
+        return round(self.x * scale), round(self.y * scale), round(self.z * scale)
 
     def __add__(self, other):
-        return Vector3d(x=self.x + other.x, y=self.y + other.y, z=self.z + other.z)
+        return Vector3d._make(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __sub__(self, other):
-        return Vector3d(x=self.x - other.x, y=self.y - other.y, z=self.z - other.z)
+        return Vector3d._make(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def __neg__(self):
-        return Vector3d(x=-self.x, y=-self.y, z=-self.z)
+        return Vector3d._make(-self.x, -self.y, -self.z)
 
     def __mul__(self, other: Union[float, Self]):
-        if isinstance(other, self.__class__):
-            return Vector3d(x=self.x * other.x, y=self.y * other.y, z=self.z * other.z)
+        if isinstance(other, Vector3d):
+            return Vector3d._make(self.x * other.x, self.y * other.y, self.z * other.z)
         elif isinstance(other, (int, float)):
-            return Vector3d(x=self.x * other, y=self.y * other, z=self.z * other)
+            return Vector3d._make(self.x * other, self.y * other, self.z * other)
         else:
             raise NotImplementedError
 
     def __truediv__(self, other):
         return self * (1 / other)
 
+    def __iadd__(self, other):
+        self._assign(self.x + other.x, self.y + other.y, self.z + other.z)
+        return self
+
+    def __isub__(self, other):
+        self._assign(self.x - other.x, self.y - other.y, self.z - other.z)
+        return self
+
+    def __imul__(self, other: Union[float, Self]):
+        if isinstance(other, Vector3d):
+            self._assign(self.x * other.x, self.y * other.y, self.z * other.z)
+        elif isinstance(other, (int, float)):
+            self._assign(self.x * other, self.y * other, self.z * other)
+        else:
+            raise NotImplementedError
+        return self
+
     def __eq__(self, other):
         return (
             round(self.x, 2) == round(other.x, 2)
@@ -56,7 +344,7 @@ class Vector3d:
         return self.x * other.x + self.y * other.y + self.z * other.z
 
     def crossProduct(self, other):
-        return Vector3d(
+        return Vector3d._make(
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x,
@@ -75,6 +363,115 @@ class Vector3d:
         return self / self.length
 
 
+@dataclass(eq=False)
+class Vector3dArray:
+    """
+    Many vectors as one (N, 3) float array, with the vocabulary of Vector3d.
+    Operands can be another Vector3dArray of the same length, a single
+    Vector3d which is broadcast over all rows, or a number. The coordinates are
+    not rounded, to_vectors rounds them like the Vector3d constructor.
+    """
+
+    values: np.ndarray
+
+    def __post_init__(self):
+        self.values = np.asarray(self.values, dtype=float).reshape(-1, 3)
+
+    @classmethod
+    def from_vectors(cls, vectors: list[Vector3d]) -> Vector3dArray:
+        return cls(np.array([(v.x, v.y, v.z) for v in vectors], dtype=float))
+
+    def to_vectors(self) -> list[Vector3d]:
+        return [Vector3d._make(x, y, z) for x, y, z in self.values.tolist()]
+
+    def fixed(self, scale: int = 0) -> np.ndarray:
+        """(N, 3) int64 grid coordinates, see Vector3d.fixed"""
+        scale = scale or _fixed_point_scale.get() or FIXED_POINT_SCALE
+        return np.rint(self.values * scale).astype(np.int64)
+
+    @staticmethod
+    def _operand(other) -> np.ndarray:
+        if isinstance(other, Vector3dArray):
+            return other.values
+        if isinstance(other, Vector3d):
+            return np.array([other.x, other.y, other.z])
+        if isinstance(other, np.ndarray) and other.ndim == 1:
+            return other[:, None]  # one factor per row
+        return other
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index) -> Union[Vector3d, Vector3dArray]:
+        if isinstance(index, (int, np.integer)):
+            return Vector3d._make(*self.values[index].tolist())
+        return Vector3dArray(self.values[index])
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.values[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.values[:, 2]
+
+    def __add__(self, other):
+        return Vector3dArray(self.values + self._operand(other))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        return Vector3dArray(self.values - self._operand(other))
+
+    def __rsub__(self, other):
+        return Vector3dArray(self._operand(other) - self.values)
+
+    def __neg__(self):
+        return Vector3dArray(-self.values)
+
+    def __mul__(self, other):
+        return Vector3dArray(self.values * self._operand(other))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return Vector3dArray(self.values / self._operand(other))
+
+    def dotProduct(self, other) -> np.ndarray:
+        # summed in the same order as Vector3d.dotProduct, for identical results
+        b = self._operand(other)
+        a = self.values
+        if b.ndim == 1:
+            return a[:, 0] * b[0] + a[:, 1] * b[1] + a[:, 2] * b[2]
+        return a[:, 0] * b[:, 0] + a[:, 1] * b[:, 1] + a[:, 2] * b[:, 2]
+
+    def crossProduct(self, other) -> Vector3dArray:
+        return Vector3dArray(
+            np.cross(self.values, np.broadcast_to(self._operand(other), (len(self), 3)))
+        )
+
+    @property
+    def squaredLength(self) -> np.ndarray:
+        return self.dotProduct(self)
+
+    @property
+    def length(self) -> np.ndarray:
+        return np.sqrt(self.squaredLength)
+
+    @property
+    def normalized(self) -> Vector3dArray:
+        return self / self.length
+
+
 @dataclass
 class Plane3d:
     origin: Vector3d
@@ -82,22 +479,40 @@ class Plane3d:
 
     @property
     def faceNormal(self) -> FaceNormal:
-        types = []
-
+        mask = 0
         if self.normal.x < -0.001:
-            types.append("L")  # left
+            mask |= FACE_NORMAL_BITS["L"]  # left
         if self.normal.x > 0.001:
-            types.append("R")  # right
+            mask |= FACE_NORMAL_BITS["R"]  # right
         if self.normal.y < -0.001:
-            types.append("B")  # bottom
+            mask |= FACE_NORMAL_BITS["B"]  # bottom
         if self.normal.y > 0.001:
-            types.append("T")  # top
+            mask |= FACE_NORMAL_BITS["T"]  # top
         if self.normal.z < -0.001:
-            types.append("BK")  # Back
+            mask |= FACE_NORMAL_BITS["BK"]  # Back
         if self.normal.z > 0.001:
-            types.append("F")  # Front
+            mask |= FACE_NORMAL_BITS["F"]  # Front
 
-        return FaceNormal.from_stringlist(types)
+        return FaceNormal.from_mask(mask)
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    min_x: float
+    max_x: float
+    min_y: float
+    max_y: float
+    min_z: float
+    max_z: float
+
+    @classmethod
+    def from_vertices(cls, vertices: list[Vector3d]) -> BoundingBox:
+        xs, ys, zs = zip(*[(v.x, v.y, v.z) for v in vertices])
+        return cls(min(xs), max(xs), min(ys), max(ys), min(zs), max(zs))
+
+    def dump(self) -> dict[str, float]:
+        fields = ["max_x", "min_x", "max_y", "min_y", "max_z", "min_z"]
+        return {field: getattr(self, field) for field in fields}
 
 
 @dataclass
@@ -120,9 +535,169 @@ class Normal:
     z: float
 
 
+class _ReadOnlyVector:
+    """
+    Makes a Vector3d class read only: its coordinates cannot be set, and the
+    in-place operators return a new vector, so `n += d` does not change it.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: float):
+        raise AttributeError("cached and shared vectors are read only, use a copy")
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __isub__(self, other):
+        return self - other
+
+    def __imul__(self, other: Union[float, Vector3d]):
+        return self * other
+
+
+class _FrozenVector3d(_ReadOnlyVector, Vector3d):
+    """A Vector3d handed out from a cache or shared, see structural_sharing"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"Vector3d(x={self.x!r}, y={self.y!r}, z={self.z!r})"
+
+
+class _FixedPointVector3d(Vector3d):
+    """
+    A Vector3d created in a fixed_point block. It stores the integer grid
+    coordinates next to the snapped float ones, so that it compares to vectors
+    on the same grid without rounding. Equal grid coordinates give equal
+    floats, so the 2 decimal hash of Vector3d stays consistent. Moving it drops
+    the stored grid.
+    """
+
+    __slots__ = ("grid", "scale")
+
+    @classmethod
+    def _snap(cls, x: float, y: float, z: float, scale: int) -> Vector3d:
+        grid = (round(x * scale), round(y * scale), round(z * scale))
+        vector = object.__new__(cls)
+        object.__setattr__(vector, "x", grid[0] / scale)
+        object.__setattr__(vector, "y", grid[1] / scale)
+        object.__setattr__(vector, "z", grid[2] / scale)
+        object.__setattr__(vector, "grid", grid)
+        object.__setattr__(vector, "scale", scale)
+        return vector
+
+    def __setattr__(self, name: str, value: float):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "scale", 0)
+        _geometry_changed()
+
+    def __repr__(self):
+        return f"Vector3d(x={self.x!r}, y={self.y!r}, z={self.z!r})"
+
+    def __eq__(self, other):
+        if (
+            isinstance(other, _FixedPointVector3d)
+            and self.scale
+            and self.scale == other.scale
+        ):
+            return self.grid == other.grid
+        return Vector3d.__eq__(self, other)
+
+    __hash__ = Vector3d.__hash__
+
+    def fixed(self, scale: int = 0) -> tuple[int, int, int]:
+        scale = scale or _fixed_point_scale.get() or FIXED_POINT_SCALE
+        if scale == self.scale:
+            return self.grid
+        return super().fixed(scale)
+
+
+class _FrozenFixedPointVector3d(_ReadOnlyVector, _FixedPointVector3d):
+    """A _FixedPointVector3d shared by structural_sharing"""
+
+    __slots__ = ()
+
+
+# the read only class which a vector is switched to by _make_read_only
+_READ_ONLY_VECTOR_TYPES = {
+    Vector3d: _FrozenVector3d,
+    _FixedPointVector3d: _FrozenFixedPointVector3d,
+}
+
+
+def _frozen(vector: Vector3d) -> Vector3d:
+    frozen = object.__new__(_VectorSlots)
+    frozen.x = vector.x
+    frozen.y = vector.y
+    frozen.z = vector.z
+    frozen.__class__ = _FrozenVector3d
+    return frozen
+
+
+class _GeometryCache:
+    """
+    Stores values derived from the geometry next to the geometry version and
+    the version of the tracked list they were computed at. While neither
+    changed the values are returned without any check. After a change, a
+    snapshot of the vertex objects and coordinates decides once whether this
+    geometry was affected, which drops the values.
+    A plain list given for the tracked attribute is copied into a tracked list,
+    changes made through the given list object are not seen. A tracked list,
+    such as the vertices of another face, is used as it is and stays shared.
+    The cached objects are shared between callers and must not be modified,
+    cached vectors are read only.
+    """
+
+    _cache_key: list = None
+    _cache: dict = None
+    _cache_version: int = None
+    _cache_list_version: int = None
+    # the list attribute holding the geometry, and its tracked list type
+    _tracked_attribute = None
+    _tracked_type = _TrackedList
+
+    def __setattr__(self, name: str, value: Any):
+        if name == self._tracked_attribute:
+            if name in self.__dict__:
+                _geometry_changed()
+            if type(value) is not self._tracked_type:
+                value = self._tracked_type(value)
+        object.__setattr__(self, name, value)
+
+    def _geometry_key(self) -> list:
+        raise NotImplementedError
+
+    def _cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        list_version = self.__dict__[self._tracked_attribute].version
+        if (
+            self._cache_version != _geometry_version
+            or self._cache_list_version != list_version
+        ):
+            key = self._geometry_key()
+            if key != self._cache_key:
+                self._cache_key = key
+                self._cache = {}
+            self._cache_version = _geometry_version
+            self._cache_list_version = list_version
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        value = compute()
+        cache[name] = value
+        return value
+
+
 @dataclass
-class Face:
+class Face(_GeometryCache):
     vertices: list[Vector3d]
+    _cache_key: list = field(default=None, init=False, repr=False, compare=False)
+    _cache: dict = field(default=None, init=False, repr=False, compare=False)
+    _cache_version: int = field(default=None, init=False, repr=False, compare=False)
+    _cache_list_version: int = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _tracked_attribute = "vertices"
 
     def __eq__(self, other):
         sorted_vertices = sorted(self.vertices, key=lambda v: (v.x, v.y, v.z))
@@ -142,72 +717,42 @@ class Face:
         def __iter__(self):
             return iter((self.size1, self.size2))
 
+    def _geometry_key(self) -> list:
+        return [(id(v), v.x, v.y, v.z) for v in self.vertices]
+
     @property
     def plane(self) -> Plane3d:
-        return Plane3d(
-            origin=self.vertices[0],
-            normal=self.areaVector.normalized,
+        return self._cached(
+            "plane",
+            lambda: Plane3d(
+                origin=self.vertices[0], normal=_frozen(self.areaVector.normalized)
+            ),
         )
 
     @property
     def triangles(self) -> list[list[Vector3d]]:
-        def are_points_on_the_same_side_of_line(
-            point1: Vector3d, point2: Vector3d, line: Line3d
-        ):
-            normal1 = (point1 - line.origin).crossProduct(line.direction)
-            normal2 = (point2 - line.origin).crossProduct(line.direction)
-            return normal1.dotProduct(normal2) > 0
-
-        def is_point_in_triangle(point: Vector3d, triangle: list[Vector3d], tolerance):
-            for edge_index in range(3):
-                line = Line3d(
-                    triangle[edge_index],
-                    triangle[(edge_index + 1) % 3] - triangle[edge_index],
-                )
-                third_point = triangle[(edge_index + 2) % 3]
-                if not are_points_on_the_same_side_of_line(point, third_point, line):
-                    if (point - line.origin).crossProduct(
-                        line.direction
-                    ).length > tolerance * line.direction.length:
-                        return False
-            return True
-
-        face_normal = self.plane.normal
-        contour = self.vertices[:]
-        triangles = []
-        while len(contour) > 3:
-            for corner_index in range(len(contour)):
-                previous_index = (corner_index - 1) % len(contour)
-                next_index = (corner_index + 1) % len(contour)
-                triangle = [
-                    contour[previous_index],
-                    contour[corner_index],
-                    contour[next_index],
-                ]
-                if Face(vertices=triangle).areaVector.dotProduct(face_normal) < 0:
-                    continue
-                can_be_cut = True
-                for another_index in range(len(contour)):
-                    if another_index in [corner_index, previous_index, next_index]:
-                        continue
-                    if is_point_in_triangle(contour[another_index], triangle, 0.001):
-                        can_be_cut = False
-                        break
-                if not can_be_cut:
-                    continue
-                triangles.append(triangle)
-                contour.pop(corner_index)
-                break
-        triangles.append(contour)
-        return triangles
+        return [
+            [self.vertices[index] for index in triangle]
+            for triangle in self.triangle_indices
+        ]
+
+    @property
+    def triangle_indices(self) -> list[tuple[int, int, int]]:
+        from .triangulation import triangulate_face
+
+        return self._cached("triangle_indices", lambda: triangulate_face(self))
 
     @property
     def areaVector(self) -> Vector3d:
+        return self._cached("areaVector", self._compute_area_vector)
+
+    def _compute_area_vector(self) -> Vector3d:
+        # no in-place operators, those would count as a change of the geometry
         area = Vector3d(0, 0, 0)
         for e in range(len(self.vertices)):
             edge = self.get_edge(e)
-            area += edge[0].crossProduct(edge[1]) / 2
-        return area
+            area = area + edge[0].crossProduct(edge[1])
+        return _frozen(area * 0.5)
 
     @property
     def surfaceArea(self) -> float:
@@ -215,100 +760,66 @@ class Face:
 
     @property
     def faceNormal(self) -> FaceNormal:
-        return self.plane.faceNormal
+        return self._cached("faceNormal", lambda: self.plane.faceNormal)
+
+    @property
+    def aabb(self) -> BoundingBox:
+        return self._cached("aabb", lambda: BoundingBox.from_vertices(self.vertices))
 
     @property
     def min_x(self) -> float:
-        return min([v.x for v in self.vertices])
+        return self.aabb.min_x
 
     @property
     def max_x(self) -> float:
-        return max([v.x for v in self.vertices])
+        return self.aabb.max_x
 
     @property
     def min_y(self) -> float:
-        return min([v.y for v in self.vertices])
+        return self.aabb.min_y
 
     @property
     def max_y(self) -> float:
-        return max([v.y for v in self.vertices])
+        return self.aabb.max_y
 
     @property
     def min_z(self) -> float:
-        return min([v.z for v in self.vertices])
+        return self.aabb.min_z
 
     @property
     def max_z(self) -> float:
-        return max([v.z for v in self.vertices])
+        return self.aabb.max_z
 
     @property
     def lw_dimensions(self) -> Face.LWDimensions:
         """
-        Returns the bounding rectangle for the face.
+        Returns the minimum area bounding rectangle for the face.
         The second direction is selected to be orthogonal to the first
         one and parallel to the face.
         """
+        return self._cached("lw_dimensions", self._compute_lw_dimensions)
 
-        def get_edge_direction(edge):
-            return (edge[1] - edge[0]).normalized
-
-        def measure_parallel_edges(face, direction):
-            count = 0
-            for edge_index in range(0, len(face.vertices)):
-                edge_direction = get_edge_direction(face.get_edge(edge_index))
-                sin = edge_direction.crossProduct(direction).length
-                if sin < 0.01:
-                    count += 1
-            return count
-
-        def measure_orthogonal_edges(face, direction):
-            count = 0
-            for edge_index in range(0, len(face.vertices)):
-                edge_direction = get_edge_direction(face.get_edge(edge_index))
-                cos = abs(edge_direction.dotProduct(direction))
-                if cos < 0.01:
-                    count += 1
-            return count
-
-        direction1 = Vector3d(1, 0, 0)
-        best_length = 0
-        for edge_index in range(0, len(self.vertices)):
-            candidate = get_edge_direction(self.get_edge(edge_index))
-            length = measure_parallel_edges(self, candidate) + measure_orthogonal_edges(
-                self, candidate
-            )
-            if length > best_length:
-                best_length = length
-                direction1 = candidate
-        direction2 = direction1.crossProduct(self.plane.normal).normalized
-        if (
-            self.plane.normal.crossProduct(Vector3d(0, 1, 0)).length < 0.01
-        ):  # ~horizontal plane
-            # make the first direction to be the closest one to the X axis
-            if abs(direction1.x) < abs(direction2.x):
-                direction1, direction2 = direction2, direction1
-        elif abs(direction1.y) < 0.01:  # direction1 is ~horizontal
-            direction1, direction2 = direction2, direction1
-        elif abs(direction2.y) < 0.01:  # direction2 is ~horizontal
-            pass  # is already good
-        else:  # rotated face
-            # make the first direction the one with the biggest parallel edges length sum
-            parallel = measure_parallel_edges(self, direction1)
-            orthogonal = measure_parallel_edges(self, direction1)
-            # print(parallel, "/", orthogonal)
-            if orthogonal > parallel:
-                direction1, direction2 = direction2, direction1
-
-        def measure_size(vertices, direction):
-            parameters = [v.dotProduct(direction) for v in vertices]
-            return max(parameters) - min(parameters)
-
-        return Face.LWDimensions(
-            direction1=direction1,
-            size1=measure_size(self.vertices, direction1),
-            direction2=direction2,
-            size2=measure_size(self.vertices, direction2),
-        )
+    def _compute_lw_dimensions(self) -> Face.LWDimensions:
+        from .dimensions import compute_lw_dimensions
+
+        dimensions = compute_lw_dimensions([self])[0]
+        dimensions.direction1 = _frozen(dimensions.direction1)
+        dimensions.direction2 = _frozen(dimensions.direction2)
+        return dimensions
+
+    @property
+    def canonical(self) -> tuple[int, bytes]:
+        from .fingerprint import canonical_face
+
+        return self._cached("canonical", lambda: canonical_face(self))
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of the coordinates rounded to 0.01, independent of the starting
+        vertex, to be used as a cache key
+        """
+        return self.canonical[1].hex()
 
     def get_edge(self, index: int) -> tuple[Vector3d, Vector3d]:
         return self.vertices[index], self.vertices[(index + 1) % len(self.vertices)]
@@ -323,13 +834,79 @@ class Face:
         return AngleType.ORTHOGONAL
 
     def dump_boundary_values(self) -> dict[str, float]:
-        fields = ["max_x", "min_x", "max_y", "min_y", "max_z", "min_z"]
-        return {field: getattr(self, field) for field in fields}
+        return self.aabb.dump()
+
+
+class _FrozenFace(Face):
+    """A Face shared by structural_sharing, its vertices cannot be changed"""
+
+    def __setattr__(self, name: str, value: Any):
+        if name == "vertices":
+            raise AttributeError("shared faces are read only, use a copy")
+        super().__setattr__(name, value)
+
+    def __repr__(self):
+        return f"Face(vertices={list(self.vertices)!r})"
+
+
+@dataclass(frozen=True)
+class FaceNormalIndex:
+    """
+    Face indices of a polyhedron grouped by FaceNormal. by_component also files
+    every face under each part of its FaceNormal, so R_T faces are found under
+    both R and T.
+    """
+
+    normals: tuple[FaceNormal, ...]
+    by_normal: dict[FaceNormal, frozenset[int]]
+    by_component: dict[FaceNormal, frozenset[int]]
+
+    @classmethod
+    def from_faces(cls, faces: list[Face]) -> FaceNormalIndex:
+        normals = np.array(
+            [(n.x, n.y, n.z) for n in (face.plane.normal for face in faces)],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        masks = np.zeros(len(normals), dtype=np.int64)
+        for axis, (negative, positive) in enumerate(
+            [("L", "R"), ("B", "T"), ("BK", "F")]
+        ):
+            masks[normals[:, axis] < -0.001] |= FACE_NORMAL_BITS[negative]
+            masks[normals[:, axis] > 0.001] |= FACE_NORMAL_BITS[positive]
+        face_normals = tuple(FaceNormal.from_mask(mask) for mask in masks.tolist())
+        by_normal = {}
+        by_component = {}
+        for index, face_normal in enumerate(face_normals):
+            by_normal.setdefault(face_normal, set()).add(index)
+            if face_normal is None:
+                continue
+            for component in face_normal.split():
+                by_component.setdefault(component, set()).add(index)
+        return cls(
+            normals=face_normals,
+            by_normal={key: frozenset(value) for key, value in by_normal.items()},
+            by_component={key: frozenset(value) for key, value in by_component.items()},
+        )
 
 
 @dataclass
-class Polyhedron:
+class Polyhedron(_GeometryCache):
     faces: list[Face]
+    _cache_key: list = field(default=None, init=False, repr=False, compare=False)
+    _cache: dict = field(default=None, init=False, repr=False, compare=False)
+    _cache_version: int = field(default=None, init=False, repr=False, compare=False)
+    _cache_list_version: int = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _tracked_attribute = "faces"
+    _tracked_type = _TrackedFaceList
+
+    def _geometry_key(self) -> list:
+        key = []
+        for face in self.faces:
+            key.append(id(face))
+            key.extend([(id(v), v.x, v.y, v.z) for v in face.vertices])
+        return key
 
     def __deepcopy__(self, memodict=None) -> Polyhedron:
         memodict = {}
@@ -350,44 +927,87 @@ class Polyhedron:
     def __len__(self):
         return len(self.faces)
 
+    @property
+    def aabb(self) -> BoundingBox:
+        """Axis aligned bounding box of all vertices, computed in a single pass"""
+        return self._cached(
+            "aabb",
+            lambda: BoundingBox.from_vertices(
+                [v for face in self.faces for v in face.vertices]
+            ),
+        )
+
     @property
     def min_x(self) -> float:
-        return min([v.min_x for v in self.faces])
+        return self.aabb.min_x
 
     @property
     def max_x(self) -> float:
-        return max([v.max_x for v in self.faces])
+        return self.aabb.max_x
 
     @property
     def min_y(self) -> float:
-        return min([v.min_y for v in self.faces])
+        return self.aabb.min_y
 
     @property
     def max_y(self) -> float:
-        return max([v.max_y for v in self.faces])
+        return self.aabb.max_y
 
     @property
     def min_z(self) -> float:
-        return min([v.min_z for v in self.faces])
+        return self.aabb.min_z
 
     @property
     def max_z(self) -> float:
-        return max([v.max_z for v in self.faces])
+        return self.aabb.max_z
 
     @property
     def volume(self) -> float:
         volume = 0
         for face in self.faces:
-            for index in range(len(face.vertices) - 2):
-                a = face.vertices[index]
-                b = face.vertices[index + 1]
-                c = face.vertices[index + 2]
+            a = face.vertices[0]
+            for index in range(1, len(face.vertices) - 1):
+                b = face.vertices[index]
+                c = face.vertices[index + 1]
                 volume += a.crossProduct(b).dotProduct(c) / 6
         return volume
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of the faces and their vertex sharing, to be used as a cache key.
+        See polyhedron_fingerprint.
+        """
+        from .fingerprint import polyhedron_fingerprint
+
+        return self._cached("fingerprint", lambda: polyhedron_fingerprint(self))
+
+    @property
+    def topology(self) -> HalfEdgeTopology:
+        """
+        Half-edge structure for neighbour, vertex and boundary queries, built
+        once and cached until the polyhedron changes
+        """
+        from .topology import HalfEdgeTopology
+
+        return self._cached("topology", lambda: HalfEdgeTopology.from_polyhedron(self))
+
+    @property
+    def plane_set(self) -> PlaneSet:
+        """The planes of the faces as arrays, cached until the polyhedron changes"""
+        from .planes import PlaneSet
+
+        return self._cached("plane_set", lambda: PlaneSet.from_faces(self.faces))
+
+    @property
+    def faceNormalIndex(self) -> FaceNormalIndex:
+        return self._cached(
+            "faceNormalIndex", lambda: FaceNormalIndex.from_faces(self.faces)
+        )
+
     @property
     def indexedFaceNormals(self) -> dict[int, FaceNormal]:
-        return {idx: face.faceNormal for idx, face in enumerate(self.faces)}
+        return dict(enumerate(self.faceNormalIndex.normals))
 
     def get_face_indices_by_facenormal(self, *args, strict=False) -> set[int]:
         """
@@ -402,17 +1022,16 @@ class Polyhedron:
         """
         for arg in args:
             assert isinstance(arg, FaceNormal)
+        index = self.faceNormalIndex
+        idxs = set()
         if strict:
-            return {
-                idx for idx, face in enumerate(self.faces) if face.faceNormal in args
-            }
+            for arg in args:
+                idxs.update(index.by_normal.get(arg, ()))
         else:
-            idxs = set()
-            args_normals = {iter_normal for arg in args for iter_normal in arg.split()}
-            for idx, face in enumerate(self.faces):
-                if len(set(args_normals).intersection(set(face.faceNormal.split()))):
-                    idxs.add(idx)
-            return idxs
+            for arg in args:
+                for component in arg.split():
+                    idxs.update(index.by_component.get(component, ()))
+        return idxs
 
     def get_faces_by_facenormal(self, *args, strict=False) -> list[Face]:
         return [
@@ -421,8 +1040,23 @@ class Polyhedron:
         ]
 
     def dump_boundary_values(self) -> dict[str, float]:
-        fields = ["max_x", "min_x", "max_y", "min_y", "max_z", "min_z"]
-        return {field: getattr(self, field) for field in fields}
+        return self.aabb.dump()
+
+    @classmethod
+    def from_halfspaces(
+        cls,
+        planes: list[Plane3d],
+        interior_point: Optional[Vector3d] = None,
+    ) -> Self:
+        """
+        The convex polyhedron behind all planes, see intersect_halfspaces. The
+        faces are in the order of their planes, planes which do not touch the
+        polyhedron give no face.
+        """
+        from .halfspaces import intersect_halfspaces
+
+        indexed, _ = intersect_halfspaces(planes, interior_point)
+        return indexed.to_polyhedron()
 
     @classmethod
     def cube(cls, origin: Vector3d, width: float, height: float, depth: float) -> Self:
@@ -453,6 +1087,23 @@ class Polyhedron:
         )
 
 
+def _make_read_only(polyhedron: Polyhedron) -> Polyhedron:
+    """
+    Makes the faces and vertices of the polyhedron read only in place, see
+    structural_sharing. Objects shared with other polyhedra are read only
+    there as well.
+    """
+    for face in polyhedron.faces:
+        for vertex in face.vertices:
+            read_only_type = _READ_ONLY_VECTOR_TYPES.get(type(vertex))
+            if read_only_type is not None:
+                object.__setattr__(vertex, "__class__", read_only_type)
+        if type(face) is Face:
+            object.__setattr__(face, "vertices", _FrozenList(face.vertices))
+            object.__setattr__(face, "__class__", _FrozenFace)
+    return polyhedron
+
+
 class SliceInterval(BaseModel):
     min_x: float = None  # smaller
     max_x: float = None  # bigger
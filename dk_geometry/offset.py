@@ -1,11 +1,13 @@
 # Copyright: 2024 BV De Kastenman
 import math
-from collections import defaultdict
-from copy import deepcopy
-from typing import DefaultDict, List
+
+import numpy as np
 
 from dk_geometry.general import *
-from dk_geometry.model import Face, Polyhedron
+from dk_geometry.halfspaces import HALFSPACE_TOLERANCE, intersect_halfspaces
+from dk_geometry.model import Face, Polyhedron, _make_read_only, is_structural_sharing
+from dk_geometry.planes import PlaneSet, intersect_plane_triples
+from dk_geometry.topology import HalfEdgeTopology
 
 
 def are_faces_different(face1: Face, face2: Face, tolerance: float) -> bool:
@@ -40,6 +42,15 @@ def is_angle_internal(face1: Face, face2: Face) -> bool:
     return normal1.crossProduct(normal2).dotProduct(edge) > 0
 
 
+def _is_angle_internal(
+    polyhedron: Polyhedron, topology: HalfEdgeTopology, face1: int, face2: int
+) -> bool:
+    if topology.common_half_edge(face1, face2) < 0:
+        # the faces do not share vertex objects, compare the coordinates
+        return is_angle_internal(polyhedron.faces[face1], polyhedron.faces[face2])
+    return topology.is_angle_internal(face1, face2)
+
+
 def is_face_corner_concave(face: Face, corner_index: int) -> bool:
     normal = face.plane.normal
     previous_index = (corner_index - 1) % len(face.vertices)
@@ -49,32 +60,54 @@ def is_face_corner_concave(face: Face, corner_index: int) -> bool:
     return previous_vector.crossProduct(next_vector).dotProduct(normal) < 0
 
 
-def select_inner_vertex_position(
+def _uses_outer_planes(
     outer_polyhedron: Polyhedron,
-    inner_polyhedron: Polyhedron,
     face_indices: [int],  # the active face is the first one
     priorities: [int],
-) -> Vector3d:
+    topology: HalfEdgeTopology,
+    outer: bool,
+) -> list[bool]:
     """
+    Per face around the vertex whether the plane of the outer polyhedron rather
+    than the one of the inner polyhedron bounds the outer (or inner) position.
     Prefers inner planes, but cuts through panels with lower priority
     """
-    planes = [inner_polyhedron.faces[face_indices[0]].plane]
+    uses_outer = [outer]
     for c in range(1, 3):
-        surface = inner_polyhedron
         invertor = 1
-        if is_angle_internal(
-            outer_polyhedron.faces[face_indices[0]],
-            outer_polyhedron.faces[face_indices[c]],
+        if _is_angle_internal(
+            outer_polyhedron, topology, face_indices[0], face_indices[c]
         ):
             invertor = -1
         if priorities[0] == 1000:
-            if invertor == -1:
-                surface = outer_polyhedron
-            else:
-                surface = inner_polyhedron
-        elif priorities[c] * invertor > priorities[0] * invertor:
-            surface = outer_polyhedron
-        planes.append(surface.faces[face_indices[c]].plane)
+            uses_outer.append(invertor == -1)
+        elif outer:
+            uses_outer.append(priorities[c] * invertor >= priorities[0] * invertor)
+        else:
+            uses_outer.append(priorities[c] * invertor > priorities[0] * invertor)
+    return uses_outer
+
+
+def select_inner_vertex_position(
+    outer_polyhedron: Polyhedron,
+    inner_polyhedron: Polyhedron,
+    face_indices: [int],  # the active face is the first one
+    priorities: [int],
+    topology: Optional[HalfEdgeTopology] = None,
+) -> Vector3d:
+    """
+    Prefers inner planes, but cuts through panels with lower priority.
+    topology is the one of the outer polyhedron, to avoid looking it up
+    """
+    if topology is None:
+        topology = outer_polyhedron.topology
+    uses_outer = _uses_outer_planes(
+        outer_polyhedron, face_indices, priorities, topology, False
+    )
+    planes = [
+        (outer_polyhedron if o else inner_polyhedron).faces[index].plane
+        for o, index in zip(uses_outer, face_indices)
+    ]
     return compute_three_planes_intersection(planes[0], planes[1], planes[2])
 
 
@@ -83,30 +116,53 @@ def select_outer_vertex_position(
     inner_polyhedron: Polyhedron,
     face_indices: [int],  # the active face is the first one
     priorities: [int],
+    topology: Optional[HalfEdgeTopology] = None,
 ) -> Vector3d:
     """
-    Prefers inner planes, but cuts through panels with lower priority
+    Prefers inner planes, but cuts through panels with lower priority.
+    topology is the one of the outer polyhedron, to avoid looking it up
     """
-    planes = [outer_polyhedron.faces[face_indices[0]].plane]
-    for c in range(1, 3):
-        surface = outer_polyhedron
-        invertor = 1
-        if is_angle_internal(
-            outer_polyhedron.faces[face_indices[0]],
-            outer_polyhedron.faces[face_indices[c]],
-        ):
-            invertor = -1
-        if priorities[0] == 1000:
-            if invertor == -1:
-                surface = outer_polyhedron
-            else:
-                surface = inner_polyhedron
-        elif priorities[c] * invertor < priorities[0] * invertor:
-            surface = inner_polyhedron
-        planes.append(surface.faces[face_indices[c]].plane)
+    if topology is None:
+        topology = outer_polyhedron.topology
+    uses_outer = _uses_outer_planes(
+        outer_polyhedron, face_indices, priorities, topology, True
+    )
+    planes = [
+        (outer_polyhedron if o else inner_polyhedron).faces[index].plane
+        for o, index in zip(uses_outer, face_indices)
+    ]
     return compute_three_planes_intersection(planes[0], planes[1], planes[2])
 
 
+def _generate_convex_offset(poly: Polyhedron, offset_map: dict[int, float]):
+    """
+    Offsets a convex polyhedron with vertices of more than 3 faces by shifting
+    the face planes and rebuilding it from them. Face i of the result lies on
+    the shifted plane of face i, but its vertices need not correspond to the
+    ones of the input face.
+    """
+    planes = poly.plane_set
+    if (planes.signed_distances(poly.topology.vertices) > HALFSPACE_TOLERANCE).any():
+        raise ValueError(
+            "Some polyhedron vertex does not have exactly 3 adjacent faces"
+        )
+    shifted = []
+    for index, face in enumerate(poly.faces):
+        plane = face.plane
+        shifted.append(
+            Plane3d(
+                origin=plane.origin
+                + plane.normal.normalized * float(offset_map[index]),
+                normal=plane.normal,
+            )
+        )
+    indexed, face_planes = intersect_halfspaces(shifted)
+    if not np.array_equal(face_planes, np.arange(len(poly.faces))):
+        raise ValueError("offset completely removed one face")
+    indexed.vertices = np.round(indexed.vertices, 1)
+    return indexed.to_polyhedron()
+
+
 def generate_offset(
     poly: Polyhedron,
     offset: Optional[float] = None,
@@ -115,6 +171,7 @@ def generate_offset(
     """
     Generates a new polyhedron with the offset applied to the vertices. The offset is applied to all faces unless
     an offset_map is supplied. The offset_map is a dictionary with the face index as key and the offset as value.
+    A convex polyhedron with vertices of more than 3 faces is rebuilt from its shifted face planes instead.
     Args:
         poly: polyehedron to offset
         offset: global offset for all faces, defaults to 0 if offset_map is supplied
@@ -122,10 +179,10 @@ def generate_offset(
             offset value
 
     Returns:
-        a new polyhedron with the offset applied
+        a new polyhedron with the offset applied. With structural_sharing the
+        vertices which do not move and the faces with only such vertices are
+        shared with the input, and all faces and vertices are read only.
     """
-    from .general import compute_three_planes_intersection
-
     if not any((offset, offset_map)):
         raise ValueError("Either offset or offset_map needs to be supplied")
     if offset_map is None:
@@ -141,40 +198,44 @@ def generate_offset(
         }
     )
 
-    offset_poly = deepcopy(poly)
-
-    vertex_to_face_indices: DefaultDict[int, List[int]] = defaultdict(list)
-    vertices = []
-    for face_index in range(len(offset_poly.faces)):
-        for vertex in offset_poly.faces[face_index].vertices:
-            if not (id(vertex) in vertex_to_face_indices):
-                # vertex_to_face_indices[id(vertex)] = []
-                vertices.append(vertex)
-            vertex_to_face_indices[id(vertex)].append(face_index)
-
-    for vertex in vertices:
-        adjacent_face_indices = vertex_to_face_indices[id(vertex)]
-        if len(adjacent_face_indices) != 3:
-            raise ValueError(
-                "Some polyhedron vertex does not have exactly 3 adjacent faces"
-            )
-        planes = []
-        for face_index in adjacent_face_indices:
-            plane = poly.faces[face_index].plane
-            face_offset = float(offset_map[face_index])
-            plane.origin += plane.normal.normalized * face_offset
-            planes.append(plane)
-        new_position = compute_three_planes_intersection(
-            planes[0], planes[1], planes[2]
-        )
-        vertex.x = round(new_position.x, 1)
-        vertex.y = round(new_position.y, 1)
-        vertex.z = round(new_position.z, 1)
+    sharing = is_structural_sharing()
+    topology = poly.topology
+    if any(len(faces) != 3 for faces in topology.vertex_faces):
+        return _generate_convex_offset(poly, offset_map)
+    planes = poly.plane_set
+    offsets = planes.offsets + np.array(
+        [float(offset_map[index]) for index in range(len(poly.faces))]
+    )
+    triples = np.array(topology.vertex_faces, dtype=np.int64).reshape(-1, 3)
+    positions, degenerate = intersect_plane_triples(
+        planes.normals[triples], offsets[triples]
+    )
+    if degenerate.any():
+        raise ValueError("generate_offset: some vertex lies on parallel faces")
+    moved_vertices = {}  # id(vertex)->offset vertex
+    for vertex, (x, y, z) in zip(topology.vertices, positions.tolist()):
+        x = round(x, 1)
+        y = round(y, 1)
+        z = round(z, 1)
+        if sharing and (x, y, z) == (vertex.x, vertex.y, vertex.z):
+            moved_vertices[id(vertex)] = vertex
+        else:
+            moved_vertices[id(vertex)] = Vector3d(x, y, z)
+    offset_faces = []
+    for face in poly.faces:
+        face_vertices = [moved_vertices[id(v)] for v in face.vertices]
+        if sharing and all(a is b for a, b in zip(face_vertices, face.vertices)):
+            offset_faces.append(face)
+        else:
+            offset_faces.append(Face(vertices=face_vertices))
+    offset_poly = Polyhedron(faces=offset_faces)
     for index in range(len(poly.faces)):
         original_normal = poly.faces[index].plane.normal
         offset_normal = offset_poly.faces[index].plane.normal
         if original_normal.dotProduct(offset_normal) < 0:
             raise ValueError("offset completely removed one face")
+    if sharing:
+        return _make_read_only(offset_poly)
     return offset_poly
 
 
@@ -192,24 +253,32 @@ def generate_delta_polyhedra(
     Returns:
          Dictionary[face_index, panel], only for faces with some offset
     """
-    vertex_id_to_face_indices: DefaultDict[int, List[int]] = defaultdict(list)
-    for face_index in range(len(outer_polyhedron.faces)):
-        for vertex in outer_polyhedron.faces[face_index].vertices:
-            vertex_id_to_face_indices[id(vertex)].append(face_index)
+    topology = outer_polyhedron.topology
+    # the face order around a vertex is rearranged in place below and the
+    # arrangement is carried over to the next face using the vertex
+    vertex_id_to_face_indices: dict[int, list[int]] = {}
     face_has_offset = [
         are_faces_different(
             outer_polyhedron.faces[index], inner_polyhedron.faces[index], 0.01
         )
         for index in range(len(inner_polyhedron.faces))
     ]
-    panels = {}
+    # the vertex positions are solved together once all the planes are chosen,
+    # rows below len(outer_polyhedron.faces) are planes of the outer polyhedron
+    planes = PlaneSet.from_faces(outer_polyhedron.faces + inner_polyhedron.faces)
+    inner_row = len(outer_polyhedron.faces)
+    triples = []  # per corner the planes of the inner and of the outer position
+    contours = []  # (face_index, number of corners)
     for face_index in range(len(inner_polyhedron.faces)):
         if not face_has_offset[face_index]:
             continue
-        outer = outer_polyhedron.faces[face_index].vertices[:]
-        inner = inner_polyhedron.faces[face_index].vertices[:]
+        outer = outer_polyhedron.faces[face_index].vertices
         for vertex_index in range(len(outer)):
-            adjacent_face_indices = vertex_id_to_face_indices[id(outer[vertex_index])]
+            vertex = outer[vertex_index]
+            adjacent_face_indices = vertex_id_to_face_indices.get(id(vertex))
+            if adjacent_face_indices is None:
+                adjacent_face_indices = list(topology.faces_of_vertex(vertex))
+                vertex_id_to_face_indices[id(vertex)] = adjacent_face_indices
             put_value_at_start(adjacent_face_indices, face_index)
             priorities = []
             if not face_has_offset[
@@ -235,19 +304,29 @@ def generate_delta_polyhedra(
                         raise ValueError(
                             f"generate_panel_shapes: priorities on concave corner #{vertex_index} require to make a cut into face #{face_index}"
                         )
-            # inner
-            inner[vertex_index] = select_inner_vertex_position(
-                outer_polyhedron,
-                inner_polyhedron,
-                adjacent_face_indices,
-                priorities,
-            )
-            # outer
-            outer[vertex_index] = select_outer_vertex_position(
-                outer_polyhedron,
-                inner_polyhedron,
-                adjacent_face_indices,
-                priorities,
-            )
-        panels[face_index] = make_polyhedron_between_faces(outer, inner)
+            for on_outer in (False, True):  # inner, outer
+                uses_outer = _uses_outer_planes(
+                    outer_polyhedron,
+                    adjacent_face_indices,
+                    priorities,
+                    topology,
+                    on_outer,
+                )
+                triples.append(
+                    [
+                        index if o else inner_row + index
+                        for o, index in zip(uses_outer, adjacent_face_indices)
+                    ]
+                )
+        contours.append((face_index, len(outer)))
+    positions, degenerate = planes.intersect_triples(triples)
+    if degenerate.any():
+        raise ValueError("generate_delta_polyhedra: some corner lies on parallel faces")
+    vertices = [Vector3d(x, y, z) for x, y, z in positions.tolist()]
+    panels = {}
+    start = 0
+    for face_index, count in contours:
+        corners = vertices[start : start + 2 * count]
+        panels[face_index] = make_polyhedron_between_faces(corners[1::2], corners[::2])
+        start += 2 * count
     return panels
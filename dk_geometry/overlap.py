@@ -2,8 +2,23 @@
 import math
 from collections import defaultdict
 
+import numpy as np
+
 from dk_geometry.general import calculate_signed_distance_to_plane, cut_face_by_plane
-from dk_geometry.model import Face, Plane3d, Polyhedron, FaceOverlap
+from dk_geometry.model import Face, Plane3d, Polyhedron, FaceOverlap, Vector3dArray
+from dk_geometry.planes import PlaneSet
+
+# faces closer than this to each other's plane touch, see get_overlapping_faces
+OVERLAP_TOLERANCE = 1
+
+# what the plane prefilter of get_overlapping_faces allows on top of the
+# tolerance. PlaneSet does not round, while same_plane uses normals rounded to
+# 5 decimals, which moves a corner 10 m from the plane origin by about 0.1.
+_PREFILTER_MARGIN = 0.1
+
+# the prefilter keeps normals up to this dot product for opposite normals,
+# for the same rounding
+_PREFILTER_NORMAL_MARGIN = 1e-3
 
 
 def same_plane(face1: Face, face2: Face, tolerance) -> bool:
@@ -96,16 +111,50 @@ def get_overlapping_faces(
     # index:The index of the polyhedron in the passed list of polyhedrons
     # faces: the list of faces where the other polyhedron is touching the given polyhedron
     result: defaultdict[int, list[FaceOverlap]] = defaultdict(list)
+    candidates = [
+        (polyhedron_index, adjacent_index, adjacent_face)
+        for polyhedron_index, polyhedron in enumerate(polyhedra)
+        for adjacent_index, adjacent_face in enumerate(polyhedron.faces)
+        if len(adjacent_face.vertices) > 0
+    ]
+    if len(faces) == 0 or len(candidates) == 0:
+        return result
+    # all distances between the faces and the candidate planes at once, to skip
+    # the candidates which are clearly not in the plane of the face, the exact
+    # test is still done by do_faces_overlap
+    candidate_faces = [candidate[2] for candidate in candidates]
+    candidate_planes = PlaneSet.from_faces(candidate_faces)
+    candidate_corners = Vector3dArray.from_vectors(
+        [v for f in candidate_faces for v in f.vertices]
+    )
+    starts = np.cumsum([0] + [len(f.vertices) for f in candidate_faces[:-1]])
+    limit = OVERLAP_TOLERANCE + _PREFILTER_MARGIN
     for face_index, face in enumerate(faces):
-        for polyhedron_index, polyhedron in enumerate(polyhedra):
-            for adjacent_index, adjacent_face in enumerate(polyhedron.faces):
-                overlap, area = do_faces_overlap(
-                    face, adjacent_face, 1, 1, opposite_facenormals
+        face_plane = PlaneSet.from_faces([face])
+        near = (
+            np.maximum.reduceat(
+                np.abs(face_plane.signed_distances(candidate_corners)[:, 0]), starts
+            )
+            <= limit
+        )
+        near &= (
+            np.abs(candidate_planes.signed_distances(face.vertices)).max(axis=0)
+            <= limit
+        )
+        if opposite_facenormals:
+            near &= (
+                candidate_planes.normals @ face_plane.normals[0]
+                < _PREFILTER_NORMAL_MARGIN
+            )
+        for candidate in np.nonzero(near)[0]:
+            polyhedron_index, adjacent_index, adjacent_face = candidates[candidate]
+            overlap, area = do_faces_overlap(
+                face, adjacent_face, OVERLAP_TOLERANCE, 1, opposite_facenormals
+            )
+            if overlap:
+                result[face_index].append(
+                    FaceOverlap(polyhedron_index, adjacent_index, area)
                 )
-                if overlap:
-                    result[face_index].append(
-                        FaceOverlap(polyhedron_index, adjacent_index, area)
-                    )
 
     return result
 
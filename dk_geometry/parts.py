@@ -0,0 +1,158 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Sequence
+
+import numpy as np
+
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Polyhedron
+
+# parts whose dimensions differ less than this are considered identical
+PART_RESOLUTION = 0.1
+
+
+@dataclass(eq=False)
+class PartGroup:
+    """
+    Polyhedra with the same shape up to rigid motion.
+    canonical: the shape in its canonical frame, all coordinates >= 0
+    indices: positions of the members in the grouped list
+    transforms: per member the 4x4 matrix mapping canonical coordinates onto
+        the member, world = transform @ (x, y, z, 1)
+    """
+
+    signature: str
+    canonical: Polyhedron
+    indices: list[int] = field(default_factory=list)
+    transforms: list[np.ndarray] = field(default_factory=list)
+
+
+def _candidate_frames(polyhedron: Polyhedron) -> list[np.ndarray]:
+    """
+    Rotations whose rows are the axes of a canonical frame: the lw_dimensions
+    directions of the largest faces in all 8 proper combinations of order and
+    sign, so every rigidly moved copy has the same set of canonical frames.
+    """
+    areas = [face.surfaceArea for face in polyhedron.faces]
+    largest = max(areas)
+    frames = []
+    for face, area in zip(polyhedron.faces, areas):
+        if area < largest * (1 - 1e-6):
+            continue
+        dimensions = face.lw_dimensions
+        d1 = dimensions.direction1
+        d2 = dimensions.direction2
+        for a, b in [(d1, d2), (d2, d1)]:
+            for sign_a in [1, -1]:
+                for sign_b in [1, -1]:
+                    x = np.array([a.x, a.y, a.z]) * sign_a
+                    y = np.array([b.x, b.y, b.z]) * sign_b
+                    x /= np.linalg.norm(x)
+                    y -= x * (x @ y)
+                    y /= np.linalg.norm(y)
+                    frames.append(np.stack([x, y, np.cross(x, y)]))
+    return frames
+
+
+def _undirected_edges(indexed: IndexedPolyhedron) -> np.ndarray:
+    edges = np.sort(indexed.edges, axis=1)
+    return np.unique(edges, axis=0)
+
+
+def _dihedral_angles(polyhedron: Polyhedron, indexed: IndexedPolyhedron) -> list[int]:
+    """Angles between the normals of faces sharing an edge, in tenths of a degree"""
+    normals = np.array(
+        [(n.x, n.y, n.z) for n in (face.plane.normal for face in polyhedron.faces)]
+    )
+    edges = indexed.edges
+    faces = indexed.corner_faces
+    keys = edges[:, 0] * indexed.vertex_count + edges[:, 1]
+    twin_keys = edges[:, 1] * indexed.vertex_count + edges[:, 0]
+    order = np.argsort(keys)
+    positions = np.searchsorted(keys[order], twin_keys).clip(max=len(keys) - 1)
+    matched = keys[order][positions] == twin_keys
+    # every shared edge is seen from both sides, keep one of them
+    first = matched & (edges[:, 0] < edges[:, 1])
+    twins = order[positions[first]]
+    cosines = np.einsum("ij,ij->i", normals[faces[first]], normals[faces[twins]]).clip(
+        -1, 1
+    )
+    return sorted(np.rint(np.degrees(np.arccos(cosines)) * 10).astype(int).tolist())
+
+
+def _canonical_form(
+    polyhedron: Polyhedron, resolution: float
+) -> tuple[str, np.ndarray]:
+    indexed = IndexedPolyhedron.from_polyhedron(polyhedron)
+    edges = _undirected_edges(indexed)
+    vectors = indexed.vertices[edges[:, 1]] - indexed.vertices[edges[:, 0]]
+    lengths = sorted(
+        np.rint(np.linalg.norm(vectors, axis=1) / resolution).astype(int).tolist()
+    )
+    best = None
+    for frame in _candidate_frames(polyhedron):
+        coordinates = indexed.vertices @ frame.T
+        origin = coordinates.min(axis=0)
+        quantized = np.rint((coordinates - origin) / resolution).astype(int).tolist()
+        canonical_edges = sorted(
+            tuple(sorted((tuple(quantized[a]), tuple(quantized[b]))))
+            for a, b in edges.tolist()
+        )
+        if best is None or canonical_edges < best[0]:
+            best = (canonical_edges, frame, origin)
+    canonical_edges, frame, origin = best
+    hasher = blake2b(digest_size=16, person=b"dk-part")
+    for values in [
+        [len(polyhedron.faces), indexed.vertex_count],
+        lengths,
+        _dihedral_angles(polyhedron, indexed),
+        [value for edge in canonical_edges for point in edge for value in point],
+    ]:
+        hasher.update(struct.pack(f"<q{len(values)}q", len(values), *values))
+    transform = np.eye(4)
+    transform[:3, :3] = frame.T
+    transform[:3, 3] = frame.T @ origin
+    return hasher.hexdigest(), transform
+
+
+def shape_signature(polyhedron: Polyhedron, resolution: float = PART_RESOLUTION) -> str:
+    """
+    Hash of the shape which does not change when the polyhedron is translated
+    or rotated. It combines the sorted edge lengths, the sorted dihedral angles
+    and the edges expressed in a canonical frame built from the lw_dimensions
+    of the largest face. Only rotations are considered, so a mirror image gets
+    the same signature only if the shape is mirror symmetric, as flat plates are.
+    Coordinates are quantized to the resolution, so copies which differ by
+    rounding noise right at a quantization boundary may still differ.
+    """
+    return _canonical_form(polyhedron, resolution)[0]
+
+
+def group_identical_parts(
+    polyhedra: Sequence[Polyhedron], resolution: float = PART_RESOLUTION
+) -> list[PartGroup]:
+    """
+    Buckets the polyhedra into classes of identical parts, in order of first
+    appearance, with the transform of every member from the canonical shape.
+    """
+    groups: dict[str, PartGroup] = {}
+    for index, polyhedron in enumerate(polyhedra):
+        signature, transform = _canonical_form(polyhedron, resolution)
+        group = groups.get(signature)
+        if group is None:
+            inverse = np.linalg.inv(transform)
+            indexed = IndexedPolyhedron.from_polyhedron(polyhedron)
+            local = indexed.vertices @ inverse[:3, :3].T + inverse[:3, 3]
+            canonical = IndexedPolyhedron(
+                vertices=local,
+                face_offsets=indexed.face_offsets,
+                face_indices=indexed.face_indices,
+            ).to_polyhedron()
+            group = groups[signature] = PartGroup(signature, canonical)
+        group.indices.append(index)
+        group.transforms.append(transform)
+    return list(groups.values())
@@ -0,0 +1,108 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+import numpy as np
+
+from dk_geometry.model import Face, Plane3d, Vector3d, Vector3dArray
+
+# three planes whose unit normals span less than this volume are taken as
+# (nearly) parallel, they have no single intersection point
+DEGENERATE_DETERMINANT = 1e-6
+
+
+def _as_coordinates(
+    points: Union[np.ndarray, Vector3dArray, Sequence[Vector3d]]
+) -> np.ndarray:
+    if isinstance(points, Vector3dArray):
+        return points.values
+    if isinstance(points, np.ndarray):
+        return points.reshape(-1, 3)
+    return np.array([(p.x, p.y, p.z) for p in points], dtype=float).reshape(-1, 3)
+
+
+def intersect_plane_triples(
+    normals: np.ndarray,
+    offsets: np.ndarray,
+    tolerance: float = DEGENERATE_DETERMINANT,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solves many three plane intersections at once with Cramer's rule, the
+    batched form of compute_three_planes_intersection.
+    Args:
+        normals: (N, 3, 3) the unit normals of the three planes of every system
+        offsets: (N, 3) the plane offsets along their normals
+        tolerance: triples with a smaller determinant are degenerate
+    Returns:
+        (N, 3) intersection points, NaN for the degenerate triples, and the
+        (N,) mask of the degenerate triples
+    """
+    n1 = normals[:, 0]
+    n2 = normals[:, 1]
+    n3 = normals[:, 2]
+    n2_n3 = np.cross(n2, n3)
+    determinants = np.einsum("ij,ij->i", n1, n2_n3)
+    degenerate = np.abs(determinants) < tolerance
+    numerators = (
+        offsets[:, 0, None] * n2_n3
+        + offsets[:, 1, None] * np.cross(n3, n1)
+        + offsets[:, 2, None] * np.cross(n1, n2)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        points = numerators / np.where(degenerate, np.nan, determinants)[:, None]
+    return points, degenerate
+
+
+@dataclass(eq=False)
+class PlaneSet:
+    """
+    Many planes as arrays, with the normals normalized once.
+
+    normals: (P, 3) unit normals
+    offsets: (P,) the distance of each plane from the origin along its normal
+    """
+
+    normals: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def from_planes(cls, planes: Sequence[Plane3d]) -> PlaneSet:
+        normals = np.array(
+            [(p.normal.x, p.normal.y, p.normal.z) for p in planes], dtype=float
+        ).reshape(-1, 3)
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        origins = np.array(
+            [(p.origin.x, p.origin.y, p.origin.z) for p in planes], dtype=float
+        ).reshape(-1, 3)
+        return cls(normals=normals, offsets=np.einsum("ij,ij->i", normals, origins))
+
+    @classmethod
+    def from_faces(cls, faces: Sequence[Face]) -> PlaneSet:
+        return cls.from_planes([face.plane for face in faces])
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def signed_distances(
+        self, points: Union[np.ndarray, Vector3dArray, Sequence[Vector3d]]
+    ) -> np.ndarray:
+        """
+        (N, P) matrix of the signed distances of every point to every plane,
+        negative behind the plane. Unlike calculate_signed_distance_to_plane no
+        intermediate value is rounded, the results may differ by about 1e-5.
+        """
+        return _as_coordinates(points) @ self.normals.T - self.offsets
+
+    def intersect_triples(
+        self, triples: np.ndarray, tolerance: float = DEGENERATE_DETERMINANT
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Intersection points of the planes of every row of the (N, 3) index
+        array, see intersect_plane_triples.
+        """
+        triples = np.asarray(triples, dtype=np.int64).reshape(-1, 3)
+        return intersect_plane_triples(
+            self.normals[triples], self.offsets[triples], tolerance
+        )
@@ -0,0 +1,130 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+from dk_geometry.model import Face, Polyhedron, Vector3d, get_fixed_point_scale
+
+# points closer than this are welded into one vertex
+WELD_TOLERANCE = 0.001
+
+_NEIGHBOUR_CELLS = [
+    (dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+]
+
+
+@dataclass(eq=False)
+class VertexPool:
+    """
+    Interns vertices: coincident points within the tolerance are mapped onto a
+    single shared Vector3d object, so topology based functions which match
+    vertices by identity (get_adjacent_faces, find_hole_in_polyhedron) work on
+    geometry built from separate pieces. The points are kept in a spatial hash
+    with cells as large as the tolerance, so a lookup only scans the 27 cells
+    around the point. A pool made inside a fixed_point block welds the points
+    with the same grid coordinates instead, with one exact dictionary lookup,
+    and does not use the tolerance.
+    The pooled vertices are shared, mutating one moves it in every face using it.
+    """
+
+    tolerance: float = WELD_TOLERANCE
+    _cells: dict[tuple[int, int, int], list[Vector3d]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _count: int = field(default=0, init=False, repr=False)
+    # the fixed_point scale when the pool was made, and the vertices by grid point
+    _scale: int = field(default_factory=get_fixed_point_scale, init=False)
+    _grid: dict[tuple[int, int, int], Vector3d] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # id(vertex)->(vertex, pooled vertex), the vertex is kept so its id stays unique
+    _interned: dict[int, tuple[Vector3d, Vector3d]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __len__(self):
+        return self._count
+
+    def _cell(self, point: Vector3d) -> tuple[int, int, int]:
+        return (
+            math.floor(point.x / self.tolerance),
+            math.floor(point.y / self.tolerance),
+            math.floor(point.z / self.tolerance),
+        )
+
+    def __contains__(self, vertex: Vector3d) -> bool:
+        """Whether the vertex object itself is pooled"""
+        if self._scale:
+            return self._grid.get(vertex.fixed(self._scale)) is vertex
+        return any(
+            pooled is vertex for pooled in self._cells.get(self._cell(vertex), ())
+        )
+
+    def find(self, point: Vector3d):
+        """Returns the pooled vertex within the tolerance of the point, or None"""
+        if self._scale:
+            return self._grid.get(point.fixed(self._scale))
+        x, y, z = self._cell(point)
+        squared_tolerance = self.tolerance * self.tolerance
+        for dx, dy, dz in _NEIGHBOUR_CELLS:
+            for candidate in self._cells.get((x + dx, y + dy, z + dz), ()):
+                if (
+                    (candidate.x - point.x) ** 2
+                    + (candidate.y - point.y) ** 2
+                    + (candidate.z - point.z) ** 2
+                ) <= squared_tolerance:
+                    return candidate
+        return None
+
+    def intern(self, point: Vector3d) -> Vector3d:
+        """
+        Returns the pooled vertex coinciding with the point, the point itself is
+        added to the pool if there is none.
+        """
+        found = self.find(point)
+        if found is not None:
+            return found
+        if self._scale:
+            self._grid[point.fixed(self._scale)] = point
+        else:
+            self._cells.setdefault(self._cell(point), []).append(point)
+        self._count += 1
+        return point
+
+    def weld_face(self, face: Face) -> list[Vector3d]:
+        """
+        The vertices of the face interned, with consecutive vertices which are
+        welded together merged. The result may have less than 3 vertices.
+        """
+        vertices = []
+        for vertex in face.vertices:
+            entry = self._interned.get(id(vertex))
+            if entry is None:
+                entry = self._interned[id(vertex)] = (vertex, self.intern(vertex))
+            pooled = entry[1]
+            if len(vertices) == 0 or vertices[-1] is not pooled:
+                vertices.append(pooled)
+        if len(vertices) > 1 and vertices[0] is vertices[-1]:
+            vertices.pop()
+        return vertices
+
+    def weld(self, polyhedron: Polyhedron) -> Polyhedron:
+        """
+        Returns the polyhedron with its vertices interned. Consecutive vertices
+        of a face which are welded together are merged, faces left with less
+        than 3 vertices are dropped.
+        """
+        faces = []
+        for face in polyhedron.faces:
+            vertices = self.weld_face(face)
+            if len(vertices) >= 3:
+                faces.append(Face(vertices=vertices))
+        return Polyhedron(faces=faces)
+
+
+def weld_vertices(
+    polyhedron: Polyhedron, tolerance: float = WELD_TOLERANCE
+) -> Polyhedron:
+    """Merges the coinciding vertices of the polyhedron, see VertexPool.weld"""
+    return VertexPool(tolerance).weld(polyhedron)
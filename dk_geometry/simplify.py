@@ -0,0 +1,277 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+import numpy as np
+
+from dk_geometry.model import Face, Polyhedron, Vector3d
+from dk_geometry.pool import VertexPool
+
+# vertices, edges and planes closer than this are taken as coinciding
+SIMPLIFY_TOLERANCE = 0.001
+
+
+def _weld(faces: list[Face], tolerance: float) -> list[Face]:
+    """Merges coinciding vertices, faces left with less than 3 vertices are dropped"""
+    pool = VertexPool(tolerance)
+    result = []
+    for face in faces:
+        vertices = pool.weld_face(face)
+        if len(vertices) < 3:
+            continue
+        if len(vertices) == len(face.vertices) and all(
+            a is b for a, b in zip(vertices, face.vertices)
+        ):
+            result.append(face)
+        else:
+            result.append(Face(vertices=vertices))
+    return result
+
+
+def _distances_to_line(points: np.ndarray, start: np.ndarray, finish: np.ndarray):
+    direction = finish - start
+    length = np.linalg.norm(direction)
+    if length == 0:
+        return np.linalg.norm(points - start, axis=1)
+    return np.linalg.norm(np.cross(points - start, direction), axis=1) / length
+
+
+def _is_degenerate(face: Face, tolerance: float) -> bool:
+    """Whether all vertices of the face are within the tolerance of one line"""
+    points = np.array([(v.x, v.y, v.z) for v in face.vertices])
+    start = points[np.argmax(np.linalg.norm(points - points[0], axis=1))]
+    finish = points[np.argmax(np.linalg.norm(points - start, axis=1))]
+    return _distances_to_line(points, start, finish).max() < tolerance
+
+
+def _insert_on_edges(face: Face, candidates: list[Vector3d], tolerance: float):
+    """The face with the candidates lying inside its edges inserted in them"""
+    vertices = []
+    for index, start in enumerate(face.vertices):
+        finish = face.vertices[(index + 1) % len(face.vertices)]
+        vertices.append(start)
+        edge = finish - start
+        squared_length = edge.dotProduct(edge)
+        on_edge = []
+        for candidate in candidates:
+            if candidate is start or candidate is finish or squared_length == 0:
+                continue
+            t = (candidate - start).dotProduct(edge) / squared_length
+            if 0 < t < 1 and (start + edge * t - candidate).length < tolerance:
+                on_edge.append((t, candidate))
+        vertices.extend(
+            candidate for _, candidate in sorted(on_edge, key=lambda e: e[0])
+        )
+    if len(vertices) == len(face.vertices):
+        return face
+    return Face(vertices=vertices)
+
+
+def _drop_degenerate_faces(faces: list[Face], tolerance: float) -> list[Face]:
+    """
+    Drops the faces without area. Their vertices are inserted into the edges
+    of the faces around them which they lie on, so the faces on both sides of
+    a dropped face meet at the same vertices.
+    """
+    degenerate = [_is_degenerate(face, tolerance) for face in faces]
+    if not any(degenerate):
+        return faces
+    candidates = {}
+    for face, flat in zip(faces, degenerate):
+        if flat:
+            candidates.update((id(v), v) for v in face.vertices)
+    candidates = list(candidates.values())
+    return [
+        _insert_on_edges(face, candidates, tolerance)
+        for face, flat in zip(faces, degenerate)
+        if not flat
+    ]
+
+
+def _face_planes(polyhedron: Polyhedron) -> tuple[np.ndarray, np.ndarray]:
+    """Unit normals and offsets of the faces, without intermediate rounding"""
+    topology = polyhedron.topology
+    points = np.array([(v.x, v.y, v.z) for v in topology.vertices]).reshape(-1, 3)
+    corners = points[topology.origin]
+    area_vectors = np.add.reduceat(
+        np.cross(corners, corners[topology.next]), topology.face_offsets[:-1], axis=0
+    )
+    normals = area_vectors / np.maximum(
+        np.linalg.norm(area_vectors, axis=1, keepdims=True), np.finfo(float).tiny
+    )
+    return normals, np.einsum("ij,ij->i", normals, corners[topology.face_offsets[:-1]])
+
+
+def _merge_coplanar_faces(faces: list[Face], tolerance: float) -> list[Face]:
+    """
+    Merges adjacent faces lying in one plane. A group of faces is only merged
+    if its outline is a single loop.
+    """
+    polyhedron = Polyhedron(faces=faces)
+    topology = polyhedron.topology
+    normals, offsets = _face_planes(polyhedron)
+    points = np.array([(v.x, v.y, v.z) for v in topology.vertices]).reshape(-1, 3)
+    face_of = topology.face
+    twin = topology.twin
+    # a shared edge whose faces face the same way, both ends in both planes
+    shared = np.flatnonzero(twin > np.arange(len(twin)))
+    first, second = face_of[shared], face_of[twin[shared]]
+    ends = np.stack([topology.origin[shared], topology.origin[topology.next[shared]]])
+    coplanar = np.einsum("ij,ij->i", normals[first], normals[second]) > 0
+    for face_index in (first, second):
+        distances = np.abs(
+            np.einsum("kij,ij->ki", points[ends], normals[face_index])
+            - offsets[face_index]
+        )
+        coplanar &= (distances < tolerance).all(axis=0)
+    if not coplanar.any():
+        return faces
+
+    parent = list(range(len(faces)))
+
+    def root(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def in_plane(face_index, plane_index):
+        rows = topology.origin[
+            topology.face_offsets[face_index] : topology.face_offsets[face_index + 1]
+        ]
+        distances = points[rows] @ normals[plane_index] - offsets[plane_index]
+        return np.abs(distances).max() < tolerance
+
+    for face1, face2 in zip(first[coplanar].tolist(), second[coplanar].tolist()):
+        # the far corners of the faces have to be in the other plane as well
+        if in_plane(face2, face1) and in_plane(face1, face2):
+            parent[root(face1)] = root(face2)
+    groups = {}
+    for index in range(len(faces)):
+        groups.setdefault(root(index), []).append(index)
+
+    origin = topology.origin.tolist()
+    following = topology.next.tolist()
+    twin = twin.tolist()
+    face_of = face_of.tolist()
+    offsets_of_face = topology.face_offsets.tolist()
+    merged = {}  # first face of a group->merged face
+    removed = set()
+    for group in groups.values():
+        if len(group) == 1:
+            continue
+        members = set(group)
+        outline = [
+            half_edge
+            for index in group
+            for half_edge in range(offsets_of_face[index], offsets_of_face[index + 1])
+            if twin[half_edge] < 0 or face_of[twin[half_edge]] not in members
+        ]
+        if len(outline) == 0:
+            continue
+        outgoing = {}
+        for half_edge in outline:
+            outgoing.setdefault(origin[half_edge], []).append(half_edge)
+        if any(len(edges) > 1 for edges in outgoing.values()):
+            continue  # the outline touches itself
+        loop = [outline[0]]
+        while origin[following[loop[-1]]] != origin[loop[0]] and len(loop) <= len(
+            outline
+        ):
+            edges = outgoing.get(origin[following[loop[-1]]])
+            if edges is None:
+                break
+            loop.append(edges[0])
+        if len(loop) != len(outline):
+            continue  # the faces enclose a hole, or the outline is open
+        merged[min(group)] = Face(
+            vertices=[topology.vertices[origin[half_edge]] for half_edge in loop]
+        )
+        removed.update(group)
+    if len(merged) == 0:
+        return faces
+    return [
+        merged.get(index, face)
+        for index, face in enumerate(faces)
+        if index in merged or index not in removed
+    ]
+
+
+def _drop_collinear_vertices(faces: list[Face], tolerance: float) -> list[Face]:
+    """
+    Drops the vertices used by only two faces which lie on the line between
+    their neighbours in both faces, so they are in the middle of an edge.
+    """
+    polyhedron = Polyhedron(faces=faces)
+    topology = polyhedron.topology
+    points = np.array([(v.x, v.y, v.z) for v in topology.vertices]).reshape(-1, 3)
+    origin = topology.origin
+    previous = np.empty_like(topology.next)
+    previous[topology.next] = np.arange(len(previous))
+    on_line = np.linalg.norm(
+        np.cross(
+            points[origin] - points[origin[previous]],
+            points[origin[topology.next]] - points[origin[previous]],
+        ),
+        axis=1,
+    ) < tolerance * np.linalg.norm(
+        points[origin[topology.next]] - points[origin[previous]], axis=1
+    )
+    valences = np.array([len(star) for star in topology.vertex_faces])
+    # a vertex is dropped only if it is on the line in all of its faces
+    removable = valences == 2
+    np.logical_and.at(removable, origin, on_line)
+    while True:
+        kept = np.add.reduceat(~removable[origin], topology.face_offsets[:-1])
+        short = np.flatnonzero(kept < 3)
+        if len(short) == 0:
+            break
+        # keep the vertices of faces which would become too small
+        for face_index in short.tolist():
+            rows = origin[
+                topology.face_offsets[face_index] : topology.face_offsets[
+                    face_index + 1
+                ]
+            ]
+            removable[rows] = False
+    if not removable.any():
+        return faces
+    result = []
+    for face_index, face in enumerate(faces):
+        rows = origin[
+            topology.face_offsets[face_index] : topology.face_offsets[face_index + 1]
+        ]
+        if not removable[rows].any():
+            result.append(face)
+        else:
+            result.append(
+                Face(
+                    vertices=[topology.vertices[row] for row in rows[~removable[rows]]]
+                )
+            )
+    return result
+
+
+def simplify_polyhedron(
+    polyhedron: Polyhedron, tolerance: float = SIMPLIFY_TOLERANCE
+) -> Polyhedron:
+    """
+    Cleans up what chains of cuts leave behind: merges coinciding vertices,
+    drops faces without area, merges adjacent coplanar faces and drops the
+    vertices in the middle of an edge. Faces which do not change are kept.
+    Args:
+        polyhedron: the polyhedron to simplify
+        tolerance: distance below which vertices, lines and planes coincide
+    Returns:
+        the simplified polyhedron, the input itself if nothing changes
+    """
+    faces = _weld(polyhedron.faces, tolerance)
+    if len(faces) == 0:
+        return Polyhedron(faces=faces)
+    faces = _drop_degenerate_faces(faces, tolerance)
+    faces = _merge_coplanar_faces(faces, tolerance)
+    faces = _drop_collinear_vertices(faces, tolerance)
+    if len(faces) == len(polyhedron.faces) and all(
+        a is b for a, b in zip(faces, polyhedron.faces)
+    ):
+        return polyhedron
+    return Polyhedron(faces=faces)
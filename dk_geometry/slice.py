@@ -1,49 +1,68 @@
 # Copyright: 2024 BV De Kastenman
 from copy import deepcopy
 
-from dk_geometry.general import cut_polyhedron_by_plane
-from dk_geometry.model import Plane3d, Polyhedron, SliceInterval, Vector3d
+from dk_geometry.general import clip_polyhedron_by_planes
+from dk_geometry.model import (
+    Plane3d,
+    Polyhedron,
+    SliceInterval,
+    Vector3d,
+    _make_read_only,
+    is_structural_sharing,
+)
+from dk_geometry.simplify import simplify_polyhedron
 
 
-def apply_slice_interval(polyhedron: Polyhedron, slice: SliceInterval) -> Polyhedron:
+def apply_slice_interval(
+    polyhedron: Polyhedron, slice: SliceInterval, simplify: bool = False
+) -> Polyhedron:
     """
     Generates a new polyhedron with the slice applied to the vertices.
     Args:
         polyhedron: the polyhedron for which the slice needs to be applied
         slice: the slice that needs to be applied
+        simplify: clean up the result with simplify_polyhedron, which may merge
+            faces, so face indices do not match the input anymore
 
     Returns:
-        a new polyhedron with the slice applied.
+        a new polyhedron with the slice applied. With structural_sharing the
+        faces the slice does not touch are shared with the input, and the
+        input itself is returned if nothing is cut. Its faces and vertices are
+        read only then.
     """
-    result = polyhedron
-    if slice.min_x is not None and abs(slice.min_x - polyhedron.min_x) > 0.01:
-        result = cut_polyhedron_by_plane(
-            result,
-            Plane3d(origin=Vector3d(slice.min_x, 0, 0), normal=Vector3d(-1, 0, 0)),
+    bounds = polyhedron.aabb
+    # planes outside the bounds would not cut anything, those are skipped
+    planes = []
+    if slice.min_x is not None and slice.min_x - bounds.min_x > 0.01:
+        planes.append(
+            Plane3d(origin=Vector3d(slice.min_x, 0, 0), normal=Vector3d(-1, 0, 0))
         )
-    if slice.max_x is not None and abs(slice.max_x - polyhedron.max_x) > 0.01:
-        result = cut_polyhedron_by_plane(
-            result,
-            Plane3d(origin=Vector3d(slice.max_x, 0, 0), normal=Vector3d(1, 0, 0)),
+    if slice.max_x is not None and bounds.max_x - slice.max_x > 0.01:
+        planes.append(
+            Plane3d(origin=Vector3d(slice.max_x, 0, 0), normal=Vector3d(1, 0, 0))
         )
-    if slice.min_y is not None and abs(slice.min_y - polyhedron.min_y) > 0.01:
-        result = cut_polyhedron_by_plane(
-            result,
-            Plane3d(origin=Vector3d(0, slice.min_y, 0), normal=Vector3d(0, -1, 0)),
+    if slice.min_y is not None and slice.min_y - bounds.min_y > 0.01:
+        planes.append(
+            Plane3d(origin=Vector3d(0, slice.min_y, 0), normal=Vector3d(0, -1, 0))
         )
-    if slice.max_y is not None and abs(slice.max_y - polyhedron.max_y) > 0.01:
-        result = cut_polyhedron_by_plane(
-            result,
-            Plane3d(origin=Vector3d(0, slice.max_y, 0), normal=Vector3d(0, 1, 0)),
+    if slice.max_y is not None and bounds.max_y - slice.max_y > 0.01:
+        planes.append(
+            Plane3d(origin=Vector3d(0, slice.max_y, 0), normal=Vector3d(0, 1, 0))
         )
-    if slice.min_z is not None and abs(slice.min_z - polyhedron.min_z) > 0.01:
-        result = cut_polyhedron_by_plane(
-            result,
-            Plane3d(origin=Vector3d(0, 0, slice.min_z), normal=Vector3d(0, 0, -1)),
+    if slice.min_z is not None and slice.min_z - bounds.min_z > 0.01:
+        planes.append(
+            Plane3d(origin=Vector3d(0, 0, slice.min_z), normal=Vector3d(0, 0, -1))
         )
-    if slice.max_z is not None and abs(slice.max_z - polyhedron.max_z) > 0.01:
-        result = cut_polyhedron_by_plane(
-            result,
-            Plane3d(origin=Vector3d(0, 0, slice.max_z), normal=Vector3d(0, 0, 1)),
+    if slice.max_z is not None and bounds.max_z - slice.max_z > 0.01:
+        planes.append(
+            Plane3d(origin=Vector3d(0, 0, slice.max_z), normal=Vector3d(0, 0, 1))
         )
+    if len(planes) == 0:
+        result = polyhedron
+    else:
+        result = clip_polyhedron_by_planes(polyhedron, planes)
+        if simplify:
+            result = simplify_polyhedron(result)
+    if is_structural_sharing():
+        return _make_read_only(result)
     return deepcopy(result)
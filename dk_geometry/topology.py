@@ -0,0 +1,200 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import numpy as np
+
+from dk_geometry.enums import AngleType
+from dk_geometry.model import Polyhedron, Vector3d
+
+
+@dataclass(eq=False)
+class HalfEdgeTopology:
+    """
+    Half-edge structure of a polyhedron, see Polyhedron.topology. Vertex
+    identity is object identity, as everywhere else. Half-edge h runs from
+    corner h of its face to the next corner, the corners are numbered face by
+    face.
+
+    vertices: the distinct vertex objects in order of first appearance
+    origin: (H,) vertex row where each half-edge starts
+    face: (H,) face of each half-edge
+    next: (H,) the following half-edge of the same face
+    twin: (H,) the opposite half-edge in the neighbouring face, -1 on a boundary
+    face_offsets: (F + 1,) the half-edges of face f are
+        face_offsets[f]:face_offsets[f + 1]
+    vertex_faces: per vertex row the faces using it, in face order
+    """
+
+    polyhedron: Polyhedron
+    vertices: list[Vector3d]
+    origin: np.ndarray
+    face: np.ndarray
+    next: np.ndarray
+    twin: np.ndarray
+    face_offsets: np.ndarray
+    vertex_faces: list[tuple[int, ...]]
+    _row_of_vertex: dict[int, int] = field(repr=False)
+    _edge_between: Optional[dict[tuple[int, int], int]] = field(
+        default=None, init=False, repr=False
+    )
+    _internal: Optional[list[bool]] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_polyhedron(cls, polyhedron: Polyhedron) -> HalfEdgeTopology:
+        row_of_vertex = {}
+        vertices = []
+        vertex_faces = []
+        origin = []
+        face_of = []
+        following = []
+        face_offsets = [0]
+        for face_index, face in enumerate(polyhedron.faces):
+            start = len(origin)
+            count = len(face.vertices)
+            for corner, vertex in enumerate(face.vertices):
+                row = row_of_vertex.get(id(vertex))
+                if row is None:
+                    row = row_of_vertex[id(vertex)] = len(vertices)
+                    vertices.append(vertex)
+                    vertex_faces.append([])
+                vertex_faces[row].append(face_index)
+                origin.append(row)
+                face_of.append(face_index)
+                following.append(start + (corner + 1) % count)
+            face_offsets.append(len(origin))
+        # a half-edge and its twin run between the same vertices in opposite
+        # directions, if an edge is used more than once the last one is kept
+        half_edge_of = {}
+        for half_edge in range(len(origin)):
+            half_edge_of[(origin[half_edge], origin[following[half_edge]])] = half_edge
+        twin = [
+            half_edge_of.get((origin[following[half_edge]], origin[half_edge]), -1)
+            for half_edge in range(len(origin))
+        ]
+        return cls(
+            polyhedron=polyhedron,
+            vertices=vertices,
+            origin=np.array(origin, dtype=np.int64),
+            face=np.array(face_of, dtype=np.int64),
+            next=np.array(following, dtype=np.int64),
+            twin=np.array(twin, dtype=np.int64),
+            face_offsets=np.array(face_offsets, dtype=np.int64),
+            vertex_faces=[tuple(faces) for faces in vertex_faces],
+            _row_of_vertex=row_of_vertex,
+        )
+
+    def faces_of_vertex(self, vertex: Vector3d) -> tuple[int, ...]:
+        return self.vertex_faces[self._row_of_vertex[id(vertex)]]
+
+    def face_neighbours(self, face_index: int) -> list[int]:
+        """The faces across the edges of the face, in edge order"""
+        twins = self.twin[
+            self.face_offsets[face_index] : self.face_offsets[face_index + 1]
+        ]
+        return self.face[twins[twins >= 0]].tolist()
+
+    def common_half_edge(self, face1: int, face2: int) -> int:
+        """The first half-edge of face1 shared with face2, -1 if not adjacent"""
+        if self._edge_between is None:
+            face_of = self.face.tolist()
+            twin = self.twin.tolist()
+            self._edge_between = {}
+            for half_edge in range(len(twin) - 1, -1, -1):
+                if twin[half_edge] >= 0:
+                    key = (face_of[half_edge], face_of[twin[half_edge]])
+                    self._edge_between[key] = half_edge  # the first in corner order
+        return self._edge_between.get((face1, face2), -1)
+
+    def is_angle_internal(self, face1: int, face2: int) -> bool:
+        """
+        Whether the faces meet at an inner (concave) edge, the same as
+        offset.is_angle_internal for adjacent faces.
+        """
+        if self._internal is None:
+            self._internal = self._compute_internal()
+        half_edge = self.common_half_edge(face1, face2)
+        if half_edge < 0:
+            raise ValueError("is_angle_internal: the given faces are not adjacent")
+        return self._internal[half_edge]
+
+    def _compute_internal(self) -> list[bool]:
+        faces = self.polyhedron.faces
+        origin = self.origin.tolist()
+        following = self.next.tolist()
+        internal = []
+        for half_edge, (face, twin) in enumerate(
+            zip(self.face.tolist(), self.twin.tolist())
+        ):
+            if twin < 0:
+                internal.append(False)
+                continue
+            edge = (
+                self.vertices[origin[following[half_edge]]]
+                - self.vertices[origin[half_edge]]
+            )
+            normal1 = faces[face].plane.normal
+            normal2 = faces[self.face[twin]].plane.normal
+            internal.append(normal1.crossProduct(normal2).dotProduct(edge) > 0)
+        return internal
+
+    def angle_type(self, face1: int, face2: int) -> AngleType:
+        faces = self.polyhedron.faces
+        return faces[face1].get_angle_type(faces[face2])
+
+    def boundary_edges(self) -> list[tuple[Vector3d, Vector3d]]:
+        """The (start, finish) vertices of the half-edges without a twin"""
+        origin = self.origin.tolist()
+        following = self.next.tolist()
+        return [
+            (self.vertices[origin[h]], self.vertices[origin[following[h]]])
+            for h, twin in enumerate(self.twin.tolist())
+            if twin < 0
+        ]
+
+    def boundary_loops(
+        self, closed_by: Sequence[tuple[Vector3d, Vector3d]] = ()
+    ) -> list[list[Vector3d]]:
+        """
+        The contours of the holes in the surface, each oriented as the face
+        which would close it, see find_holes_in_polyhedron.
+        Args:
+            closed_by: boundary edges of other faces, (start, finish) vertices,
+                the half-edges running back along them are not part of a hole
+        Returns:
+            the loops, a ValueError is raised if the remaining boundary edges
+            do not close
+        """
+        origin = self.origin.tolist()
+        following = self.next.tolist()
+        closed = {
+            (self._row_of_vertex.get(id(start)), self._row_of_vertex.get(id(finish)))
+            for start, finish in closed_by
+        }
+        boundary = [
+            h
+            for h, twin in enumerate(self.twin.tolist())
+            if twin < 0 and (origin[following[h]], origin[h]) not in closed
+        ]
+        outgoing = {}  # vertex row->unused boundary half-edges starting there
+        for half_edge in boundary:
+            outgoing.setdefault(origin[half_edge], []).append(half_edge)
+        loops = []
+        for half_edge in boundary:
+            start = origin[half_edge]
+            if half_edge not in outgoing.get(start, ()):
+                continue  # already part of a loop
+            outgoing[start].remove(half_edge)
+            finish = origin[following[half_edge]]
+            loop = [finish]
+            while loop[-1] != start:
+                candidates = outgoing.get(loop[-1])
+                if not candidates:
+                    raise ValueError(
+                        "boundary_loops: the boundary edges do not form closed loops"
+                    )
+                loop.append(origin[following[candidates.pop(0)]])
+            loops.append([self.vertices[row] for row in loop[::-1]])
+        return loops
@@ -0,0 +1,135 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+import numpy as np
+
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Face, Polyhedron
+
+
+def _cross(o: tuple[float, float], a: tuple[float, float], b: tuple[float, float]):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _is_point_in_triangle(point, a, b, c, tolerance: float) -> bool:
+    """Points closer than the tolerance to the triangle border count as inside"""
+    for start, finish in ((a, b), (b, c), (c, a)):
+        edge_length = ((finish[0] - start[0]) ** 2 + (finish[1] - start[1]) ** 2) ** 0.5
+        if _cross(start, finish, point) < -tolerance * edge_length:
+            return False
+    return True
+
+
+def triangulate_polygon(
+    points: list[tuple[float, float]], tolerance: float = 0.001
+) -> list[tuple[int, int, int]]:
+    """
+    Ear clipping of a counterclockwise polygon, returns the triangles as
+    (previous, corner, next) indices into points.
+    Only reflex corners can lie inside an ear, so only those are tested, and
+    after a clip only the two neighbours of the clipped corner change their
+    ear status, which makes it O(n * reflex corners).
+    Always returns len(points) - 2 triangles: when a whole round finds no ear
+    (degenerate or self-touching input) an ear touched by other corners or
+    else the most convex corner is clipped anyway, so every round removes a
+    corner.
+    """
+    count = len(points)
+    if count < 3:
+        return []
+    previous = [(index - 1) % count for index in range(count)]
+    following = [(index + 1) % count for index in range(count)]
+
+    def corner_cross(index):
+        return _cross(points[previous[index]], points[index], points[following[index]])
+
+    crosses = [corner_cross(index) for index in range(count)]
+    reflex = {index for index in range(count) if crosses[index] <= 0}
+
+    def is_ear(index, tolerance=tolerance):
+        if crosses[index] <= 0:
+            return False
+        a = points[previous[index]]
+        b = points[index]
+        c = points[following[index]]
+        for other in reflex:
+            if other in (previous[index], index, following[index]):
+                continue
+            if _is_point_in_triangle(points[other], a, b, c, tolerance):
+                return False
+        return True
+
+    ears = [is_ear(index) for index in range(count)]
+    triangles = []
+    remaining = count
+    current = 0
+    misses = 0
+    while remaining > 3:
+        if not ears[current]:
+            current = following[current]
+            misses += 1
+            if misses <= remaining:
+                continue
+            # a full round without ears, accept corners touched by other ones,
+            # and if there are none of those either, clip the most convex corner
+            candidates = [current]
+            while following[candidates[-1]] != current:
+                candidates.append(following[candidates[-1]])
+            touching = [index for index in candidates if is_ear(index, tolerance=0)]
+            if len(touching) > 0:
+                current = touching[0]
+            else:
+                current = max(candidates, key=lambda index: crosses[index])
+        before = previous[current]
+        after = following[current]
+        triangles.append((before, current, after))
+        following[before] = after
+        previous[after] = before
+        reflex.discard(current)
+        remaining -= 1
+        for neighbour in (before, after):
+            crosses[neighbour] = corner_cross(neighbour)
+            if crosses[neighbour] <= 0:
+                reflex.add(neighbour)
+            else:
+                reflex.discard(neighbour)
+        for neighbour in (before, after):
+            ears[neighbour] = is_ear(neighbour)
+        current = after
+        misses = 0
+    triangles.append((previous[current], current, following[current]))
+    return triangles
+
+
+def triangulate_face(face: Face) -> list[tuple[int, int, int]]:
+    """
+    Triangles of the face as indices into face.vertices. The face is projected
+    onto the coordinate plane closest to it, keeping its orientation.
+    """
+    area = face.areaVector
+    components = [area.x, area.y, area.z]
+    axis = max(range(3), key=lambda index: abs(components[index]))
+    u = (axis + 1) % 3
+    v = (axis + 2) % 3
+    if components[axis] < 0:
+        u, v = v, u
+    coordinates = [(p.x, p.y, p.z) for p in face.vertices]
+    return triangulate_polygon([(c[u], c[v]) for c in coordinates])
+
+
+def triangulate_polyhedron(polyhedron: Polyhedron) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Triangulates all faces over the shared vertices of the polyhedron.
+    Returns:
+        the (N, 3) vertex buffer and a flat index buffer, three entries per
+        triangle
+    """
+    indexed = IndexedPolyhedron.from_polyhedron(polyhedron)
+    buffers = [np.empty(0, dtype=np.int64)]
+    for face_index, face in enumerate(polyhedron.faces):
+        triangles = face.triangle_indices
+        if len(triangles) == 0:
+            continue
+        rows = indexed.face(face_index)
+        buffers.append(rows[np.array(triangles, dtype=np.int64).ravel()])
+    return indexed.vertices, np.concatenate(buffers)
@@ -1,26 +1,23 @@
 # Copyright: 2024 BV De Kastenman
+from dk_geometry.indexed import IndexedPolyhedron
 
 
 def export_to_obj(polyhedron, path):
+    indexed = IndexedPolyhedron.from_polyhedron(polyhedron)
+    vertices = indexed.vertices.tolist()
+    indices = indexed.face_indices.tolist()
+    offsets = indexed.face_offsets.tolist()
     with open(path, "w") as file:
-        file = open(path, "a")
-        vertex_indices = {}
-        next_index = 1
-        for face in polyhedron.faces:
-            for vertex in face.vertices:
-                if not id(vertex) in vertex_indices:
-                    file.write(
-                        "v "
-                        + str(vertex.x)
-                        + " "
-                        + str(vertex.y)
-                        + " "
-                        + str(vertex.z)
-                        + "\n"
-                    )
-                    vertex_indices[id(vertex)] = next_index
-                    next_index += 1
+        written = 0
+        for start, finish in zip(offsets[:-1], offsets[1:]):
+            # vertices are numbered in order of first appearance, write them
+            # just before the first face which uses them
+            for index in indices[start:finish]:
+                if index == written:
+                    x, y, z = vertices[index]
+                    file.write("v " + str(x) + " " + str(y) + " " + str(z) + "\n")
+                    written += 1
             file.write("f")
-            for vertex in face.vertices:
-                file.write(" " + str(vertex_indices[id(vertex)]))
+            for index in indices[start:finish]:
+                file.write(" " + str(index + 1))
             file.write("\n")
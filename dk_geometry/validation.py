@@ -0,0 +1,171 @@
+# Copyright: 2024 BV De Kastenman
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Polyhedron
+
+# faces whose vertices are further than this from their plane are not planar,
+# faces narrower than this have no area
+VALIDATION_TOLERANCE = 0.01
+
+
+@dataclass(eq=False)
+class ValidationReport:
+    """
+    What is wrong with a polyhedron, see validate. Edges are (start, finish)
+    rows into indexed.vertices, faces are face indices, vertices are rows.
+
+    boundary_edges: (K, 2) edges used by only one face
+    non_manifold_edges: (K, 2) edges used by more than two faces, each once
+    misoriented_edges: (K, 2) edges used twice in the same direction, so two
+        faces around them have opposite orientations
+    degenerate_faces: faces with less than 3 vertices or without area
+    non_planar_faces: faces with vertices out of their plane
+    low_valence_vertices: vertices used by less than 3 faces
+    non_trivalent_vertices: vertices not used by exactly 3 faces, which is
+        allowed but which generate_offset only handles for convex polyhedra
+    """
+
+    indexed: IndexedPolyhedron
+    boundary_edges: np.ndarray
+    non_manifold_edges: np.ndarray
+    misoriented_edges: np.ndarray
+    degenerate_faces: np.ndarray
+    non_planar_faces: np.ndarray
+    low_valence_vertices: np.ndarray
+    non_trivalent_vertices: np.ndarray
+
+    @property
+    def is_closed(self) -> bool:
+        return len(self.boundary_edges) == 0
+
+    @property
+    def is_manifold(self) -> bool:
+        return len(self.non_manifold_edges) == 0
+
+    @property
+    def is_oriented(self) -> bool:
+        return len(self.misoriented_edges) == 0
+
+    @property
+    def is_valid(self) -> bool:
+        return (
+            self.is_closed
+            and self.is_manifold
+            and self.is_oriented
+            and len(self.degenerate_faces) == 0
+            and len(self.non_planar_faces) == 0
+            and len(self.low_valence_vertices) == 0
+        )
+
+    def problems(self) -> list[str]:
+        """One line per kind of problem found"""
+        found = []
+        for name, items in [
+            ("boundary edges", self.boundary_edges),
+            ("non-manifold edges", self.non_manifold_edges),
+            ("misoriented edges", self.misoriented_edges),
+            ("degenerate faces", self.degenerate_faces),
+            ("non-planar faces", self.non_planar_faces),
+            ("vertices with less than 3 faces", self.low_valence_vertices),
+        ]:
+            if len(items) > 0:
+                found.append(f"{len(items)} {name}: {items[:5].tolist()}")
+        return found
+
+    def raise_if_invalid(self):
+        if not self.is_valid:
+            raise ValueError("invalid polyhedron, " + "; ".join(self.problems()))
+
+
+def _face_geometry(indexed: IndexedPolyhedron, tolerance: float):
+    """Per face whether it has no area and whether it is not planar"""
+    sizes = indexed.face_sizes
+    # reduceat gives an empty segment the value at its start instead of 0, so
+    # only the faces with corners are reduced, one row each
+    filled = sizes > 0
+    starts = indexed.face_offsets[:-1][filled]
+    rows = (np.cumsum(filled) - 1)[indexed.corner_faces]
+    corners = indexed.vertices[indexed.face_indices]
+    following = corners[indexed.next_corners]
+    area_vectors = np.add.reduceat(np.cross(corners, following), starts, axis=0)
+    doubled_areas = np.linalg.norm(area_vectors, axis=1)
+    longest = np.maximum.reduceat(np.linalg.norm(following - corners, axis=1), starts)
+    degenerate = sizes < 3
+    degenerate[filled] |= doubled_areas < 2 * tolerance * longest
+    normals = area_vectors / np.maximum(doubled_areas, np.finfo(float).tiny)[:, None]
+    centres = np.add.reduceat(corners, starts, axis=0) / sizes[filled][:, None]
+    distances = np.abs(np.einsum("ij,ij->i", corners - centres[rows], normals[rows]))
+    non_planar = np.zeros(len(sizes), dtype=bool)
+    non_planar[filled] = np.maximum.reduceat(distances, starts) > tolerance
+    return degenerate, non_planar & ~degenerate
+
+
+def validate(
+    polyhedron: Polyhedron, tolerance: float = VALIDATION_TOLERANCE
+) -> ValidationReport:
+    """
+    Checks in one pass over the edge table whether the polyhedron is closed,
+    manifold and consistently oriented, whether its faces are planar and have
+    an area, and how many faces use each vertex. Vertices are matched by
+    identity, as everywhere else.
+    Args:
+        polyhedron: the polyhedron to check
+        tolerance: planarity and degeneracy tolerance
+    Returns:
+        the diagnostics, see ValidationReport.is_valid and raise_if_invalid
+    """
+    indexed = IndexedPolyhedron.from_polyhedron(polyhedron)
+    no_edges = np.zeros((0, 2), dtype=np.int64)
+    no_items = np.zeros(0, dtype=np.int64)
+    if len(indexed.face_indices) == 0:
+        return ValidationReport(
+            indexed=indexed,
+            boundary_edges=no_edges,
+            non_manifold_edges=no_edges,
+            misoriented_edges=no_edges,
+            degenerate_faces=np.flatnonzero(indexed.face_sizes < 3),
+            non_planar_faces=no_items,
+            low_valence_vertices=no_items,
+            non_trivalent_vertices=no_items,
+        )
+    count = indexed.vertex_count
+    edges = indexed.edges
+    keys = edges[:, 0] * count + edges[:, 1]
+    reverse_keys = edges[:, 1] * count + edges[:, 0]
+    directed, directed_uses = np.unique(keys, return_counts=True)
+    undirected, undirected_uses = np.unique(
+        np.minimum(keys, reverse_keys), return_counts=True
+    )
+
+    def as_edges(edge_keys):
+        return np.stack([edge_keys // count, edge_keys % count], axis=1)
+
+    single = undirected[undirected_uses == 1]
+    boundary = np.unique(
+        keys[np.isin(np.minimum(keys, reverse_keys), single) & (keys != reverse_keys)]
+    )
+    non_manifold = undirected[undirected_uses > 2]
+    # an edge used twice in one direction, while the pair is not over-used
+    doubled = directed[directed_uses > 1]
+    doubled_pairs = np.minimum(doubled, (doubled % count) * count + doubled // count)
+    misoriented = doubled[~np.isin(doubled_pairs, non_manifold)]
+
+    degenerate, non_planar = _face_geometry(indexed, tolerance)
+    # a vertex repeated in a face counts once
+    face_vertex = np.unique(indexed.corner_faces * count + indexed.face_indices)
+    valences = np.bincount(face_vertex % count, minlength=count)
+    return ValidationReport(
+        indexed=indexed,
+        boundary_edges=as_edges(boundary),
+        non_manifold_edges=as_edges(non_manifold),
+        misoriented_edges=as_edges(misoriented),
+        degenerate_faces=np.flatnonzero(degenerate),
+        non_planar_faces=np.flatnonzero(non_planar),
+        low_valence_vertices=np.flatnonzero(valences < 3),
+        non_trivalent_vertices=np.flatnonzero(valences != 3),
+    )
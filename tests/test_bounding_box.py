@@ -0,0 +1,31 @@
+from dk_geometry.general import create_cube, extrude_polyhedron_from_face
+from dk_geometry.model import Vector3d
+
+
+def test_cube_bounds():
+    cube = create_cube(Vector3d(1, 2, 3), 10)
+    assert cube.dump_boundary_values() == {
+        "max_x": 6,
+        "min_x": -4,
+        "max_y": 7,
+        "min_y": -3,
+        "max_z": 8,
+        "min_z": -2,
+    }
+    assert cube.aabb is cube.aabb
+
+
+def test_that_moving_a_vertex_updates_the_bounds():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    assert cube.max_x == 5
+    cube.faces[0].vertices[0].x = 20
+    assert cube.max_x == 20
+    assert cube.faces[0].max_x == 20
+
+
+def test_that_adding_faces_updates_the_bounds():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    assert cube.min_y == -5
+    plate = extrude_polyhedron_from_face(cube.faces[3], 2)
+    cube.faces.extend(plate.faces)
+    assert cube.min_y == -7
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from dk_geometry import containment
+from dk_geometry.containment import _RAYS, contains, is_convex
+from dk_geometry.general import create_cube
+from dk_geometry.model import Vector3d, Vector3dArray
+from dk_geometry.triangulation import triangulate_polyhedron
+
+
+def test_points_in_a_cube():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    assert is_convex(cube)
+    points = Vector3dArray.from_vectors(
+        [Vector3d(0, 0, 0), Vector3d(5, 5, 5), Vector3d(5.005, 0, 0), Vector3d(6, 0, 0)]
+    )
+    assert contains(cube, points).tolist() == [True, True, True, False]
+    assert contains(cube, np.zeros((0, 3))).shape == (0,)
+
+
+def test_points_in_the_cutout(polyhedron_cutout):
+    polyhedron = polyhedron_cutout()
+    assert not is_convex(polyhedron)
+    points = np.random.default_rng(0).uniform(
+        [-100, -100, -700], [1300, 2600, 100], (5000, 3)
+    )
+    x, y, z = points.T
+    in_box = (0 <= x) & (x <= 1200) & (0 <= y) & (y <= 2500) & (-600 <= z) & (z <= 0)
+    # the cutout removes the part right of x=500 below z=-300
+    expected = in_box & ~((x > 500) & (z < -300))
+    assert np.array_equal(contains(polyhedron, points), expected)
+
+
+def test_vertices_of_the_sloped_cutout_are_inside(polyhedron_cutout_sloped):
+    polyhedron = polyhedron_cutout_sloped()
+    vertices = polyhedron.topology.vertices
+    assert contains(polyhedron, vertices).all()
+    assert polyhedron.plane_set is polyhedron.plane_set
+
+
+# with one ray the points are decided by the winding number fallback
+@pytest.mark.parametrize("ray_count", [len(_RAYS), 1])
+def test_rays_through_triangle_edges(polyhedron_cutout, monkeypatch, ray_count):
+    monkeypatch.setattr(containment, "_RAYS", _RAYS[:ray_count])
+    polyhedron = polyhedron_cutout()
+    vertices, indices = triangulate_polyhedron(polyhedron)
+    # points whose first ray passes through an edge of the triangulation
+    rng = np.random.default_rng(3)
+    points = []
+    for a, b, c in indices.reshape(-1, 3).tolist():
+        for start, finish in ((a, b), (b, c), (c, a)):
+            on_edge = vertices[start] + (vertices[finish] - vertices[start]) * 0.4
+            points.append(on_edge - _RAYS[0] * rng.uniform(5, 400))
+    points = np.array(points)
+    x, y, z = points.T
+    in_box = (0 <= x) & (x <= 1200) & (0 <= y) & (y <= 2500) & (-600 <= z) & (z <= 0)
+    expected = in_box & ~((x > 500) & (z < -300))
+    assert np.array_equal(contains(polyhedron, points), expected)
@@ -1,8 +1,10 @@
 import math
 
-from dk_geometry.model import Face, Vector3d
-
-from model import Polyhedron
+from dk_geometry.dimensions import (
+    compute_lw_dimensions,
+    compute_polyhedra_lw_dimensions,
+)
+from dk_geometry.model import Face, Polyhedron, Vector3d
 
 
 def test_dimension_angled_panel():
@@ -128,3 +130,44 @@ def test_horizontal_face():
     )
     assert face.lw_dimensions.size1 == 1000
     assert face.lw_dimensions.size2 == 600
+
+
+def test_rotated_rectangle_uses_its_own_sides():
+    # a 300 x 100 rectangle rotated by ~37 degrees in the XY plane
+    face = Face(
+        vertices=[
+            Vector3d(x=0.0, y=0.0, z=0.0),
+            Vector3d(x=240.0, y=180.0, z=0.0),
+            Vector3d(x=180.0, y=260.0, z=0.0),
+            Vector3d(x=-60.0, y=80.0, z=0.0),
+        ]
+    )
+    dimensions = face.lw_dimensions
+    assert round(dimensions.size1, 3) == 300
+    assert round(dimensions.size2, 3) == 100
+
+
+def test_minimum_area_ignores_short_chamfers():
+    # a 1000 x 500 panel with one small chamfered corner
+    face = Face(
+        vertices=[
+            Vector3d(x=0.0, y=0.0, z=0.0),
+            Vector3d(x=500.0, y=0.0, z=0.0),
+            Vector3d(x=500.0, y=980.0, z=0.0),
+            Vector3d(x=480.0, y=1000.0, z=0.0),
+            Vector3d(x=0.0, y=1000.0, z=0.0),
+        ]
+    )
+    dimensions = face.lw_dimensions
+    assert dimensions.direction1.crossProduct(Vector3d(0, 1, 0)).length < 0.001
+    assert (dimensions.size1, dimensions.size2) == (1000, 500)
+
+
+def test_batch_matches_single_faces(polyhedron_cutout, polyhedron_cutout_sloped):
+    polyhedra = [polyhedron_cutout(), polyhedron_cutout_sloped()]
+    batch = compute_polyhedra_lw_dimensions(polyhedra)
+    assert [len(dimensions) for dimensions in batch] == [8, 10]
+    for polyhedron, dimensions in zip(polyhedra, batch):
+        for face, face_dimensions in zip(polyhedron.faces, dimensions):
+            single = compute_lw_dimensions([face])[0]
+            assert face_dimensions == single
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from dk_geometry.extrusion import extrude_faces
+from dk_geometry.general import create_cube, extrude_polyhedron_from_face
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Face, Vector3d
+
+
+def test_plates_match_single_extrusions(polyhedron_cutout_sloped):
+    faces = polyhedron_cutout_sloped().faces
+    offsets = [18 if index % 2 else -3.5 for index in range(len(faces))]
+    plates = extrude_faces(faces, offsets)
+    assert len(plates) == len(faces)
+    for face, offset, plate in zip(faces, offsets, plates):
+        expected = IndexedPolyhedron.from_polyhedron(
+            extrude_polyhedron_from_face(face, offset)
+        )
+        actual = IndexedPolyhedron.from_polyhedron(plate)
+        assert np.array_equal(actual.face_offsets, expected.face_offsets)
+        assert np.array_equal(actual.face_indices, expected.face_indices)
+        assert np.allclose(actual.vertices, expected.vertices, atol=0.001)
+
+
+def test_plates_are_materialized_once(polyhedron_cutout):
+    faces = polyhedron_cutout().faces
+    plates = extrude_faces(faces, 18)
+    assert plates.indexed.face_count == sum(len(f.vertices) + 2 for f in faces)
+    assert plates[3] is plates[3]
+    assert all(
+        abs(plate.volume - face.surfaceArea * 18) < 1
+        for plate, face in zip(plates, faces)
+    )
+
+
+def test_faces_without_area_are_refused():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    a, b = cube.faces[0].vertices[:2]
+    faces = cube.faces[:2] + [Face(vertices=[a, b, Vector3d(a.x, a.y, a.z)])]
+    with pytest.raises(ValueError, match="face 2 has no area"):
+        extrude_faces(faces, 18)
@@ -0,0 +1,101 @@
+import pytest
+
+from dk_geometry import model
+from dk_geometry.enums import FaceNormal
+from dk_geometry.model import Face, Polyhedron, Vector3d
+from dk_geometry.offset import generate_offset
+
+
+def make_square() -> Face:
+    return Face(
+        vertices=[
+            Vector3d(0, 0, 0),
+            Vector3d(2, 0, 0),
+            Vector3d(2, 2, 0),
+            Vector3d(0, 2, 0),
+        ]
+    )
+
+
+def test_that_derived_values_are_reused():
+    face = make_square()
+    assert face.plane is face.plane
+    assert face.areaVector is face.areaVector
+    assert face.lw_dimensions is face.lw_dimensions
+
+
+def test_that_coordinate_changes_invalidate_the_cache():
+    face = make_square()
+    assert face.faceNormal == FaceNormal.F
+    assert face.max_x == 2
+    for vertex in face.vertices:
+        vertex.z = vertex.x
+    assert face.max_z == 2
+    assert face.faceNormal == FaceNormal.L_F
+    assert face.surfaceArea == 4 * 2**0.5
+
+
+def test_that_vertex_list_changes_invalidate_the_cache():
+    face = make_square()
+    assert face.surfaceArea == 4
+    face.vertices.pop()
+    assert face.surfaceArea == 2
+    face.vertices = face.vertices[::-1]
+    assert face.faceNormal == FaceNormal.BK
+
+
+def test_that_offset_faces_have_fresh_planes(polyhedron_cutout):
+    poly = polyhedron_cutout()
+    planes_before = [face.plane for face in poly.faces]
+    offset_poly = generate_offset(poly=poly, offset=18)
+    for face, plane in zip(poly.faces, planes_before):
+        assert face.plane is plane
+    assert offset_poly.faces[0].plane.origin.y == 2518
+    assert offset_poly.faces[1].plane.origin.x == 1218
+
+
+def test_that_in_place_changes_invalidate_the_cache():
+    face = make_square()
+    assert face.max_x == 2
+    face.vertices[1] = Vector3d(3, 0, 0)
+    assert face.max_x == 3
+    face.vertices[2] += Vector3d(2, 0, 0)
+    assert face.max_x == 4
+    polyhedron = Polyhedron(faces=[face])
+    assert polyhedron.max_z == 0
+    polyhedron.faces.append(Face(vertices=[Vector3d(0, 0, 5)] * 3))
+    assert polyhedron.max_z == 5
+
+
+def test_that_faces_copy_a_plain_list_and_share_a_tracked_one():
+    vertices = list(make_square().vertices)
+    face = Face(vertices=vertices)
+    vertices.pop()
+    assert len(face.vertices) == 4
+    other = Face(vertices=face.vertices)
+    assert other.vertices is face.vertices
+    assert other.max_x == 2
+    face.vertices[1] = Vector3d(3, 0, 0)
+    assert other.max_x == 3
+
+
+def test_that_adding_faces_only_invalidates_the_polyhedron():
+    face = make_square()
+    polyhedron = Polyhedron(faces=[face])
+    assert face.max_x == polyhedron.max_x == 2
+    version = model._geometry_version
+    polyhedron.faces.append(Face(vertices=[Vector3d(5, 0, 0)] * 3))
+    assert model._geometry_version == version
+    assert polyhedron.max_x == 5
+
+
+def test_that_changing_a_returned_vector_keeps_the_face():
+    face = make_square()
+    normal = face.areaVector
+    normal += Vector3d(1, 0, 0)
+    normal *= 2
+    assert normal == Vector3d(2, 0, 8)
+    assert face.areaVector == Vector3d(0, 0, 4)
+    with pytest.raises(AttributeError):
+        face.plane.normal.z = 0
+    assert face.plane.normal == Vector3d(0, 0, 1)
@@ -0,0 +1,41 @@
+from dk_geometry.enums import FaceNormal
+
+
+def test_index_matches_face_classification(polyhedron_cutout_sloped):
+    poly = polyhedron_cutout_sloped()
+    assert poly.indexedFaceNormals == {
+        idx: face.faceNormal for idx, face in enumerate(poly.faces)
+    }
+    assert poly.faceNormalIndex is poly.faceNormalIndex
+
+
+def test_strict_lookup(polyhedron_cutout_sloped):
+    poly = polyhedron_cutout_sloped()
+    assert poly.get_face_indices_by_facenormal(FaceNormal.R, strict=True) == {2, 7}
+    assert poly.get_face_indices_by_facenormal(
+        FaceNormal.R_T, FaceNormal.F, strict=True
+    ) == {1, 5}
+
+
+def test_component_lookup(polyhedron_cutout_sloped):
+    poly = polyhedron_cutout_sloped()
+    assert poly.get_face_indices_by_facenormal(FaceNormal.R) == {1, 2, 7}
+    assert poly.get_face_indices_by_facenormal(FaceNormal.L_T) == {0, 1, 4}
+
+
+def test_index_follows_geometry_changes(polyhedron_cutout):
+    poly = polyhedron_cutout()
+    assert poly.get_face_indices_by_facenormal(FaceNormal.L, strict=True) == {3}
+    poly.faces[3].vertices.reverse()
+    assert poly.get_face_indices_by_facenormal(FaceNormal.L, strict=True) == set()
+    assert poly.get_face_indices_by_facenormal(FaceNormal.R, strict=True) == {
+        1,
+        3,
+        6,
+    }
+
+
+def test_from_stringlist():
+    assert FaceNormal.from_stringlist(["T"]) == FaceNormal.T
+    assert FaceNormal.from_stringlist(["F", "R"]) == FaceNormal.R_F
+    assert FaceNormal.from_stringlist(["L", "T", "F"]) is None
@@ -0,0 +1,61 @@
+from copy import deepcopy
+
+from dk_geometry.fingerprint import face_fingerprint
+from dk_geometry.general import create_cube
+from dk_geometry.model import Face, Polyhedron, Vector3d
+
+
+def make_square() -> Face:
+    return Face(
+        vertices=[
+            Vector3d(0, 0, 0),
+            Vector3d(2, 0, 0),
+            Vector3d(2, 2, 0),
+            Vector3d(0, 2, 0),
+        ]
+    )
+
+
+def test_face_fingerprint_ignores_the_starting_vertex():
+    face = make_square()
+    rotated = Face(vertices=face.vertices[2:] + face.vertices[:2])
+    assert face.fingerprint == rotated.fingerprint
+    assert face.fingerprint != Face(vertices=face.vertices[::-1]).fingerprint
+
+
+def test_face_fingerprint_tolerance():
+    face = make_square()
+    moved = make_square()
+    moved.vertices[1].x = 2.001
+    assert face.fingerprint == moved.fingerprint
+    moved.vertices[1].x = 2.1
+    assert face.fingerprint != moved.fingerprint
+    assert face_fingerprint(face, 1) == face_fingerprint(moved, 1)
+
+
+def test_polyhedron_fingerprint(polyhedron_cutout):
+    poly = polyhedron_cutout()
+    assert poly.fingerprint == deepcopy(poly).fingerprint
+    assert poly.fingerprint == polyhedron_cutout().fingerprint
+    assert poly.fingerprint != polyhedron_cutout(cutout_x=400).fingerprint
+    reordered = Polyhedron(faces=poly.faces[1:] + poly.faces[:1])
+    assert poly.fingerprint != reordered.fingerprint
+
+
+def test_polyhedron_fingerprint_includes_vertex_sharing():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    detached = deepcopy(cube)
+    detached.faces[0].vertices = [
+        Vector3d(v.x, v.y, v.z) for v in detached.faces[0].vertices
+    ]
+    assert cube.fingerprint != detached.fingerprint
+
+
+def test_polyhedron_fingerprint_follows_changes():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    before = cube.fingerprint
+    assert cube.fingerprint is before
+    cube.faces[0].vertices[0].x = -6
+    assert cube.fingerprint != before
+    cube.faces[0].vertices[0].x = -5
+    assert cube.fingerprint == before
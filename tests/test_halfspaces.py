@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from dk_geometry.general import create_cube
+from dk_geometry.model import Face, Plane3d, Polyhedron, Vector3d
+from dk_geometry.offset import generate_offset
+
+
+def make_pyramid() -> Polyhedron:
+    apex = Vector3d(0, 0, 100)
+    base = [
+        Vector3d(-50, -50, 0),
+        Vector3d(50, -50, 0),
+        Vector3d(50, 50, 0),
+        Vector3d(-50, 50, 0),
+    ]
+    return Polyhedron(
+        faces=[Face(vertices=base[::-1])]
+        + [Face(vertices=[base[i], base[(i + 1) % 4], apex]) for i in range(4)]
+    )
+
+
+def test_cube_is_rebuilt_from_its_planes():
+    cube = create_cube(Vector3d(10, 20, 30), 10)
+    rebuilt = Polyhedron.from_halfspaces([face.plane for face in cube.faces])
+    assert len(rebuilt.faces) == 6
+    assert len(rebuilt.topology.vertices) == 8
+    assert (rebuilt.topology.twin >= 0).all()
+    assert math.isclose(rebuilt.volume, 1000)
+    for face, rebuilt_face in zip(cube.faces, rebuilt.faces):
+        assert rebuilt_face.plane.normal == face.plane.normal
+
+
+def test_apex_of_four_faces_is_one_vertex():
+    pyramid = make_pyramid()
+    planes = [face.plane for face in pyramid.faces]
+    # a plane which does not touch the pyramid gives no face
+    planes.append(Plane3d(origin=Vector3d(0, 0, 200), normal=Vector3d(0, 0, 1)))
+    rebuilt = Polyhedron.from_halfspaces(planes)
+    assert [len(face.vertices) for face in rebuilt.faces] == [4, 3, 3, 3, 3]
+    assert len(rebuilt.topology.vertices) == 5
+    assert math.isclose(rebuilt.volume, pyramid.volume, rel_tol=1e-4)
+
+
+def test_planes_without_volume_are_rejected():
+    planes = [face.plane for face in create_cube(Vector3d(0, 0, 0), 10).faces]
+    with pytest.raises(ValueError):
+        Polyhedron.from_halfspaces(planes[:5])
+    with pytest.raises(ValueError):
+        Polyhedron.from_halfspaces(
+            planes + [Plane3d(origin=Vector3d(20, 0, 0), normal=Vector3d(-1, 0, 0))]
+        )
+
+
+def test_offset_of_convex_polyhedron_with_four_faces_at_a_vertex():
+    pyramid = make_pyramid()
+    inner = generate_offset(pyramid, offset_map={0: -5, 1: -10})
+    assert len(inner.faces) == len(pyramid.faces)
+    for index, (face, inner_face) in enumerate(zip(pyramid.faces, inner.faces)):
+        expected = {0: -5, 1: -10}.get(index, 0)
+        plane = face.plane
+        for vertex in inner_face.vertices:
+            distance = (vertex - plane.origin).dotProduct(plane.normal.normalized)
+            assert abs(distance - expected) < 0.1
@@ -0,0 +1,53 @@
+from dk_geometry.general import create_cube
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Vector3d
+
+
+def test_shared_vertices_are_stored_once():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    indexed = IndexedPolyhedron.from_polyhedron(cube)
+    assert indexed.vertices.shape == (8, 3)
+    assert indexed.face_count == 6
+    assert list(indexed.face_sizes) == [4] * 6
+    assert len(indexed.edges) == 24
+
+
+def test_round_trip_keeps_coordinates(polyhedron_cutout_sloped):
+    poly = polyhedron_cutout_sloped()
+    restored = IndexedPolyhedron.from_polyhedron(poly).to_polyhedron()
+    assert len(restored.faces) == len(poly.faces)
+    for face, restored_face in zip(poly.faces, restored.faces):
+        assert [(v.x, v.y, v.z) for v in face.vertices] == [
+            (v.x, v.y, v.z) for v in restored_face.vertices
+        ]
+
+
+def test_round_trip_keeps_topology(polyhedron_cutout):
+    poly = polyhedron_cutout()
+    restored = IndexedPolyhedron.from_polyhedron(poly).to_polyhedron()
+    corners = [(f, v) for f in range(len(poly.faces)) for v in range(4)]
+    for face1, vertex1 in corners:
+        for face2, vertex2 in corners:
+            same_in_input = (
+                poly.faces[face1].vertices[vertex1]
+                is poly.faces[face2].vertices[vertex2]
+            )
+            same_in_output = (
+                restored.faces[face1].vertices[vertex1]
+                is restored.faces[face2].vertices[vertex2]
+            )
+            assert same_in_input == same_in_output
+
+
+def test_edges_follow_face_order():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    indexed = IndexedPolyhedron.from_polyhedron(cube)
+    edges = indexed.edges
+    for face_index in range(indexed.face_count):
+        face = list(indexed.face(face_index))
+        start = indexed.face_offsets[face_index]
+        for corner in range(len(face)):
+            assert list(edges[start + corner]) == [
+                face[corner],
+                face[(corner + 1) % len(face)],
+            ]
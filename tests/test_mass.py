@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+
+from dk_geometry.general import create_cube
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.mass import compute_mass_properties
+from dk_geometry.model import Vector3d
+
+
+def test_cube_properties():
+    properties = compute_mass_properties([create_cube(Vector3d(1, 2, 3), 2)])
+    assert np.allclose(properties.volume, [8])
+    assert np.allclose(properties.area, [24])
+    assert np.allclose(properties.face_area, [4] * 6)
+    assert np.allclose(properties.centroid, [[1, 2, 3]])
+    # a cube of mass m and side s has m * s^2 / 6 around each axis
+    assert np.allclose(properties.inertia[0], np.eye(3) * 8 * 4 / 6)
+
+
+def test_batch_matches_single_polyhedra(polyhedron_cutout, polyhedron_cutout_sloped):
+    polyhedra = [polyhedron_cutout(), polyhedron_cutout_sloped()]
+    batch = compute_mass_properties(polyhedra)
+    assert list(batch.face_offsets) == [0, 8, 18]
+    for index, poly in enumerate(polyhedra):
+        single = compute_mass_properties([IndexedPolyhedron.from_polyhedron(poly)])
+        assert np.allclose(batch.volume[index], single.volume[0])
+        assert np.allclose(batch.inertia[index], single.inertia[0])
+        assert math.fabs(batch.volume[index] - poly.volume) < 0.001
+        face_area = batch.face_area[
+            batch.face_offsets[index] : batch.face_offsets[index + 1]
+        ]
+        assert np.allclose(face_area, [face.surfaceArea for face in poly.faces])
+
+
+def test_cutout_centroid(polyhedron_cutout):
+    properties = compute_mass_properties([polyhedron_cutout()])
+    assert np.allclose(properties.volume, [1200 * 2500 * 600 - 700 * 2500 * 300])
+    # a 500 wide full depth block plus a 700 wide half depth block
+    full = 500 * 2500 * 600
+    half = 700 * 2500 * 300
+    expected_x = (full * 250 + half * 850) / (full + half)
+    expected_z = (full * -300 + half * -150) / (full + half)
+    assert np.allclose(properties.centroid, [[expected_x, 1250, expected_z]])
+
+
+def test_inertia_does_not_depend_on_position():
+    near = compute_mass_properties([create_cube(Vector3d(0, 0, 0), 600)])
+    far = compute_mass_properties([create_cube(Vector3d(5000, -3000, 800), 600)])
+    assert np.allclose(near.inertia, far.inertia)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from dk_geometry.general import create_cube, extrude_polyhedron_from_face
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Face, Polyhedron, Vector3d
+from dk_geometry.parts import group_identical_parts, shape_signature
+
+
+def make_l_panel(transform=lambda v: v) -> Polyhedron:
+    # an L shaped 18 thick panel, asymmetric so its mirror image is different
+    outline = [(0, 0), (600, 0), (600, 200), (200, 200), (200, 900), (0, 900)]
+    face = Face(vertices=[transform(Vector3d(x, y, 0)) for x, y in outline])
+    return extrude_polyhedron_from_face(face, 18)
+
+
+def rotate(v: Vector3d) -> Vector3d:
+    # rotation around Y by the 3-4-5 angle, then a translation
+    return Vector3d(0.8 * v.x + 0.6 * v.z + 1000, v.y - 50, -0.6 * v.x + 0.8 * v.z)
+
+
+def test_signature_ignores_rigid_motion():
+    assert shape_signature(make_l_panel()) == shape_signature(make_l_panel(rotate))
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    assert shape_signature(cube) == shape_signature(
+        create_cube(Vector3d(100, -30, 7), 10)
+    )
+    assert shape_signature(cube) != shape_signature(create_cube(Vector3d(0, 0, 0), 11))
+
+
+def test_mirrored_parts_differ(polyhedron_cutout_sloped):
+    poly = polyhedron_cutout_sloped()
+    mirrored = IndexedPolyhedron.from_polyhedron(poly).to_polyhedron()
+    for face in mirrored.faces:
+        for vertex in face.vertices:
+            if vertex.x > 0:
+                vertex.x = -vertex.x
+        face.vertices.reverse()
+    assert shape_signature(poly) != shape_signature(mirrored)
+    # a flat plate and its mirror image are the same part turned over
+    flipped = make_l_panel(lambda v: Vector3d(-v.x, v.y, v.z))
+    assert shape_signature(make_l_panel()) == shape_signature(flipped)
+
+
+def test_grouping_with_transforms():
+    parts = [
+        make_l_panel(),
+        create_cube(Vector3d(0, 0, 0), 10),
+        make_l_panel(rotate),
+        create_cube(Vector3d(5, 5, 5), 10),
+    ]
+    groups = group_identical_parts(parts)
+    assert [group.indices for group in groups] == [[0, 2], [1, 3]]
+    for group in groups:
+        canonical = IndexedPolyhedron.from_polyhedron(group.canonical).vertices
+        assert canonical.min() > -0.001
+        for index, transform in zip(group.indices, group.transforms):
+            placed = canonical @ transform[:3, :3].T + transform[:3, 3]
+            expected = IndexedPolyhedron.from_polyhedron(parts[index]).vertices
+            distances = np.linalg.norm(placed[:, None] - expected[None], axis=2)
+            assert distances.min(axis=1).max() < 0.001
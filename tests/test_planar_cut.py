@@ -3,9 +3,15 @@ from dk_geometry.general import (
     calculate_signed_distance_to_plane,
     create_cube,
     cut_face_by_plane,
-    cut_polyhedron_by_plane
+    cut_polyhedron_by_plane,
+    clip_polyhedron_by_planes,
+    split_polyhedron_by_plane,
+    cut_face_by_plane_into_pieces,
+    find_holes_in_polyhedron,
+    get_connected_components,
 )
 from dk_geometry.model import Face, Plane3d, Polyhedron, Vector3d
+from dk_geometry.validation import validate
 import math
 
 def make_xy_square(width: float, height: float) -> Face:
@@ -85,3 +91,118 @@ def test_that_a_cut_polyhedron_has_no_holes():
     plane = Plane3d(origin=Vector3d(4,4,0), normal=Vector3d(1,1,0).normalized)
     cut_cube = cut_polyhedron_by_plane(cube, plane)
     assert len(find_hole_in_polyhedron(cut_cube))==0
+
+
+def test_that_clipping_by_planes_equals_cutting_in_sequence(polyhedron_cutout_sloped):
+    polyhedron = polyhedron_cutout_sloped()
+    planes = [
+        Plane3d(origin=Vector3d(1000,0,0), normal=Vector3d(1,0,0)),
+        Plane3d(origin=Vector3d(0,1200,0), normal=Vector3d(0.3,1,0)),
+        Plane3d(origin=Vector3d(0,0,-500), normal=Vector3d(0,0,-1)),
+    ]
+    expected = polyhedron
+    for plane in planes:
+        expected = cut_polyhedron_by_plane(expected, plane)
+    clipped = clip_polyhedron_by_planes(polyhedron, planes)
+    assert [f.vertices for f in clipped.faces]==[f.vertices for f in expected.faces]
+    assert len(find_hole_in_polyhedron(clipped))==0
+
+
+def test_that_clipping_keeps_the_untouched_faces():
+    cube = create_cube(Vector3d(0,0,0), 2)
+    clipped = clip_polyhedron_by_planes(
+        cube, [Plane3d(origin=Vector3d(0.5,0,0), normal=Vector3d(1,0,0))]
+    )
+    assert any(face is cube.faces[5] for face in clipped.faces)  # the left face
+    assert clipped.max_x==0.5
+
+
+def test_that_split_parts_equal_cuts_from_both_sides(polyhedron_cutout_sloped):
+    polyhedron = polyhedron_cutout_sloped()
+    plane = Plane3d(origin=Vector3d(0,1000,0), normal=Vector3d(0.2,1,0.1))
+    inverted = Plane3d(origin=plane.origin, normal=-plane.normal)
+    behind, in_front = split_polyhedron_by_plane(polyhedron, plane)
+    expected_behind = cut_polyhedron_by_plane(polyhedron, plane)
+    expected_in_front = cut_polyhedron_by_plane(polyhedron, inverted)
+    assert [f.vertices for f in behind.faces]==[f.vertices for f in expected_behind.faces]
+    assert [f.vertices for f in in_front.faces]==[
+        f.vertices for f in expected_in_front.faces
+    ]
+    assert math.isclose(behind.volume + in_front.volume, polyhedron.volume)
+
+
+def test_that_split_parts_share_the_cap_vertices():
+    cube = create_cube(Vector3d(0,0,0), 2)
+    plane = Plane3d(origin=Vector3d(0,0,0), normal=Vector3d(1,1,0))
+    behind, in_front = split_polyhedron_by_plane(cube, plane)
+    behind_cap = behind.faces[-1].vertices
+    in_front_cap = in_front.faces[-1].vertices
+    assert len(behind_cap)==4
+    assert {id(v) for v in behind_cap}=={id(v) for v in in_front_cap}
+
+
+def make_l_plane() -> Plane3d:
+    # cuts the inner corner off the L shaped cutout carcass, leaving both legs
+    return Plane3d(origin=Vector3d(600,0,-300), normal=Vector3d(-1,0,3))
+
+
+def test_that_a_concave_face_is_cut_in_pieces(polyhedron_cutout):
+    polyhedron = polyhedron_cutout()
+    concave = [f for f in polyhedron.faces if len(f.vertices)==6]
+    assert len(concave)==2
+    for face in concave:
+        pieces = cut_face_by_plane_into_pieces(face, make_l_plane())
+        assert len(pieces)==2
+        areas = sorted(piece.surfaceArea for piece in pieces)
+        assert math.isclose(areas[0], 200*600/2, rel_tol=1e-4)  # right leg tip
+        assert math.isclose(areas[1], 500*(100 + 500/6), rel_tol=1e-4)  # back leg
+
+
+def test_that_a_cut_can_leave_several_parts(polyhedron_cutout):
+    polyhedron = polyhedron_cutout()
+    cut = cut_polyhedron_by_plane(polyhedron, make_l_plane())
+    assert len(find_holes_in_polyhedron(cut))==0
+    components = get_connected_components(cut)
+    assert len(components)==2
+    behind, in_front = split_polyhedron_by_plane(polyhedron, make_l_plane())
+    assert math.isclose(behind.volume + in_front.volume, polyhedron.volume)
+    assert math.isclose(sum(c.volume for c in components), behind.volume)
+
+
+def test_that_cuts_through_vertices_leave_valid_polyhedra(polyhedron_cutout):
+    cube = create_cube(Vector3d(0,0,0), 2)
+    corner_cut = cut_polyhedron_by_plane(cube, Plane3d(origin=Vector3d(1,1,1), normal=Vector3d(1,1,1)))
+    assert validate(corner_cut).is_valid
+    assert math.isclose(corner_cut.volume, 8)
+    polyhedron = polyhedron_cutout()
+    cut = cut_polyhedron_by_plane(polyhedron, Plane3d(origin=Vector3d(500,2500,-300), normal=Vector3d(-1,1,1)))
+    assert validate(cut).is_valid
+
+
+def test_that_a_concave_face_touching_the_plane_is_cut(polyhedron_cutout_sloped):
+    # the reflex corner (200,400,-600) of face 6 is on the plane up to rounding
+    polyhedron = polyhedron_cutout_sloped()
+    plane = Plane3d(origin=Vector3d(1200,2000,0), normal=Vector3d(1,-1,1))
+    pieces = cut_face_by_plane_into_pieces(polyhedron.faces[6], plane)
+    assert len(pieces)==1
+    assert len(pieces[0].vertices)==6
+    report = validate(cut_polyhedron_by_plane(polyhedron, plane))
+    assert report.is_closed and report.is_manifold and report.is_oriented
+
+
+def test_that_chained_cuts_through_edges_in_the_plane_stay_valid(polyhedron_cutout_sloped):
+    # the first plane contains the edge x=200, z=-600 of the cutout
+    planes = [
+        Plane3d(origin=Vector3d(500,1250,-300), normal=Vector3d(1,0,-1)),
+        Plane3d(origin=Vector3d(518.13512,102.10107,-300), normal=Vector3d(1,-1,-1)),
+        Plane3d(origin=Vector3d(815.5243,1250,0), normal=Vector3d(0.80147,-1,1)),
+        Plane3d(origin=Vector3d(300,1250,0), normal=Vector3d(-1,0.69252,-0.58008)),
+    ]
+    polyhedron = polyhedron_cutout_sloped()
+    for plane in planes:
+        polyhedron = cut_polyhedron_by_plane(polyhedron, plane)
+        report = validate(polyhedron)
+        assert report.is_valid, report.problems()
+    clipped = clip_polyhedron_by_planes(polyhedron_cutout_sloped(), planes)
+    assert validate(clipped).is_valid
+    assert math.isclose(clipped.volume, polyhedron.volume)
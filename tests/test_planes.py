@@ -0,0 +1,65 @@
+import numpy as np
+
+from dk_geometry.general import (
+    calculate_signed_distance_to_plane,
+    compute_three_planes_intersection,
+    create_cube,
+)
+from dk_geometry.model import Plane3d, Vector3d, Vector3dArray
+from dk_geometry.planes import PlaneSet
+
+
+def test_signed_distances_match_single_plane_distances(polyhedron_cutout_sloped):
+    polyhedron = polyhedron_cutout_sloped()
+    vertices = [v for f in polyhedron.faces for v in f.vertices]
+    planes = [face.plane for face in polyhedron.faces] + [
+        Plane3d(origin=Vector3d(100, 200, -50), normal=Vector3d(0.3, -2, 1))
+    ]
+    distances = PlaneSet.from_planes(planes).signed_distances(vertices)
+    expected = [
+        [calculate_signed_distance_to_plane(v, plane) for plane in planes]
+        for v in vertices
+    ]
+    assert distances.shape == (len(vertices), len(planes))
+    # calculate_signed_distance_to_plane uses the rounded normals
+    assert np.allclose(distances, expected, atol=0.01)
+
+
+def test_vertices_of_a_cube_are_behind_its_faces():
+    cube = create_cube(Vector3d(0, 0, 0), 2)
+    planes = PlaneSet.from_faces(cube.faces)
+    corners = Vector3dArray.from_vectors([v for f in cube.faces for v in f.vertices])
+    distances = planes.signed_distances(corners)
+    assert (distances <= 1e-9).all()
+    assert np.allclose(distances.min(axis=0), -2)
+
+
+def test_batched_intersections_match_single_intersections(polyhedron_cutout_sloped):
+    polyhedron = polyhedron_cutout_sloped()
+    planes = PlaneSet.from_faces(polyhedron.faces)
+    triples = np.array(polyhedron.topology.vertex_faces)
+    points, degenerate = planes.intersect_triples(triples)
+    assert not degenerate.any()
+    for (a, b, c), point in zip(triples, points):
+        expected = compute_three_planes_intersection(
+            polyhedron.faces[a].plane,
+            polyhedron.faces[b].plane,
+            polyhedron.faces[c].plane,
+        )
+        assert np.allclose(point, [expected.x, expected.y, expected.z], atol=0.001)
+    vertices = Vector3dArray.from_vectors(polyhedron.topology.vertices)
+    assert np.allclose(points, vertices.values, atol=0.01)
+
+
+def test_parallel_planes_are_flagged():
+    cube = create_cube(Vector3d(0, 0, 0), 2)
+    planes = PlaneSet.from_faces(cube.faces)
+    opposite = [
+        index
+        for index in range(1, 6)
+        if np.allclose(planes.normals[index], -planes.normals[0])
+    ][0]
+    adjacent = [index for index in range(1, 6) if index != opposite][0]
+    points, degenerate = planes.intersect_triples([[0, opposite, adjacent]])
+    assert degenerate.tolist() == [True]
+    assert np.isnan(points).all()
@@ -0,0 +1,74 @@
+from dk_geometry.general import (
+    create_cube,
+    cut_polyhedron_by_plane,
+    extrude_polyhedron_from_face,
+    get_adjacent_faces,
+)
+from dk_geometry.indexed import IndexedPolyhedron
+from dk_geometry.model import Face, Plane3d, Polyhedron, Vector3d, fixed_point
+from dk_geometry.pool import VertexPool, weld_vertices
+
+
+def split_vertices(polyhedron: Polyhedron) -> Polyhedron:
+    return Polyhedron(
+        faces=[
+            Face(vertices=[Vector3d(v.x, v.y, v.z + 0.0001) for v in face.vertices])
+            for face in polyhedron.faces
+        ]
+    )
+
+
+def test_pool_welds_points_within_tolerance():
+    pool = VertexPool(tolerance=0.01)
+    vertex = pool.intern(Vector3d(1, 1, 1))
+    assert pool.intern(Vector3d(1.005, 0.999, 1)) is vertex
+    assert pool.intern(Vector3d(1.02, 1, 1)) is not vertex
+    assert len(pool) == 2
+
+
+def test_pool_in_a_fixed_point_block_welds_grid_points():
+    with fixed_point(100):
+        pool = VertexPool()
+        vertex = pool.intern(Vector3d(1, 1, 1))
+        assert pool.intern(Vector3d(1.004, 0.996, 1)) is vertex
+        assert pool.intern(Vector3d(1.006, 1, 1)) is not vertex
+    assert pool.find(Vector3d(1.01, 1, 1)) is not None
+    assert len(pool) == 2
+
+
+def test_welded_polyhedron_has_topology(polyhedron_cutout):
+    polyhedron = split_vertices(polyhedron_cutout())
+    assert get_adjacent_faces(polyhedron, 0) == []
+    welded = weld_vertices(polyhedron)
+    assert IndexedPolyhedron.from_polyhedron(welded).vertex_count == len(
+        {id(v) for f in polyhedron_cutout().faces for v in f.vertices}
+    )
+    assert len(get_adjacent_faces(welded, 0)) == len(welded.faces[0].vertices)
+
+
+def test_cuts_share_split_vertices_through_the_pool():
+    pool = VertexPool()
+    plane = Plane3d(origin=Vector3d(0, 0, 0.3), normal=Vector3d(0, 0, 1))
+    left = cut_polyhedron_by_plane(create_cube(Vector3d(0, 0, 0), 1), plane, pool)
+    right = cut_polyhedron_by_plane(create_cube(Vector3d(1, 0, 0), 1), plane, pool)
+    left_ids = {id(v) for f in left.faces for v in f.vertices}
+    right_ids = {id(v) for f in right.faces for v in f.vertices}
+    assert len(left_ids & right_ids) == 2
+
+
+def test_extrusions_share_vertices_through_the_pool():
+    pool = VertexPool()
+    square = Face(
+        vertices=[
+            Vector3d(0, 0, 0),
+            Vector3d(1, 0, 0),
+            Vector3d(1, 1, 0),
+            Vector3d(0, 1, 0),
+        ]
+    )
+    lower = extrude_polyhedron_from_face(square, 1, pool)
+    upper = extrude_polyhedron_from_face(square, -1, pool)
+    assert len(pool) == 12
+    lower_ids = {id(v) for f in lower.faces for v in f.vertices}
+    upper_ids = {id(v) for f in upper.faces for v in f.vertices}
+    assert len(lower_ids & upper_ids) == 4
@@ -0,0 +1,88 @@
+import math
+
+from dk_geometry.general import create_cube, split_polyhedron_by_plane
+from dk_geometry.model import Face, Plane3d, Polyhedron, SliceInterval, Vector3d
+from dk_geometry.simplify import simplify_polyhedron
+from dk_geometry.slice import apply_slice_interval
+
+
+def glue_halves(cube: Polyhedron) -> Polyhedron:
+    """The cube split at z=0 without the caps, so the sides are in two pieces"""
+    halves = split_polyhedron_by_plane(
+        cube, Plane3d(origin=Vector3d(0, 0, 0), normal=Vector3d(0, 0, 1))
+    )
+    return Polyhedron(
+        faces=[
+            face
+            for half in halves
+            for face in half.faces
+            if not all(abs(v.z) < 1e-6 for v in face.vertices)
+        ]
+    )
+
+
+def test_clean_polyhedron_is_returned_unchanged(polyhedron_cutout_sloped):
+    polyhedron = polyhedron_cutout_sloped()
+    assert simplify_polyhedron(polyhedron) is polyhedron
+
+
+def test_coplanar_faces_and_collinear_vertices_are_merged():
+    glued = glue_halves(create_cube(Vector3d(0, 0, 0), 10))
+    assert len(glued.faces) == 10
+    simplified = simplify_polyhedron(glued)
+    assert [len(face.vertices) for face in simplified.faces] == [4] * 6
+    assert len(simplified.topology.vertices) == 8
+    assert (simplified.topology.twin >= 0).all()
+    assert math.isclose(simplified.volume, 1000)
+
+
+def test_coinciding_vertices_and_slivers_are_removed():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    # a copy of the first face with one vertex moved slightly, and a sliver
+    # face along one edge of it
+    face = cube.faces[0]
+    moved = Vector3d(face.vertices[0].x, face.vertices[0].y, face.vertices[0].z)
+    moved.x += 0.0001
+    faces = [Face(vertices=[moved] + face.vertices[1:])] + cube.faces[1:]
+    simplified = simplify_polyhedron(Polyhedron(faces=faces))
+    assert len(simplified.topology.vertices) == 8
+    assert (simplified.topology.twin >= 0).all()
+    start, finish = face.vertices[0], face.vertices[1]
+    middle = (start + finish) * 0.5
+    sliver = Face(vertices=[finish, start, middle])
+    with_sliver = Polyhedron(faces=cube.faces + [sliver])
+    simplified = simplify_polyhedron(with_sliver)
+    assert len(simplified.faces) == 6
+    assert (simplified.topology.twin >= 0).all()
+
+
+def test_slicing_only_simplifies_on_request():
+    v = [
+        Vector3d(x, y, z)
+        for x, y, z in [
+            (0, 0, 0),
+            (10, 0, 0),
+            (10, 10, 0),
+            (0, 10, 0),
+            (0, 0, -10),
+            (10, 0, -10),
+            (10, 10, -10),
+            (0, 10, -10),
+        ]
+    ]
+    bottom_middle, top_middle = Vector3d(5, 0, 0), Vector3d(5, 10, 0)
+    # the front face is split into two coplanar faces
+    box = Polyhedron(
+        faces=[
+            Face(vertices=[v[0], bottom_middle, top_middle, v[3]]),
+            Face(vertices=[bottom_middle, v[1], v[2], top_middle]),
+            Face(vertices=[v[3], top_middle, v[2], v[6], v[7]]),
+            Face(vertices=[v[7], v[6], v[5], v[4]]),
+            Face(vertices=[v[0], v[4], v[5], v[1], bottom_middle]),
+            Face(vertices=[v[2], v[1], v[5], v[6]]),
+            Face(vertices=[v[0], v[3], v[7], v[4]]),
+        ]
+    )
+    interval = SliceInterval(max_y=5)
+    assert len(apply_slice_interval(box, interval).faces) == 7
+    assert len(apply_slice_interval(box, interval, simplify=True).faces) == 6
@@ -0,0 +1,50 @@
+import pytest
+
+from dk_geometry.general import create_cube
+from dk_geometry.model import SliceInterval, Vector3d, structural_sharing
+from dk_geometry.offset import generate_offset
+from dk_geometry.slice import apply_slice_interval
+
+
+def test_untouched_slice_returns_the_input():
+    cube = create_cube(Vector3d(0, 0, 0), 2)
+    interval = SliceInterval(min_x=-5, max_x=5)
+    assert apply_slice_interval(cube, interval) is not cube
+    with structural_sharing():
+        assert apply_slice_interval(cube, interval) is cube
+
+
+def test_slice_shares_the_uncut_faces():
+    cube = create_cube(Vector3d(0, 0, 0), 2)
+    with structural_sharing():
+        sliced = apply_slice_interval(cube, SliceInterval(max_x=0.5))
+    shared = [face for face in sliced.faces if any(face is f for f in cube.faces)]
+    assert len(shared) == 1  # the left face
+    assert sliced.max_x == 0.5 and cube.max_x == 1
+
+
+def test_offset_shares_the_faces_which_do_not_move():
+    cube = create_cube(Vector3d(0, 0, 0), 2)
+    with structural_sharing():
+        offset = generate_offset(poly=cube, offset_map={4: 1})  # right face
+    assert offset.max_x == 2 and cube.max_x == 1
+    assert offset.faces[5] is cube.faces[5]
+    assert offset.faces[4] is not cube.faces[4]
+
+
+def test_shared_results_are_read_only():
+    cube = create_cube(Vector3d(0, 0, 0), 2)
+    with structural_sharing():
+        offset = generate_offset(poly=cube, offset_map={0: 10})
+    shared = offset.faces[2]
+    assert shared is cube.faces[2]
+    with pytest.raises(AttributeError):
+        shared.vertices[0].x += 999
+    with pytest.raises(TypeError):
+        shared.vertices[0] = Vector3d(0, 0, 0)
+    with pytest.raises(AttributeError):
+        shared.vertices = []
+    expected = create_cube(Vector3d(0, 0, 0), 2).faces[2]
+    assert [(v.x, v.y, v.z) for v in cube.faces[2].vertices] == [
+        (v.x, v.y, v.z) for v in expected.vertices
+    ]
@@ -0,0 +1,69 @@
+import pytest
+
+from dk_geometry.general import create_cube, find_holes_in_polyhedron
+from dk_geometry.model import Polyhedron, Vector3d
+from dk_geometry.offset import is_angle_internal
+
+
+def test_cube_topology():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    topology = cube.topology
+    assert len(topology.vertices) == 8
+    assert (topology.twin >= 0).all()
+    for face_index in range(6):
+        neighbours = topology.face_neighbours(face_index)
+        assert len(neighbours) == 4
+        assert face_index not in neighbours
+    for vertex in topology.vertices:
+        assert len(topology.faces_of_vertex(vertex)) == 3
+
+
+def test_topology_is_cached_until_the_geometry_changes():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    topology = cube.topology
+    assert cube.topology is topology
+    cube.faces = cube.faces[1:]
+    assert cube.topology is not topology
+
+
+def test_boundary_loops_of_an_open_cube():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    removed = cube.faces[0]
+    open_cube = Polyhedron(faces=cube.faces[1:])
+    loops = open_cube.topology.boundary_loops()
+    assert len(loops) == 1
+    assert {id(v) for v in loops[0]} == {id(v) for v in removed.vertices}
+    assert find_holes_in_polyhedron(open_cube) == loops
+
+
+def test_is_angle_internal_matches_faces(polyhedron_cutout):
+    polyhedron = polyhedron_cutout()
+    topology = polyhedron.topology
+    internal = 0
+    for face1 in range(len(polyhedron.faces)):
+        for face2 in topology.face_neighbours(face1):
+            expected = is_angle_internal(
+                polyhedron.faces[face1], polyhedron.faces[face2]
+            )
+            assert topology.is_angle_internal(face1, face2) == expected
+            internal += expected
+    assert internal > 0
+
+
+def test_boundary_loops_closed_by_other_faces():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    # without front and back, the front is closed by its own face
+    sides = Polyhedron(faces=[cube.faces[index] for index in (1, 3, 4, 5)])
+    caps = Polyhedron(faces=[cube.faces[0]]).topology.boundary_edges()
+    loops = sides.topology.boundary_loops(closed_by=caps)
+    assert len(sides.topology.boundary_loops()) == 2
+    assert len(loops) == 1
+    assert {id(v) for v in loops[0]} == {id(v) for v in cube.faces[2].vertices}
+
+
+def test_boundary_loops_which_do_not_close_are_refused():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    sides = Polyhedron(faces=[cube.faces[index] for index in (1, 3, 4, 5)])
+    caps = Polyhedron(faces=[cube.faces[0]]).topology.boundary_edges()
+    with pytest.raises(ValueError):
+        sides.topology.boundary_loops(closed_by=caps[:2])
@@ -1,4 +1,5 @@
 from dk_geometry.model import Face, Vector3d
+from dk_geometry.triangulation import triangulate_polyhedron
 import math
 
 
@@ -68,3 +69,48 @@ def test_same_area():
         area = Face(vertices=triangle).surfaceArea
         triangles_area += area
     assert math.fabs(triangles_area - face.surfaceArea)<0.001
+
+
+def test_degenerate_face_terminates():
+    face = Face(
+        vertices=[
+            Vector3d(0, 0, 0),
+            Vector3d(1, 0, 0),
+            Vector3d(2, 0, 0),
+            Vector3d(3, 0, 0),
+            Vector3d(3, 1, 0),
+            Vector3d(3, 1, 0),
+            Vector3d(0, 1, 0),
+        ]
+    )
+    assert len(face.triangles) == len(face.vertices) - 2
+
+
+def test_vertical_face():
+    face = Face(
+        vertices=[
+            Vector3d(0, 0, 0),
+            Vector3d(0, 0, -2),
+            Vector3d(0, 1, -2),
+            Vector3d(0, 1, -1),
+            Vector3d(0, 2, -1),
+            Vector3d(0, 2, 0),
+        ]
+    )
+    triangles_area = sum(Face(vertices=t).surfaceArea for t in face.triangles)
+    assert math.fabs(triangles_area - face.surfaceArea) < 0.001
+    for triangle in face.triangles:
+        assert Face(vertices=triangle).plane.normal == face.plane.normal
+
+
+def test_polyhedron_triangle_buffer(polyhedron_cutout_sloped):
+    poly = polyhedron_cutout_sloped()
+    vertices, indices = triangulate_polyhedron(poly)
+    assert len(vertices) == 16
+    expected = sum(len(face.vertices) - 2 for face in poly.faces)
+    assert len(indices) == expected * 3
+    area = 0
+    for triangle in indices.reshape(-1, 3):
+        a, b, c = [Vector3d(*vertices[i]) for i in triangle]
+        area += (b - a).crossProduct(c - a).length / 2
+    assert math.fabs(area - sum(face.surfaceArea for face in poly.faces)) < 0.01
@@ -0,0 +1,62 @@
+import pytest
+
+from dk_geometry.general import create_cube
+from dk_geometry.model import Face, Polyhedron, Vector3d
+from dk_geometry.validation import validate
+
+
+def test_cube_is_valid():
+    report = validate(create_cube(Vector3d(0, 0, 0), 10))
+    assert report.is_valid
+    assert report.problems() == []
+    assert len(report.non_trivalent_vertices) == 0
+    report.raise_if_invalid()
+
+
+def test_open_cube_has_boundary_edges():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    report = validate(Polyhedron(faces=cube.faces[1:]))
+    assert not report.is_closed
+    assert report.is_manifold and report.is_oriented
+    assert len(report.boundary_edges) == 4
+    with pytest.raises(ValueError):
+        report.raise_if_invalid()
+
+
+def test_reversed_face_is_misoriented():
+    cube = create_cube(Vector3d(0, 0, 0), 10)
+    faces = [Face(vertices=cube.faces[0].vertices[::-1])] + cube.faces[1:]
+    report = validate(Polyhedron(faces=faces))
+    assert report.is_closed and report.is_manifold
+    assert not report.is_oriented
+    assert len(report.misoriented_edges) == 4
+
+
+def test_non_planar_and_degenerate_faces():
+    a, b, c = Vector3d(0, 0, 0), Vector3d(10, 0, 0), Vector3d(10, 10, 0)
+    bent = Face(vertices=[a, b, c, Vector3d(0, 10, 1)])
+    flat = Face(vertices=[a, b, Vector3d(20, 0, 0)])
+    report = validate(Polyhedron(faces=[bent, flat]))
+    assert report.non_planar_faces.tolist() == [0]
+    assert report.degenerate_faces.tolist() == [1]
+
+
+def test_fixtures_are_closed_manifold_and_oriented(
+    polyhedron_cutout, polyhedron_cutout_sloped
+):
+    for polyhedron in (polyhedron_cutout(), polyhedron_cutout_sloped()):
+        report = validate(polyhedron)
+        assert report.is_closed and report.is_manifold and report.is_oriented
+        assert len(report.degenerate_faces) == 0
+
+
+def test_empty_faces_do_not_change_their_neighbours():
+    a, b, c = Vector3d(5, 7, 0), Vector3d(15, 7, 0), Vector3d(15, 17, 0)
+    bent = Face(vertices=[a, b, c, Vector3d(5, 17, 1)])
+    flat = Face(vertices=[a, b, Vector3d(25, 7, 0)])
+    report = validate(Polyhedron(faces=[Face(vertices=[]), bent, flat]))
+    assert report.non_planar_faces.tolist() == [1]
+    assert report.degenerate_faces.tolist() == [0, 2]
+    report = validate(Polyhedron(faces=[bent, flat, Face(vertices=[])]))
+    assert report.non_planar_faces.tolist() == [0]
+    assert report.degenerate_faces.tolist() == [1, 2]
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from dk_geometry.model import Vector3d, Vector3dArray, deferred_rounding, fixed_point
+
+
+def test_that_vectors_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Vector3d(0, 0, 0).w = 1
+
+
+def test_that_arithmetic_results_are_rounded():
+    result = Vector3d(0.1, 0, 0) + Vector3d(0.000001, 0, 0)
+    assert result.x == 0.1
+
+
+def test_that_deferred_rounding_keeps_precision():
+    with deferred_rounding():
+        result = Vector3d(0.1, 0, 0) + Vector3d(0.000001, 0, 0)
+    assert result.x == 0.1 + 0.000001
+    assert result.rounded().x == 0.1
+    assert (Vector3d(1, 0, 0) + Vector3d(0.000001, 0, 0)).x == 1
+
+
+def test_in_place_operators_modify_the_vector():
+    vector = Vector3d(1, 2, 3)
+    same = vector
+    vector += Vector3d(1, 1, 1)
+    vector -= Vector3d(0, 0, 1)
+    vector *= 2
+    vector *= Vector3d(1, 0.5, 1)
+    assert vector is same
+    assert (vector.x, vector.y, vector.z) == (4, 3, 6)
+
+
+def test_vector_array_matches_vector_operations():
+    vectors = [Vector3d(1, 2, 3), Vector3d(-4, 0.5, 2), Vector3d(0, 0, 7)]
+    other = Vector3d(0.3, -1, 2)
+    array = Vector3dArray.from_vectors(vectors)
+    assert (array - other).dotProduct(other).tolist() == [
+        (v - other).dotProduct(other) for v in vectors
+    ]
+    assert (array * 2 + other).crossProduct(other).to_vectors() == [
+        (v * 2 + other).crossProduct(other) for v in vectors
+    ]
+    assert np.allclose(array.length, [v.length for v in vectors])
+    assert array.normalized.to_vectors() == [v.normalized for v in vectors]
+    assert array[1] == vectors[1]
+    assert len(array[1:]) == 2
+
+
+def test_vector_array_combines_row_by_row():
+    a = Vector3dArray.from_vectors([Vector3d(1, 0, 0), Vector3d(0, 1, 0)])
+    b = Vector3dArray.from_vectors([Vector3d(0, 1, 0), Vector3d(0, 0, 1)])
+    assert a.crossProduct(b).to_vectors() == [Vector3d(0, 0, 1), Vector3d(1, 0, 0)]
+    assert (a * np.array([2.0, 3.0])).y.tolist() == [0, 3]
+
+
+def test_fixed_point_mode_compares_integer_coordinates():
+    assert Vector3d(1.0004, 2, 3).fixed() == (1000, 2000, 3000)
+    with fixed_point():
+        a = Vector3d(0.1, 0.2, 0.3) + Vector3d(0.2, 0.1, 0)
+        b = Vector3d(0.3, 0.3, 0.3)
+        assert (a.x, a.y, a.z) == (b.x, b.y, b.z)
+        assert a == b and hash(a) == hash(b)
+        # a micrometre apart, equal at the default 2 decimals
+        assert Vector3d(1, 0, 0) != Vector3d(1.001, 0, 0)
+    assert Vector3d(1, 0, 0) == Vector3d(1.001, 0, 0)
+    array = Vector3dArray.from_vectors([Vector3d(0.0015, -2, 0)])
+    assert array.fixed(100).tolist() == [[0, -200, 0]]
+
+
+def test_fixed_point_vectors_store_their_grid():
+    with fixed_point(100):
+        a = Vector3d(1.004, 2, 3)
+        assert repr(a) == "Vector3d(x=1.0, y=2.0, z=3.0)"
+        assert a.fixed() == (100, 200, 300) and a.fixed(1) == (1, 2, 3)
+        a.x = 1.5
+        assert a.fixed() == (150, 200, 300)
+    assert a == Vector3d(1.5, 2, 3)
+
+
+def test_hashes_do_not_depend_on_the_fixed_point_block():
+    outside = {Vector3d(1, 2, 3): "outside"}
+    with fixed_point():
+        inside = Vector3d(1, 2, 3)
+        assert outside[inside] == "outside"
+        assert outside[Vector3d(1.0004, 2, 3)] == "outside"
+        also_inside = {inside}
+    assert Vector3d(1, 2, 3) in also_inside